@@ -0,0 +1,33 @@
+"""Add covering index for keyset document listing
+
+Revision ID: 3c6d1e2f4a5b
+Revises: cf7a0be5fa53
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c6d1e2f4a5b'
+down_revision = 'cf7a0be5fa53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_documents_user_created',
+        'documents',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_include=[
+            'filename', 'original_filename', 'file_size', 'file_type',
+            'upload_status', 'upload_progress', 'content_extracted', 'vector_indexed'
+        ]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_documents_user_created', table_name='documents')
@@ -0,0 +1,30 @@
+"""Allow at most one active subscription per user
+
+Revision ID: 4b7d9e1f3a6c
+Revises: 9c1d3e5f7a9b
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7d9e1f3a6c'
+down_revision = '9c1d3e5f7a9b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'uq_user_subscriptions_active_user',
+        'user_subscriptions',
+        ['user_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'ACTIVE'")
+    )
+
+
+def downgrade():
+    op.drop_index('uq_user_subscriptions_active_user', table_name='user_subscriptions')
@@ -0,0 +1,24 @@
+"""Add multipart upload ID to documents
+
+Revision ID: 5e8f0a1b2c3d
+Revises: 3c6d1e2f4a5b
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8f0a1b2c3d'
+down_revision = '3c6d1e2f4a5b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('documents', sa.Column('upload_id', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('documents', 'upload_id')
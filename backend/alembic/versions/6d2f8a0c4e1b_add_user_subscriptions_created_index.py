@@ -0,0 +1,29 @@
+"""Add index for keyset subscription listing
+
+Revision ID: 6d2f8a0c4e1b
+Revises: 4b7d9e1f3a6c
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2f8a0c4e1b'
+down_revision = '4b7d9e1f3a6c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_user_subscriptions_created',
+        'user_subscriptions',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_user_subscriptions_created', table_name='user_subscriptions')
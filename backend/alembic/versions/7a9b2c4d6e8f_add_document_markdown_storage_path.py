@@ -0,0 +1,24 @@
+"""Add markdown storage path to documents
+
+Revision ID: 7a9b2c4d6e8f
+Revises: 5e8f0a1b2c3d
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a9b2c4d6e8f'
+down_revision = '5e8f0a1b2c3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('documents', sa.Column('markdown_storage_path', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('documents', 'markdown_storage_path')
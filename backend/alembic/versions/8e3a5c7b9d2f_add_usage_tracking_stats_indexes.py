@@ -0,0 +1,42 @@
+"""Add usage_date and indexes for usage statistics
+
+Revision ID: 8e3a5c7b9d2f
+Revises: 6d2f8a0c4e1b
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3a5c7b9d2f'
+down_revision = '6d2f8a0c4e1b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('usage_tracking', sa.Column('usage_date', sa.Date(), nullable=True))
+    op.execute("UPDATE usage_tracking SET usage_date = COALESCE(created_at, now())::date")
+    op.alter_column('usage_tracking', 'usage_date', nullable=False)
+    op.create_index(
+        'ix_usage_tracking_date_type_user',
+        'usage_tracking',
+        ['usage_date', 'usage_type', 'user_id'],
+        unique=False,
+        postgresql_include=['amount']
+    )
+    op.create_index(
+        'ix_user_subscriptions_active_tier',
+        'user_subscriptions',
+        ['tier_id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'ACTIVE'")
+    )
+
+
+def downgrade():
+    op.drop_index('ix_user_subscriptions_active_tier', table_name='user_subscriptions')
+    op.drop_index('ix_usage_tracking_date_type_user', table_name='usage_tracking')
+    op.drop_column('usage_tracking', 'usage_date')
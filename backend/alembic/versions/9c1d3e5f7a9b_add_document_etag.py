@@ -0,0 +1,24 @@
+"""Add S3 ETag to documents
+
+Revision ID: 9c1d3e5f7a9b
+Revises: 7a9b2c4d6e8f
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1d3e5f7a9b'
+down_revision = '7a9b2c4d6e8f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('documents', sa.Column('etag', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('documents', 'etag')
@@ -0,0 +1,29 @@
+"""Add cancellation fields to user subscriptions
+
+Revision ID: a1c3e5f7b9d2
+Revises: 8e3a5c7b9d2f
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b9d2'
+down_revision = '8e3a5c7b9d2f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user_subscriptions', sa.Column('next_billing_date', sa.Date(), nullable=True))
+    op.add_column('user_subscriptions', sa.Column('cancelled_at', sa.DateTime(), nullable=True))
+    op.add_column('user_subscriptions', sa.Column('extra_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('user_subscriptions', 'extra_metadata')
+    op.drop_column('user_subscriptions', 'cancelled_at')
+    op.drop_column('user_subscriptions', 'next_billing_date')
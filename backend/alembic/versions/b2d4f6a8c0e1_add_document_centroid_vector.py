@@ -0,0 +1,25 @@
+"""Add centroid vector to documents
+
+Revision ID: b2d4f6a8c0e1
+Revises: a1c3e5f7b9d2
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c0e1'
+down_revision = 'a1c3e5f7b9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('documents', sa.Column('centroid_vector', postgresql.ARRAY(sa.Float()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('documents', 'centroid_vector')
@@ -1,14 +1,21 @@
-from typing import Generator
+import hashlib
+import threading
+import time
+import uuid
+from typing import Generator, Tuple
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
 from app.db.session import SessionLocal
+from app.services.quota_tracking import QuotaTrackingService
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -21,27 +28,98 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+def get_token_data(token: str = Depends(reusable_oauth2)) -> schemas.TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        token_data = schemas.TokenPayload(**payload)
+        return schemas.TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+
+def get_current_user(
+    db: Session = Depends(get_db), token_data: schemas.TokenPayload = Depends(get_token_data)
+) -> models.User:
     user = crud.user.get_by_id(db, user_id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
+# Resolved once per request, so the handler and its dependencies share the
+# service's memoized subscription lookups
+def get_quota_service(db: Session = Depends(get_db)) -> QuotaTrackingService:
+    return QuotaTrackingService(db)
+
+# Users resolved for recently seen tokens, keyed by token digest, so
+# polling clients skip the database lookup. Cached users are detached from
+# their session: only read their column attributes.
+CACHED_USER_TTL_SECONDS = 30
+_user_cache = TLRUCache(maxsize=10_000, ttu=lambda _key, value, _now: value[1])
+_user_cache_lock = threading.Lock()
+
+def get_cached_current_user(token: str = Depends(reusable_oauth2)) -> models.User:
+    key = hashlib.sha256(token.encode()).digest()
+    with _user_cache_lock:
+        entry = _user_cache.get(key)
+    if entry is not None:
+        return entry[0]
+
+    token_data = get_token_data(token)
+    db = SessionLocal()
+    try:
+        user = crud.user.get_by_id(db, user_id=token_data.sub)
+        if user:
+            db.expunge(user)
+    finally:
+        db.close()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Never serve a user past the token's own expiry
+    ttl = CACHED_USER_TTL_SECONDS
+    if token_data.exp is not None:
+        ttl = min(ttl, token_data.exp - time.time())
+    if ttl > 0:
+        with _user_cache_lock:
+            _user_cache[key] = (user, time.monotonic() + ttl)
+    return user
+
+def get_current_user_and_document(
+    document_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    token_data: schemas.TokenPayload = Depends(get_token_data),
+) -> Tuple[models.User, models.Document]:
+    """Load the current user and one of their documents in a single query."""
+    row = db.query(models.User, models.Document).outerjoin(
+        models.Document,
+        and_(
+            models.Document.user_id == models.User.id,
+            models.Document.id == document_id
+        )
+    ).filter(models.User.id == token_data.sub).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+    user, document = row
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return user, document
+
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
     if not crud.user.is_active(current_user):
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user 
\ No newline at end of file
+    return current_user
+
+def get_current_superuser(
+    current_user: models.User = Depends(get_current_user),
+) -> models.User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required",
+        )
+    return current_user
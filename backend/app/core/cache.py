@@ -0,0 +1,57 @@
+"""
+Response Cache Configuration
+
+Helpers for caching GET endpoint responses with fastapi-cache2.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+
+def create_cache_backend() -> RedisBackend:
+    """
+    Create the Redis backend shared by all API workers, so cache
+    invalidation after a write is seen by every process.
+    """
+    client = aioredis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD or None,
+        db=3  # Use separate DB for response caches
+    )
+    return RedisBackend(client)
+
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a response cache key from the request path, its query parameters
+    and the caller's privilege level (role if the user has one).
+    
+    The default key builder hashes every endpoint argument, including the
+    per-request user object and database session, so it would never hit.
+    """
+    user = (kwargs or {}).get("current_user")
+    scope = getattr(user, "role", None) or ("admin" if getattr(user, "is_superuser", False) else "user")
+    
+    if request is not None:
+        path = request.url.path
+        query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    else:
+        path = f"{func.__module__}.{func.__name__}"
+        query = ""
+    
+    return f"{FastAPICache.get_prefix()}:{namespace}:{path}:{scope}:{query}"
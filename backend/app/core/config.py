@@ -89,6 +89,9 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://user:password@db/db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replaces pre-ping for dropping stale connections
     
     # Celery
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
@@ -105,6 +108,9 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET: str = "ebooks"
     MINIO_SECURE: bool = False
+    S3_MAX_POOL_CONNECTIONS: int = 64
+    MULTIPART_UPLOAD_THRESHOLD_MB: int = 100  # Files above this use multipart uploads
+    MULTIPART_PART_SIZE_MB: int = 16
     
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
@@ -114,6 +120,8 @@ class Settings(BaseSettings):
     # Qdrant Configuration
     QDRANT_URL: str = "http://qdrant:6333"
     QDRANT_API_KEY: Optional[str] = None
+    QDRANT_PREFER_GRPC: bool = True
+    QDRANT_GRPC_PORT: int = 6334
 
     # LLM Provider Settings
     LLM_PROVIDER_ENABLED: bool = True
@@ -121,6 +129,8 @@ class Settings(BaseSettings):
     LLM_FALLBACK_ENABLED: bool = True
     LLM_MAX_RETRIES: int = 3
     LLM_TIMEOUT: int = 30
+    LLM_COST_ESTIMATE_TIMEOUT: float = 2.0  # Per-provider cap on /estimate-cost
+    LLM_HEALTH_CHECK_TIMEOUT: int = 5
 
     # Cost and Usage Tracking
     LLM_COST_TRACKING_ENABLED: bool = True
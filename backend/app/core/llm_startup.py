@@ -4,8 +4,11 @@ LLM Provider Startup Configuration
 Initializes LLM providers on application startup based on available API keys.
 """
 
+import asyncio
 import logging
 from app.core.config import settings
+from app.services.llm_providers.provider_factory import get_configured_provider
+from app.services.llm_providers.token_counter import get_token_counter
 # from app.services.llm_providers import initialize_providers, get_provider_factory
 # from app.services.llm_providers.provider_factory import ProviderSelectionStrategy
 
@@ -20,9 +23,19 @@ async def initialize_llm_providers():
     all available LLM providers based on the current settings.
     """
     try:
-        logger.info("LLM provider initialization - placeholder implementation")
-        # TODO: Implement full LLM provider initialization when API keys are configured
-        return
+        # Load tokenizer encodings now rather than on the first request
+        get_token_counter()
+        
+        # Create the configured providers and open their connection pools
+        # so the first completion does not pay for the TLS handshake
+        providers = [
+            provider
+            for provider in map(get_configured_provider, settings.llm_providers_config)
+            if provider
+        ]
+        await asyncio.gather(*(provider.warm_up() for provider in providers))
+        
+        logger.info(f"Initialized LLM providers: {[provider.provider_name for provider in providers]}")
             
     except Exception as e:
         logger.error(f"Error initializing LLM providers: {e}")
@@ -2,6 +2,7 @@ import secrets
 import hashlib
 import base64
 import ipaddress
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional, List, Dict
 from cryptography.fernet import Fernet
@@ -135,6 +136,12 @@ data_encryption = DataEncryption()
 class SecureAPIKeyStorage:
     """Secure storage for API keys with encryption"""
     
+    KEY_FORMAT_VALIDATORS = {
+        "openai": lambda k: k.startswith("sk-") and len(k) > 20,
+        "anthropic": lambda k: k.startswith("sk-ant-") and len(k) > 30,
+        "google": lambda k: len(k) > 20 and k.replace("-", "").replace("_", "").isalnum(),
+    }
+    
     def __init__(self):
         self.encryption = DataEncryption()
     
@@ -172,13 +179,7 @@ class SecureAPIKeyStorage:
     
     def validate_api_key_format(self, provider: str, api_key: str) -> bool:
         """Validate API key format for different providers"""
-        patterns = {
-            "openai": lambda k: k.startswith("sk-") and len(k) > 20,
-            "anthropic": lambda k: k.startswith("sk-ant-") and len(k) > 30,
-            "google": lambda k: len(k) > 20 and k.replace("-", "").replace("_", "").isalnum(),
-        }
-        
-        validator = patterns.get(provider.lower())
+        validator = self.KEY_FORMAT_VALIDATORS.get(provider.lower())
         return validator(api_key) if validator else len(api_key) > 10
 
 # ============================================================================
@@ -364,8 +365,9 @@ class RBACManager:
     """Role-Based Access Control Manager"""
     
     @staticmethod
+    @lru_cache(maxsize=512)
     def check_permission(user_role: str, required_permission: str) -> bool:
-        """Check if user role has required permission"""
+        """Check if user role has required permission (memoized, roles are static)"""
         role_permissions = {
             "guest": Role.GUEST["permissions"],
             "user": Role.USER["permissions"],
@@ -406,6 +408,17 @@ class IPRestrictionManager:
         self.admin_only_networks = [
             ipaddress.ip_network("10.0.0.0/24"),  # Admin network
         ]
+        # Admin networks as (version, network address, netmask) integers, so
+        # matching is a mask-and-compare instead of ipaddress containment
+        self._admin_ranges = self._to_ranges(self.admin_only_networks)
+        self._blocked_ips_list: Optional[List[str]] = None
+    
+    @staticmethod
+    def _to_ranges(networks: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]) -> tuple:
+        return tuple(
+            (network.version, int(network.network_address), int(network.netmask))
+            for network in networks
+        )
     
     def is_ip_blocked(self, ip: str) -> bool:
         """Check if IP is blocked"""
@@ -418,17 +431,29 @@ class IPRestrictionManager:
         """Check if IP is allowed for admin access"""
         try:
             ip_addr = ipaddress.ip_address(ip)
-            return any(ip_addr in network for network in self.admin_only_networks)
         except ValueError:
             return False
+        
+        version, value = ip_addr.version, int(ip_addr)
+        return any(
+            version == network_version and value & netmask == network
+            for network_version, network, netmask in self._admin_ranges
+        )
     
     def block_ip(self, ip: str, reason: str = None):
         """Block an IP address"""
         try:
             self.blocked_ips.add(ipaddress.ip_address(ip))
+            self._blocked_ips_list = None
             logger.warning(f"Blocked IP {ip}: {reason}")
         except ValueError:
             logger.error(f"Invalid IP format: {ip}")
+    
+    def get_blocked_ips(self) -> List[str]:
+        """Get blocked IPs as strings, rebuilt only after the blocklist changes"""
+        if self._blocked_ips_list is None:
+            self._blocked_ips_list = sorted(str(ip) for ip in self.blocked_ips)
+        return self._blocked_ips_list
 
 # ============================================================================
 # ENHANCED PASSWORD SECURITY
@@ -1,10 +1,28 @@
 import uuid
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+from sqlalchemy import and_, or_, func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only
 from app.models.document import Document
 from app.schemas.document import DocumentUploadInit, DocumentUploadProgress
 
 
+# Columns served by DocumentList, all covered by ix_documents_user_created
+LISTING_COLUMNS = (
+    Document.id,
+    Document.filename,
+    Document.original_filename,
+    Document.file_size,
+    Document.file_type,
+    Document.upload_status,
+    Document.upload_progress,
+    Document.created_at,
+    Document.content_extracted,
+    Document.vector_indexed,
+)
+
+
 class CRUDDocument:
     def get_by_id(self, db: Session, document_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Document]:
         """Get document by ID, ensuring it belongs to the user."""
@@ -13,6 +31,23 @@ class CRUDDocument:
             Document.user_id == user_id
         ).first()
 
+    def get_many_by_ids(
+        self, db: Session, document_ids: List[uuid.UUID], user_id: uuid.UUID
+    ) -> Dict[uuid.UUID, Document]:
+        """Get the user's documents among the given IDs in one query, keyed by ID."""
+        documents = db.query(Document).filter(
+            Document.id.in_(document_ids),
+            Document.user_id == user_id
+        ).all()
+        return {document.id: document for document in documents}
+
+    def get_centroid(self, db: Session, document_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Row]:
+        """Get (vector_indexed, centroid_vector) of a user's document."""
+        return db.query(Document.vector_indexed, Document.centroid_vector).filter(
+            Document.id == document_id,
+            Document.user_id == user_id
+        ).first()
+
     def get(self, db: Session, id: str) -> Optional[Document]:
         """Get document by ID (for system operations)."""
         if isinstance(id, str):
@@ -21,6 +56,46 @@ class CRUDDocument:
             document_id = id
         return db.query(Document).filter(Document.id == document_id).first()
 
+    def get_download_info(self, db: Session, document_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Row]:
+        """Get the storage path and upload status of a user's document."""
+        return db.query(
+            Document.storage_path,
+            Document.upload_status
+        ).filter(
+            Document.id == document_id,
+            Document.user_id == user_id
+        ).first()
+
+    def get_processing_state(self, db: Session, document_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Row]:
+        """Get the status flags and file details used to start or report processing of a user's document."""
+        return db.query(
+            Document.upload_status,
+            Document.content_extracted,
+            Document.vector_indexed,
+            Document.storage_path,
+            Document.original_filename,
+            Document.file_type
+        ).filter(
+            Document.id == document_id,
+            Document.user_id == user_id
+        ).first()
+
+    def get_markdown_preview(self, db: Session, document_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Row]:
+        """
+        Get the fields needed to serve a document's Markdown, ensuring it belongs to the user.
+        Only the first 500 characters of content_text are read from the database.
+        """
+        return db.query(
+            Document.id,
+            Document.content_extracted,
+            Document.storage_path,
+            Document.markdown_storage_path,
+            func.substr(Document.content_text, 1, 500).label("content_preview")
+        ).filter(
+            Document.id == document_id,
+            Document.user_id == user_id
+        ).first()
+
     def get_by_hash(self, db: Session, file_hash: str) -> Optional[Document]:
         """Check if document with this hash already exists (deduplication)."""
         return db.query(Document).filter(Document.file_hash == file_hash).first()
@@ -30,19 +105,42 @@ class CRUDDocument:
         db: Session, 
         user_id: uuid.UUID, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[Document]:
-        """Get all documents for a user with pagination."""
-        return db.query(Document).filter(
-            Document.user_id == user_id
-        ).offset(skip).limit(limit).all()
+        """
+        Get documents for a user, newest first.
+        
+        When `after` is a (created_at, id) keyset position the page starts
+        right after it, which is served from ix_documents_user_created
+        without scanning skipped rows; `skip` is only applied otherwise.
+        Only the listing columns are loaded so the index can answer the
+        query on its own.
+        """
+        query = db.query(Document).options(
+            load_only(*LISTING_COLUMNS)
+        ).filter(Document.user_id == user_id)
+        if after is not None:
+            created_at, document_id = after
+            query = query.filter(
+                or_(
+                    Document.created_at < created_at,
+                    and_(Document.created_at == created_at, Document.id < document_id)
+                )
+            )
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(
+            Document.created_at.desc(), Document.id.desc()
+        ).limit(limit).all()
 
     def create(
         self, 
         db: Session, 
         document_data: DocumentUploadInit, 
         user_id: uuid.UUID,
-        storage_path: str
+        storage_path: str,
+        upload_id: Optional[str] = None
     ) -> Document:
         """Create a new document record."""
         db_document = Document(
@@ -53,7 +151,8 @@ class CRUDDocument:
             file_type=document_data.file_type,
             storage_path=storage_path,
             user_id=user_id,
-            upload_status="pending"
+            upload_status="pending",
+            upload_id=upload_id
         )
         db.add(db_document)
         db.commit()
@@ -75,12 +174,19 @@ class CRUDDocument:
             db.refresh(document)
         return document
 
-    def mark_completed(self, db: Session, document_id: uuid.UUID) -> Optional[Document]:
-        """Mark document upload as completed."""
+    def mark_completed(
+        self, 
+        db: Session, 
+        document_id: uuid.UUID, 
+        etag: Optional[str] = None
+    ) -> Optional[Document]:
+        """Mark document upload as completed, recording the object's ETag if known."""
         document = db.query(Document).filter(Document.id == document_id).first()
         if document:
             document.upload_status = "completed"
             document.upload_progress = 100
+            if etag:
+                document.etag = etag
             db.commit()
             db.refresh(document)
         return document
@@ -124,9 +230,10 @@ class CRUDDocument:
         self, 
         db: Session, 
         document_id: str, 
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        centroid_vector: Optional[List[float]] = None
     ) -> Optional[Document]:
-        """Update document indexing metadata."""
+        """Update document indexing metadata and, when given, its centroid vector."""
         if isinstance(document_id, str):
             doc_id = uuid.UUID(document_id)
         else:
@@ -139,6 +246,8 @@ class CRUDDocument:
                 document.chunks_count = metadata["chunks_count"]
             if "vectors_count" in metadata:
                 document.vectors_count = metadata["vectors_count"]
+            if centroid_vector is not None:
+                document.centroid_vector = centroid_vector
                 
             # Store all metadata in JSON field
             if document.indexing_metadata:
@@ -188,6 +297,21 @@ class CRUDDocument:
             Document.upload_status == status
         ).limit(limit).all()
 
+    def get_indexed_document_owners(self, db: Session) -> List[Row]:
+        """Get (id, user_id) of every indexed document."""
+        return db.query(Document.id, Document.user_id).filter(
+            Document.vector_indexed == True
+        ).all()
+
+    def get_indexed_document_ids(self, db: Session, user_id: uuid.UUID) -> List[uuid.UUID]:
+        """Get the IDs of a user's indexed documents."""
+        return [
+            row.id for row in db.query(Document.id).filter(
+                Document.user_id == user_id,
+                Document.vector_indexed == True
+            ).all()
+        ]
+
     def get_indexable_documents(self, db: Session, limit: int = 100) -> List[Document]:
         """Get documents that are ready for indexing."""
         return db.query(Document).filter(
@@ -2,5 +2,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# No pre-ping: it costs a round-trip on every checkout. Connections are
+# recycled before the server or a proxy would drop them instead, and LIFO
+# checkout keeps the same few connections warm.
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_use_lifo=True
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
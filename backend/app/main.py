@@ -1,16 +1,23 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from app.core.cache import create_cache_backend
 from app.core.config import settings
 from app.routers import users, auth, documents, vector_search, subscription, chat, llm_providers
 from app.core.llm_startup import initialize_llm_providers
+from app.services.storage import log_hash_backend
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize LLM providers on startup."""
+    """Initialize the response cache and LLM providers on startup."""
+    log_hash_backend()
+    FastAPICache.init(create_cache_backend(), prefix="fastapi-cache")
     await initialize_llm_providers()
 
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
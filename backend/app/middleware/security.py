@@ -165,6 +165,54 @@ class RedisRateLimiter:
             "remaining": limit - current_count - 1
         }
 
+class RedisTokenBucket:
+    """Redis-based token bucket, refilled and consumed in one atomic script"""
+    
+    # KEYS[1]: bucket hash; ARGV: capacity, refill rate (tokens/s), now, cost
+    REFILL_AND_CONSUME = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+    return {allowed, tostring(tokens)}
+    """
+    
+    def __init__(self):
+        self._script = None
+    
+    def _get_script(self):
+        """Get the registered script, connecting on first use"""
+        if self._script is None:
+            client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD or None
+            )
+            self._script = client.register_script(self.REFILL_AND_CONSUME)
+        return self._script
+    
+    async def consume(self, key: str, capacity: int, rate: float, cost: int = 1) -> tuple[bool, float]:
+        """
+        Take `cost` tokens from the bucket at `key`.
+        
+        Returns whether the tokens were available and how many remain.
+        """
+        allowed, remaining = await self._get_script()(
+            keys=[key], args=[capacity, rate, time.time(), cost]
+        )
+        return bool(allowed), float(remaining)
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Rate limiting middleware"""
     
@@ -1,4 +1,5 @@
 from .user import User
 from .document import Document
 from .subscription import SubscriptionTier
-from .chat import Conversation, ChatMessage, MessageSource, ConversationDocument, UserChatSettings 
\ No newline at end of file
+from .chat import Conversation, ChatMessage, MessageSource, ConversationDocument, UserChatSettings
+from .api_key import APIKey, APIKeyUsageLog, APIKeyValidation
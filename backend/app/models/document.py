@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import relationship, deferred
 from app.db.base_class import Base
 
 class Document(Base):
@@ -15,8 +15,11 @@ class Document(Base):
     file_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256
     file_type = Column(String, nullable=False)  # pdf, epub, txt, docx
     storage_path = Column(String, nullable=False)  # S3/MinIO path
-    upload_status = Column(String, default="pending")  # pending, uploading, completed, failed, converting, conversion_completed, conversion_failed, indexing, indexed, indexing_failed
+    markdown_storage_path = Column(String, nullable=True)  # S3/MinIO path of the converted Markdown
+    upload_status = Column(String, default="pending")  # pending, uploading, verifying, completed, failed, converting, conversion_completed, conversion_failed, indexing, indexed, indexing_failed
     upload_progress = Column(Integer, default=0)  # 0-100
+    upload_id = Column(String, nullable=True)  # S3 multipart upload ID for large files
+    etag = Column(String, nullable=True)  # S3 ETag of the uploaded object
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -28,7 +31,7 @@ class Document(Base):
     
     # Content extraction and indexing status
     content_extracted = Column(Boolean, default=False)
-    content_text = Column(Text, nullable=True)  # Extracted text content
+    content_text = deferred(Column(Text, nullable=True))  # Extracted text content, loaded only on access
     vector_indexed = Column(Boolean, default=False)  # Whether document is indexed for search
     
     # Indexing metadata
@@ -37,4 +40,17 @@ class Document(Base):
     
     # Vector search related fields
     chunks_count = Column(Integer, nullable=True)  # Number of chunks generated
-    vectors_count = Column(Integer, nullable=True)  # Number of vectors stored 
\ No newline at end of file
+    vectors_count = Column(Integer, nullable=True)  # Number of vectors stored 
+    centroid_vector = deferred(Column(ARRAY(Float).with_variant(JSON(), "sqlite"), nullable=True))  # Normalized mean of the chunk embeddings
+    
+    # Covering index for keyset-paginated document listings
+    __table_args__ = (
+        Index(
+            'ix_documents_user_created',
+            user_id, created_at.desc(), id.desc(),
+            postgresql_include=[
+                'filename', 'original_filename', 'file_size', 'file_type',
+                'upload_status', 'upload_progress', 'content_extracted', 'vector_indexed'
+            ]
+        ),
+    )
@@ -1,8 +1,9 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Integer, DateTime, Numeric, Boolean, Enum, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Date, DateTime, Numeric, Boolean, Enum, ForeignKey, Index, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -45,6 +46,30 @@ class SubscriptionTier(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
     sort_order = Column(Integer, default=0)
+    
+    @property
+    def price_monthly_cents(self) -> int:
+        """Monthly price in whole cents, as exposed by the API schemas."""
+        return int(self.price_monthly * 100) if self.price_monthly is not None else 0
+    
+    @price_monthly_cents.setter
+    def price_monthly_cents(self, cents: int) -> None:
+        self.price_monthly = Decimal(cents) / 100
+    
+    def to_dict(self) -> dict:
+        """JSON-ready representation, built from the columns directly."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "display_name": self.display_name,
+            "price_monthly_cents": self.price_monthly_cents,
+            "upload_quota_mb": self.upload_quota_mb,
+            "token_quota": self.token_quota,
+            "is_active": self.is_active,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "sort_order": self.sort_order
+        }
 
 
 class UserSubscription(Base):
@@ -57,12 +82,33 @@ class UserSubscription(Base):
     billing_cycle = Column(String, nullable=False, default="monthly")
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=True)
+    next_billing_date = Column(Date, nullable=True)
+    cancelled_at = Column(DateTime, nullable=True)
+    extra_metadata = Column(JSONB().with_variant(JSON(), "sqlite"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="subscriptions")
     tier = relationship("SubscriptionTier")
+    
+    __table_args__ = (
+        # At most one active subscription per user
+        Index(
+            'uq_user_subscriptions_active_user',
+            'user_id',
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+        # Newest-first keyset listing for admins
+        Index('ix_user_subscriptions_created', created_at.desc(), id.desc()),
+        # Subscriber counts per tier
+        Index(
+            'ix_user_subscriptions_active_tier',
+            'tier_id',
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+    )
 
 
 class UsageTracking(Base):
@@ -72,8 +118,18 @@ class UsageTracking(Base):
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     usage_type = Column(Enum(UsageTypeEnum), nullable=False)
     amount = Column(Integer, nullable=False)
+    usage_date = Column(Date, nullable=False, default=date.today)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # Covers the date-range aggregation in /admin/usage-stats
+        Index(
+            'ix_usage_tracking_date_type_user',
+            'usage_date', 'usage_type', 'user_id',
+            postgresql_include=['amount']
+        ),
+    )
+    
 
 class QuotaUsageSummary(Base):
     __tablename__ = 'quota_usage_summary'
@@ -21,4 +21,4 @@ class User(Base):
     # Relationships
     documents = relationship("Document", back_populates="user")
     subscriptions = relationship("UserSubscription", back_populates="user")
-    api_keys = relationship("ApiKey", back_populates="user") 
\ No newline at end of file
+    api_keys = relationship("APIKey", back_populates="user") 
\ No newline at end of file
@@ -1,21 +1,67 @@
+import math
 import uuid
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Tuple
+import msgspec
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
-from app.services.storage import storage_service
-from app.workers.document_conversion import convert_document, get_conversion_status
+from app.crud.pagination import encode_cursor, decode_cursor
+from app.services.storage import storage_service, compute_sha256
+from app.services.idempotency import IN_PROGRESS, idempotency_cache
+from app.services.semantic_cache import invalidate_user
+from app.workers.document_conversion import convert_document, convert_document_sync, get_conversion_status
+from app.workers.upload_verification import verify_upload
 from app.schemas.document import (
     DocumentUploadInit, 
     DocumentUploadResponse, 
     DocumentUploadProgress,
+    DocumentUploadComplete,
     Document,
-    DocumentList
+    DocumentList,
+    PreprocessingOptions,
+    PipelineOptions
 )
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+_STATUS_MESSAGES = MappingProxyType({
+    "pending": "Upload pending",
+    "uploading": "File uploading",
+    "verifying": "Verifying uploaded file",
+    "completed": "Upload completed, ready for conversion",
+    "converting": "Converting to Markdown",
+    "conversion_completed": "Conversion completed successfully",
+    "conversion_failed": "Conversion failed",
+    "failed": "Upload failed"
+})
+
+# Documents small enough to convert in the request instead of via Celery
+INLINE_CONVERSION_MAX_BYTES = 16 * 1024
+INLINE_CONVERSION_FILE_TYPES = frozenset({"txt"})
+
+# Response body of the document listing. Mirrors DocumentList (which stays
+# as the OpenAPI documentation) but is read from the ORM rows and encoded
+# by msgspec without validation.
+class DocumentListItem(msgspec.Struct):
+    id: uuid.UUID
+    filename: str
+    original_filename: str
+    file_size: int
+    file_type: str
+    upload_status: str
+    upload_progress: int
+    created_at: datetime
+    content_extracted: bool
+    vector_indexed: bool
+
+_json_encoder = msgspec.json.Encoder()
 
 @router.post("/upload/init", response_model=DocumentUploadResponse)
 def initiate_upload(
@@ -23,68 +69,45 @@ def initiate_upload(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
     upload_data: DocumentUploadInit,
+    idempotency_key: Optional[str] = Header(None),
 ):
     """
     Initiate document upload process.
     Checks for duplicates and generates presigned upload URL.
+    Retries with the same Idempotency-Key header (or the same file hash)
+    within 10 minutes replay the original response.
     """
-    # Check for duplicate file (deduplication)
-    existing_doc = crud.document.get_by_hash(db, upload_data.file_hash)
-    if existing_doc:
-        # If user already has this document, return existing one
-        if existing_doc.user_id == current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="You have already uploaded this document"
-            )
-        else:
-            # Create a reference to the existing file for this user
-            storage_path = existing_doc.storage_path
-    else:
-        # Generate new storage path for new file
-        storage_path = storage_service.generate_storage_path(
-            current_user.id, 
-            upload_data.filename, 
-            upload_data.file_hash
-        )
-    
-    # Create document record
-    document = crud.document.create(
-        db=db,
-        document_data=upload_data,
-        user_id=current_user.id,
-        storage_path=storage_path
-    )
-    
-    # Generate presigned upload URL
-    upload_url = storage_service.generate_presigned_upload_url(storage_path)
-    if not upload_url:
+    cache_key = f"idem:init:{current_user.id}:{idempotency_key or upload_data.file_hash}"
+    
+    # Reserve the key before creating anything, so concurrent retries
+    # cannot both miss the cache and create duplicate documents
+    if not idempotency_cache.reserve(cache_key):
+        cached_response = idempotency_cache.get(cache_key)
+        if cached_response and cached_response != IN_PROGRESS:
+            return DocumentUploadResponse.model_validate_json(cached_response)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate upload URL"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An identical upload request is already in progress"
         )
     
-    return DocumentUploadResponse(
-        document_id=document.id,
-        upload_url=upload_url,
-        chunk_size=5242880  # 5MB chunks
-    )
+    try:
+        response = _initiate_upload(db, current_user, upload_data)
+    except Exception:
+        idempotency_cache.release(cache_key)
+        raise
+    idempotency_cache.set(cache_key, response.model_dump_json())
+    return response
 
 @router.put("/upload/{document_id}/progress")
 def update_upload_progress(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
     progress_data: DocumentUploadProgress,
 ):
     """Update upload progress for a document."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    _, document = user_and_document
     
     updated_document = crud.document.update_progress(
         db, document_id, progress_data
@@ -92,61 +115,108 @@ def update_upload_progress(
     
     return {"status": "success", "document": updated_document}
 
-@router.post("/upload/{document_id}/complete")
+@router.post("/upload/{document_id}/complete", status_code=status.HTTP_202_ACCEPTED)
 def complete_upload(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
+    response: Response,
     document_id: uuid.UUID,
+    complete_data: Optional[DocumentUploadComplete] = None,
 ):
-    """Mark document upload as completed."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    """
+    Mark document upload as finished.
     
-    # Verify file exists in storage
-    if not storage_service.check_file_exists(document.storage_path):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File not found in storage"
+    When the client sends the ETag S3 returned for its PUT, the upload is
+    completed immediately. Otherwise storage verification is queued and the
+    worker sets the final upload status; poll /conversion-status for it.
+    Multipart uploads are assembled here and completed immediately.
+    """
+    current_user, document = user_and_document
+    
+    if document.upload_id:
+        if not complete_data or not complete_data.parts:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded parts are required to complete a multipart upload"
+            )
+        
+        parts = [part.model_dump() for part in complete_data.parts]
+        etag = storage_service.complete_multipart_upload(
+            document.storage_path, document.upload_id, parts
         )
+        if not etag:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to complete multipart upload"
+            )
+        
+        # The assembled object is confirmed by S3, no verification needed
+        updated_document = crud.document.mark_completed(db, document_id, etag=etag)
+        response.status_code = status.HTTP_200_OK
+        return {"status": "success", "document": updated_document}
     
-    updated_document = crud.document.mark_completed(db, document_id)
+    if complete_data and complete_data.etag:
+        # S3 only returns an ETag once the object is stored, so skip the HEAD
+        updated_document = crud.document.mark_completed(db, document_id, etag=complete_data.etag)
+        response.status_code = status.HTTP_200_OK
+        return {"status": "success", "document": updated_document}
     
-    return {"status": "success", "document": updated_document}
+    crud.document.update_status(db, document_id, "verifying")
+    
+    # Verify file exists in storage off the request path
+    task = verify_upload.delay(str(document_id), str(current_user.id))
+    
+    return {
+        "status": "verifying",
+        "task_id": task.id,
+        "document_id": document_id
+    }
 
-@router.get("/", response_model=List[DocumentList])
+@router.get("/", response_model=None, responses={200: {"model": List[DocumentList]}})
 def get_user_documents(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ):
-    """Get all documents for the current user."""
+    """
+    Get documents for the current user, newest first.
+    
+    Pass the `X-Next-Cursor` header of a full page back as `cursor`
+    to fetch the next one; `skip` is kept for older clients.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
     documents = crud.document.get_user_documents(
-        db, current_user.id, skip=skip, limit=limit
+        db, current_user.id, skip=skip, limit=limit, after=after
     )
-    return documents
+    items = msgspec.convert(documents, List[DocumentListItem], from_attributes=True)
+    response = Response(_json_encoder.encode(items), media_type="application/json")
+    if documents and len(documents) == limit:
+        last = documents[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return response
 
-@router.get("/{document_id}", response_model=Document)
+@router.get("/{document_id}", response_model=None, responses={200: {"model": Document}})
 def get_document(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
 ):
     """Get a specific document by ID."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
-    return document
+    _, document = user_and_document
+    return ORJSONResponse(Document.from_orm_fast(document).model_dump())
 
 @router.get("/{document_id}/download")
 def get_download_url(
@@ -156,7 +226,7 @@ def get_download_url(
     document_id: uuid.UUID,
 ):
     """Get a presigned download URL for a document."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
+    document = crud.document.get_download_info(db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -182,16 +252,11 @@ def get_download_url(
 def delete_document(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
 ):
     """Delete a document."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    current_user, document = user_and_document
     
     # Delete from storage
     storage_service.delete_file(document.storage_path)
@@ -205,22 +270,19 @@ def delete_document(
             detail="Failed to delete document"
         )
     
+    # Cached searches may still return the deleted document
+    invalidate_user(str(current_user.id))
+    
     return {"status": "success", "message": "Document deleted"}
 
 @router.post("/{document_id}/convert")
 def trigger_document_conversion(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
 ):
     """Trigger document conversion to Markdown using Celery worker."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    current_user, document = user_and_document
     
     if document.upload_status != "completed":
         raise HTTPException(
@@ -252,7 +314,7 @@ def get_document_conversion_status(
     document_id: uuid.UUID,
 ):
     """Get the conversion status of a document."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
+    document = crud.document.get_processing_state(db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -275,7 +337,7 @@ def get_document_markdown(
     document_id: uuid.UUID,
 ):
     """Get the converted Markdown content of a document."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
+    document = crud.document.get_markdown_preview(db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -288,8 +350,9 @@ def get_document_markdown(
             detail="Document has not been converted to Markdown yet"
         )
     
-    # Generate download URL for the Markdown file
-    markdown_storage_path = _generate_markdown_storage_path(document.storage_path)
+    # Generate download URL for the Markdown file; rows converted before the
+    # path was stored fall back to deriving it from the original file's path
+    markdown_storage_path = document.markdown_storage_path or _generate_markdown_storage_path(document.storage_path)
     download_url = storage_service.generate_presigned_download_url(markdown_storage_path)
     
     if not download_url:
@@ -301,11 +364,11 @@ def get_document_markdown(
     return {
         "document_id": document_id,
         "markdown_download_url": download_url,
-        "content_preview": document.content_text[:500] if document.content_text else None
+        "content_preview": document.content_preview
     }
 
 @router.post("/test-conversion")
-def test_document_conversion(
+async def test_document_conversion(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
@@ -334,13 +397,11 @@ The system converts documents like PDFs, DOCX, EPUB files into searchable Markdo
 """
     
     # Calculate hash and size
-    import hashlib
     content_bytes = test_content.encode('utf-8')
-    file_hash = hashlib.sha256(content_bytes).hexdigest()
+    file_hash = compute_sha256(content_bytes)
     file_size = len(content_bytes)
     
     # Create document record
-    from app.schemas.document import DocumentUploadInit
     doc_data = DocumentUploadInit(
         filename="test-conversion.txt",
         file_size=file_size,
@@ -356,40 +417,58 @@ The system converts documents like PDFs, DOCX, EPUB files into searchable Markdo
     )
     
     # Create document record
-    document = crud.document.create(
+    document = await run_in_threadpool(
+        crud.document.create,
         db=db,
         document_data=doc_data,
         user_id=current_user.id,
         storage_path=storage_path
     )
+    document_id = document.id
     
-    # Upload test content to MinIO
     try:
-        storage_service.s3_client.put_object(
+        # Upload test content to MinIO before the row says it is there
+        await run_in_threadpool(
+            storage_service.s3_client.put_object,
             Bucket=storage_service.bucket_name,
             Key=storage_path,
             Body=content_bytes,
             ContentType='text/plain'
         )
+        await run_in_threadpool(crud.document.mark_completed, db, document_id)
         
-        # Mark as completed
-        document.upload_status = "completed"
-        document.upload_progress = 100
-        db.commit()
+        # Tiny plain-text documents convert faster than a broker round-trip
+        if _should_convert_inline(doc_data):
+            conversion = await run_in_threadpool(
+                convert_document_sync, str(document_id), str(current_user.id)
+            )
+            return {
+                "status": "success",
+                "message": "Test document created and converted",
+                "document_id": document_id,
+                "task_id": None,
+                "storage_path": storage_path,
+                "conversion": conversion
+            }
         
         # Trigger conversion
-        task = convert_document.delay(str(document.id), str(current_user.id))
+        task = await run_in_threadpool(
+            convert_document.delay, str(document_id), str(current_user.id)
+        )
         
         return {
             "status": "success",
             "message": "Test document created and conversion started",
-            "document_id": document.id,
+            "document_id": document_id,
             "task_id": task.id,
             "storage_path": storage_path
         }
         
     except Exception as e:
-        db.rollback()
+        await run_in_threadpool(db.rollback)
+        await run_in_threadpool(
+            crud.document.update_status, db, document_id, "failed", str(e)
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create test document: {str(e)}"
@@ -398,18 +477,12 @@ The system converts documents like PDFs, DOCX, EPUB files into searchable Markdo
 @router.post("/{document_id}/convert-enhanced")
 def trigger_enhanced_document_conversion(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
-    preprocessing_config: Optional[Dict[str, Any]] = None,
+    preprocessing_config: Optional[PreprocessingOptions] = None,
 ):
     """Trigger enhanced document conversion with preprocessing."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    current_user, document = user_and_document
     
     if document.upload_status != "completed":
         raise HTTPException(
@@ -426,11 +499,11 @@ def trigger_enhanced_document_conversion(
     # Import enhanced conversion task
     from app.workers.enhanced_document_conversion import enhanced_convert_document
     
-    # Trigger enhanced Celery task
+    # Trigger enhanced Celery task with only the options that were set
     task = enhanced_convert_document.delay(
         str(document_id), 
         str(current_user.id),
-        preprocessing_config
+        preprocessing_config.model_dump(exclude_none=True) if preprocessing_config else None
     )
     
     return {
@@ -444,17 +517,11 @@ def trigger_enhanced_document_conversion(
 @router.get("/{document_id}/format-detection")
 def detect_document_format(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
 ):
     """Perform enhanced format detection on uploaded document."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    _, document = user_and_document
     
     if document.upload_status != "completed":
         raise HTTPException(
@@ -498,18 +565,12 @@ def detect_document_format(
 @router.post("/{document_id}/process-complete")
 def start_complete_document_processing(
     *,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    user_and_document: Tuple[models.User, models.Document] = Depends(deps.get_current_user_and_document),
     document_id: uuid.UUID,
-    pipeline_config: Optional[Dict[str, Any]] = None,
+    pipeline_config: Optional[PipelineOptions] = None,
 ):
     """Start complete document processing with status tracking."""
-    document = crud.document.get_by_id(db, document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found"
-        )
+    current_user, document = user_and_document
     
     if document.upload_status != "completed":
         raise HTTPException(
@@ -517,6 +578,9 @@ def start_complete_document_processing(
             detail="Document upload must be completed before processing"
         )
     
+    # Keep the broker message to the options that were actually set
+    pipeline_options = pipeline_config.model_dump(exclude_none=True) if pipeline_config else None
+    
     # Start processing tracking
     from app.services.processing_status_tracker import processing_status_tracker
     
@@ -524,7 +588,7 @@ def start_complete_document_processing(
         document_id=str(document_id),
         user_id=str(current_user.id),
         initial_metadata={
-            'pipeline_config': pipeline_config,
+            'pipeline_config': pipeline_options,
             'filename': document.original_filename,
             'file_type': document.file_type
         }
@@ -536,7 +600,7 @@ def start_complete_document_processing(
     task = process_document_complete.delay(
         str(document_id), 
         str(current_user.id),
-        pipeline_config
+        pipeline_options
     )
     
     return {
@@ -549,18 +613,107 @@ def start_complete_document_processing(
 
 def _get_conversion_status_message(upload_status: str) -> str:
     """Get human-readable conversion status message."""
-    status_messages = {
-        "pending": "Upload pending",
-        "uploading": "File uploading",
-        "completed": "Upload completed, ready for conversion",
-        "converting": "Converting to Markdown",
-        "conversion_completed": "Conversion completed successfully",
-        "conversion_failed": "Conversion failed",
-        "failed": "Upload failed"
-    }
-    return status_messages.get(upload_status, "Unknown status")
+    return _STATUS_MESSAGES.get(upload_status, "Unknown status")
+
+def _should_convert_inline(upload_data: DocumentUploadInit) -> bool:
+    """Whether a document is small and simple enough to skip the task queue."""
+    return (
+        upload_data.file_size < INLINE_CONVERSION_MAX_BYTES
+        and upload_data.file_type in INLINE_CONVERSION_FILE_TYPES
+    )
 
+@lru_cache(maxsize=4096)
 def _generate_markdown_storage_path(original_storage_path: str) -> str:
     """Generate storage path for the converted Markdown file."""
     base_path = original_storage_path.rsplit('.', 1)[0]
-    return f"{base_path}.md" 
\ No newline at end of file
+    return f"{base_path}.md"
+
+def _initiate_upload(
+    db: Session,
+    current_user: models.User,
+    upload_data: DocumentUploadInit,
+) -> DocumentUploadResponse:
+    """Create the document record and presigned URL(s) for a new upload."""
+    # Check for duplicate file (deduplication)
+    existing_doc = crud.document.get_by_hash(db, upload_data.file_hash)
+    if existing_doc:
+        # If user already has this document, return existing one
+        if existing_doc.user_id == current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="You have already uploaded this document"
+            )
+        else:
+            # Create a reference to the existing file for this user
+            storage_path = existing_doc.storage_path
+    else:
+        # Generate new storage path for new file
+        storage_path = storage_service.generate_storage_path(
+            current_user.id, 
+            upload_data.filename, 
+            upload_data.file_hash
+        )
+    
+    # Large files are uploaded as parallel parts through a multipart upload
+    if storage_service.should_use_multipart(upload_data.file_size):
+        return _initiate_multipart_upload(db, current_user, upload_data, storage_path)
+    
+    # Create document record
+    document = crud.document.create(
+        db=db,
+        document_data=upload_data,
+        user_id=current_user.id,
+        storage_path=storage_path
+    )
+    
+    # Generate presigned upload URL
+    upload_url = storage_service.generate_presigned_upload_url(storage_path)
+    if not upload_url:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate upload URL"
+        )
+    
+    return DocumentUploadResponse(
+        document_id=document.id,
+        upload_url=upload_url,
+        chunk_size=5242880  # 5MB chunks
+    )
+
+def _initiate_multipart_upload(
+    db: Session,
+    current_user: models.User,
+    upload_data: DocumentUploadInit,
+    storage_path: str,
+) -> DocumentUploadResponse:
+    """Start a multipart upload and presign a URL for every part."""
+    upload_id = storage_service.create_multipart_upload(storage_path)
+    if not upload_id:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start multipart upload"
+        )
+    
+    part_size = storage_service.get_multipart_part_size(upload_data.file_size)
+    part_count = math.ceil(upload_data.file_size / part_size)
+    parts = storage_service.generate_presigned_part_urls(storage_path, upload_id, part_count)
+    if not parts:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate upload URLs"
+        )
+    
+    document = crud.document.create(
+        db=db,
+        document_data=upload_data,
+        user_id=current_user.id,
+        storage_path=storage_path,
+        upload_id=upload_id
+    )
+    
+    return DocumentUploadResponse(
+        document_id=document.id,
+        chunk_size=part_size,
+        upload_id=upload_id,
+        parts=parts
+    )
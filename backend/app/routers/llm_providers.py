@@ -6,25 +6,56 @@ cost estimation, and provider health monitoring.
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union
-from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
-from pydantic import BaseModel, Field
+import msgspec
+import orjson
+from dataclasses import asdict
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
+from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
+from pydantic import BaseModel, ConfigDict, Field
 import asyncio
 
-from app.api.deps import get_current_user
+from app.api.deps import get_cached_current_user, get_current_superuser
+from app.core.cache import request_key_builder
+from app.core.config import settings
 from app.models.user import User
 from app.services.llm_providers import (
-    get_provider,
+    BaseLLMProvider,
+    configure_providers as apply_provider_config,
+    get_all_models,
+    get_configured_provider,
+    get_provider_status as get_status_trackers,
+    get_provider_status_summary,
     list_available_providers,
     LLMProviderFactory
 )
 from app.services.llm_providers.cost_calculator import get_cost_calculator
-from app.services.llm_providers.token_counter import get_token_counter, estimate_tokens
-from app.services.api_key_service import APIKeyService
+from app.services.llm_providers.request_coalescer import RequestCoalescer
+from app.services.llm_providers.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/llm-providers", tags=["LLM Providers"])
+router = APIRouter(
+    prefix="/llm-providers",
+    tags=["LLM Providers"],
+    default_response_class=ORJSONResponse
+)
+
+_completion_coalescer = RequestCoalescer()
+
+# Per-token (input, output) prices by provider and model, built once from
+# each provider class's MODEL_PRICING table (which is per 1K tokens)
+PRICING: Dict[str, Dict[str, Tuple[float, float]]] = {
+    provider_name: {
+        model: (pricing["input"] / 1000, pricing["output"] / 1000)
+        for model, pricing in getattr(
+            LLMProviderFactory.get_provider_class(provider_name), "MODEL_PRICING", {}
+        ).items()
+    }
+    for provider_name in LLMProviderFactory.list_providers()
+}
 
 
 # Request Models
@@ -37,6 +68,8 @@ class CompletionRequest(BaseModel):
     max_tokens: Optional[int] = Field(None, gt=0, le=8192, description="Maximum tokens to generate")
     stream: bool = Field(False, description="Whether to stream the response")
     fallback: bool = Field(True, description="Whether to fallback to other providers")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class CostEstimationRequest(BaseModel):
@@ -45,6 +78,8 @@ class CostEstimationRequest(BaseModel):
     model: Optional[str] = Field(None, description="Model to estimate for")
     max_tokens: Optional[int] = Field(None, gt=0, description="Maximum tokens to generate")
     providers: Optional[List[str]] = Field(None, description="Providers to compare")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class TokenCountRequest(BaseModel):
@@ -52,11 +87,26 @@ class TokenCountRequest(BaseModel):
     text: Union[str, List[Dict[str, str]]] = Field(..., description="Text or messages to count")
     model: Optional[str] = Field(None, description="Model for accurate counting")
     provider: Optional[str] = Field(None, description="Provider for estimation")
+    
+    model_config = ConfigDict(frozen=True)
+
+
+class TokenCountBatchRequest(BaseModel):
+    """Request model for batch token counting."""
+    texts: List[Union[str, List[Dict[str, str]]]] = Field(
+        ..., min_length=1, max_length=1000, description="Texts or message lists to count"
+    )
+    model: Optional[str] = Field(None, description="Model for accurate counting")
+    provider: Optional[str] = Field(None, description="Provider for estimation")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class ProviderConfigRequest(BaseModel):
     """Request model for provider configuration."""
     providers: Dict[str, Dict[str, Any]] = Field(..., description="Provider configurations")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 # Response Models
@@ -88,6 +138,11 @@ class TokenCountResponse(BaseModel):
     model: Optional[str] = None
 
 
+class TokenCountBatchResponse(BaseModel):
+    """Response model for batch token counting."""
+    results: List[TokenCountResponse]
+
+
 class ProviderStatusResponse(BaseModel):
     """Response model for provider status."""
     providers: Dict[str, Dict[str, Any]]
@@ -105,12 +160,62 @@ class ProviderHealthResponse(BaseModel):
     models_available: int
 
 
+# Response bodies for the hot completion and cost estimation routes. These
+# mirror CompletionResponse and CostEstimationResponse (which stay as the
+# OpenAPI documentation) but are encoded by msgspec without validation.
+class CompletionUsage(msgspec.Struct):
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+
+
+class Completion(msgspec.Struct):
+    content: str
+    model: str
+    provider: str
+    finish_reason: str
+    usage: CompletionUsage
+    cost: float
+    response_time_ms: int
+    request_id: Optional[str] = None
+
+
+class CostEstimate(msgspec.Struct):
+    provider: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    estimated_cost: float
+    cost_per_1k_tokens: float
+
+
+class CostEstimation(msgspec.Struct):
+    estimations: List[CostEstimate]
+    cheapest: CostEstimate
+    most_expensive: CostEstimate
+    total_models_compared: int
+
+
+_json_encoder = msgspec.json.Encoder()
+
+DEMO_COMPLETION = _json_encoder.encode(Completion(
+    content="LLM provider system is available. Please configure API keys to use completion features.",
+    model="demo",
+    provider="system",
+    finish_reason="demo",
+    usage=CompletionUsage(input_tokens=0, output_tokens=0, total_tokens=0),
+    cost=0.0,
+    response_time_ms=0,
+    request_id="demo"
+))
+
+
 # Endpoints
 
-@router.post("/complete", response_model=CompletionResponse)
+@router.post("/complete", response_model=None, responses={200: {"model": CompletionResponse}})
 async def create_completion(
     request: CompletionRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Generate completion using the best available provider.
@@ -118,36 +223,70 @@ async def create_completion(
     This endpoint automatically selects the best provider based on
     configuration and fallback settings.
     """
+    provider_name = request.provider or settings.LLM_DEFAULT_PROVIDER
+    
     try:
-        # For now, return a simple response indicating LLM providers are available
-        # but need proper API key configuration
-        return CompletionResponse(
-            content="LLM provider system is available. Please configure API keys to use completion features.",
-            model="demo",
-            provider="system",
-            finish_reason="demo",
-            usage={
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_tokens": 0
-            },
-            cost=0.0,
-            response_time_ms=0,
-            request_id="demo"
+        provider = get_configured_provider(provider_name)
+        
+        if not provider:
+            # No API key configured for the provider
+            return Response(DEMO_COMPLETION, media_type="application/json")
+        
+        if request.stream:
+            # Relay chunks as they arrive instead of buffering the completion
+            return StreamingResponse(
+                _sse_stream(provider, request),
+                media_type="text/event-stream"
+            )
+        
+        def call():
+            return provider.complete(
+                messages=request.messages,
+                model=request.model,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens
+            )
+        
+        if request.temperature == 0:
+            # Deterministic requests: identical concurrent calls share one upstream request
+            response = await _completion_coalescer.run(
+                (provider_name, request.model, request.max_tokens, orjson.dumps(request.messages, option=orjson.OPT_SORT_KEYS)),
+                call
+            )
+        else:
+            response = await call()
+        get_status_trackers()[provider_name].record_success(response.response_time_ms)
+        
+        completion = Completion(
+            content=response.content,
+            model=response.model,
+            provider=response.provider,
+            finish_reason=response.finish_reason,
+            usage=CompletionUsage(
+                input_tokens=response.usage.input_tokens,
+                output_tokens=response.usage.output_tokens,
+                total_tokens=response.usage.total_tokens
+            ),
+            cost=response.cost,
+            response_time_ms=response.response_time_ms,
+            request_id=response.request_id
         )
+        return Response(_json_encoder.encode(completion), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Completion failed: {e}")
+        if provider_name in get_status_trackers():
+            get_status_trackers()[provider_name].record_error(str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Completion failed: {str(e)}"
         )
 
 
-@router.post("/estimate-cost", response_model=CostEstimationResponse)
+@router.post("/estimate-cost", response_model=None, responses={200: {"model": CostEstimationResponse}})
 async def estimate_completion_cost(
     request: CostEstimationRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Estimate cost for completion across different providers.
@@ -155,51 +294,46 @@ async def estimate_completion_cost(
     Useful for cost optimization and provider selection.
     """
     try:
-        # factory = get_provider_factory()
-        # calculator = get_cost_calculator()
-        
-        # For demo purposes, return sample cost estimation
-        input_tokens = 100
-        output_tokens = 50
-        
-        # Demo cost estimates for available providers
-        estimations = [
-            {
-                "provider": "openai",
-                "model": "gpt-4o",
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "estimated_cost": 0.005,
-                "cost_per_1k_tokens": 0.033
-            },
-            {
-                "provider": "claude",
-                "model": "claude-3.5-sonnet",
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "estimated_cost": 0.007,
-                "cost_per_1k_tokens": 0.047
-            },
-            {
-                "provider": "gemini",
-                "model": "gemini-2.0-flash",
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "estimated_cost": 0.003,
-                "cost_per_1k_tokens": 0.020
-            }
-        ]
+        provider_names = request.providers or list_available_providers()
+        
+        # Estimate every provider concurrently; tokenizing runs off the event
+        # loop and a slow provider is dropped instead of delaying the response
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    asyncio.to_thread(_estimate_for, provider_name, request),
+                    timeout=settings.LLM_COST_ESTIMATE_TIMEOUT
+                )
+                for provider_name in provider_names
+            ),
+            return_exceptions=True
+        )
+        
+        estimations = []
+        for provider_name, result in zip(provider_names, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Cost estimation for {provider_name} failed: {result!r}")
+            elif result is not None:
+                estimations.append(result)
+        
+        if not estimations:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No pricing available for the requested providers"
+            )
         
-        cheapest = estimations[2]  # Gemini
-        most_expensive = estimations[1]  # Claude
+        estimations.sort(key=lambda estimation: estimation.estimated_cost)
         
-        return CostEstimationResponse(
+        result = CostEstimation(
             estimations=estimations,
-            cheapest=cheapest,
-            most_expensive=most_expensive,
+            cheapest=estimations[0],
+            most_expensive=estimations[-1],
             total_models_compared=len(estimations)
         )
+        return Response(_json_encoder.encode(result), media_type="application/json")
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Cost estimation failed: {e}")
         raise HTTPException(
@@ -208,10 +342,10 @@ async def estimate_completion_cost(
         )
 
 
-@router.post("/count-tokens", response_model=TokenCountResponse)
+@router.post("/count-tokens", response_model=None, responses={200: {"model": TokenCountResponse}})
 async def count_tokens(
     request: TokenCountRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Count tokens in text or messages.
@@ -226,12 +360,12 @@ async def count_tokens(
             provider=request.provider
         )
         
-        return TokenCountResponse(
-            tokens=result.tokens,
-            method=result.method.value,
-            confidence=result.confidence,
-            model=result.model
-        )
+        return {
+            "tokens": result.tokens,
+            "method": result.method.value,
+            "confidence": result.confidence,
+            "model": result.model
+        }
         
     except Exception as e:
         logger.error(f"Token counting failed: {e}")
@@ -241,9 +375,61 @@ async def count_tokens(
         )
 
 
-@router.get("/providers", response_model=ProviderStatusResponse)
+@router.post("/count-tokens/batch", response_model=None, responses={200: {"model": TokenCountBatchResponse}})
+async def count_tokens_batch(
+    request: TokenCountBatchRequest,
+    current_user: User = Depends(get_cached_current_user)
+):
+    """
+    Count tokens for many texts or message lists in one request.
+    
+    Plain strings are tokenized together in a single tokenizer call.
+    """
+    try:
+        counter = get_token_counter()
+        results = await asyncio.to_thread(
+            counter.batch_count,
+            request.texts,
+            request.model,
+            request.provider
+        )
+        
+        return {
+            "results": [
+                {
+                    "tokens": result.tokens,
+                    "method": result.method.value,
+                    "confidence": result.confidence,
+                    "model": result.model
+                }
+                for result in results
+            ]
+        }
+        
+    except Exception as e:
+        logger.error(f"Batch token counting failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch token counting failed: {str(e)}"
+        )
+
+
+@router.get("/count-tokens/cache-stats")
+async def get_token_cache_stats(
+    current_user: User = Depends(get_cached_current_user)
+):
+    """
+    Get token count cache statistics.
+    
+    Debug endpoint for checking how often repeated inputs hit the cache.
+    """
+    return get_token_counter().cache_stats()
+
+
+@router.get("/providers", response_model=None, responses={200: {"model": ProviderStatusResponse}})
+@cache(expire=5, namespace="llm-providers", key_builder=request_key_builder)
 async def get_provider_status(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Get status of all registered providers.
@@ -251,36 +437,7 @@ async def get_provider_status(
     Shows which providers are available, healthy, and their capabilities.
     """
     try:
-        factory = get_provider_factory()
-        provider_status = factory.get_provider_status()
-        
-        # Format status for response
-        formatted_status = {}
-        available_count = 0
-        healthy_count = 0
-        
-        for name, status in provider_status.items():
-            formatted_status[name] = {
-                "available": status.available,
-                "last_check": status.last_check,
-                "response_time_ms": status.response_time_ms,
-                "error_count": status.error_count,
-                "success_count": status.success_count,
-                "last_error": status.last_error,
-                "success_rate": status.success_count / (status.success_count + status.error_count) if (status.success_count + status.error_count) > 0 else 0
-            }
-            
-            if status.available:
-                available_count += 1
-                if status.error_count == 0 or status.success_count > status.error_count:
-                    healthy_count += 1
-        
-        return ProviderStatusResponse(
-            providers=formatted_status,
-            total_providers=len(provider_status),
-            available_providers=available_count,
-            healthy_providers=healthy_count
-        )
+        return get_provider_status_summary()
         
     except Exception as e:
         logger.error(f"Getting provider status failed: {e}")
@@ -293,7 +450,7 @@ async def get_provider_status(
 @router.post("/health-check")
 async def run_health_check(
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Run health check on all providers.
@@ -301,10 +458,8 @@ async def run_health_check(
     This can be run in the background to update provider status.
     """
     try:
-        factory = get_provider_factory()
-        
         # Run health check in background
-        background_tasks.add_task(factory.health_check_all)
+        background_tasks.add_task(_parallel_health_check)
         
         return {"message": "Health check initiated"}
         
@@ -319,7 +474,7 @@ async def run_health_check(
 @router.get("/health-check/{provider_name}", response_model=ProviderHealthResponse)
 async def check_provider_health(
     provider_name: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Check health of a specific provider.
@@ -327,7 +482,7 @@ async def check_provider_health(
     Provides detailed health information for a single provider.
     """
     try:
-        provider = await get_provider(provider_name)
+        provider = get_configured_provider(provider_name)
         
         if not provider:
             raise HTTPException(
@@ -335,7 +490,18 @@ async def check_provider_health(
                 detail=f"Provider {provider_name} not found"
             )
         
-        health_result = await provider.health_check()
+        try:
+            health_result = await asyncio.wait_for(
+                provider.health_check(),
+                timeout=settings.LLM_HEALTH_CHECK_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            health_result = {
+                "status": "unhealthy",
+                "error": f"Health check timed out after {settings.LLM_HEALTH_CHECK_TIMEOUT}s"
+            }
+        
+        get_status_trackers()[provider_name].record_health_check(health_result)
         
         return ProviderHealthResponse(
             provider=provider_name,
@@ -356,9 +522,10 @@ async def check_provider_health(
 
 
 @router.get("/models")
+@cache(expire=60, namespace="llm-models", key_builder=request_key_builder)
 async def list_supported_models(
     provider: Optional[str] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     List supported models across providers.
@@ -367,7 +534,7 @@ async def list_supported_models(
     """
     try:
         if provider:
-            provider_instance = await get_provider(provider)
+            provider_instance = get_configured_provider(provider)
             if not provider_instance:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -380,18 +547,8 @@ async def list_supported_models(
                 "default_models": provider_instance.default_models
             }
         else:
-            # Get models from all providers
-            factory = get_provider_factory()
-            available_providers = list_available_providers()
-            
-            all_models = {}
-            for provider_name in available_providers:
-                provider_instance = await get_provider(provider_name)
-                if provider_instance:
-                    all_models[provider_name] = {
-                        "models": provider_instance.supported_models,
-                        "default_models": provider_instance.default_models
-                    }
+            # Get models from all configured providers
+            all_models = get_all_models()
             
             return {
                 "providers": all_models,
@@ -409,11 +566,12 @@ async def list_supported_models(
 
 
 @router.get("/usage-statistics")
+@cache(expire=30, namespace="llm-usage", key_builder=request_key_builder)
 async def get_usage_statistics(
     provider: Optional[str] = None,
     model: Optional[str] = None,
     days: int = 30,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """
     Get usage statistics for LLM providers.
@@ -442,16 +600,17 @@ async def get_usage_statistics(
 @router.post("/configure")
 async def configure_providers(
     request: ProviderConfigRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_superuser)
 ):
     """
     Configure LLM providers.
     
     Requires admin privileges to update provider configurations.
     """
-    # Note: In a real implementation, you'd want to check admin privileges
     try:
-        # registered = initialize_providers(request.providers)
+        registered = await apply_provider_config(request.providers)
+        
+        await FastAPICache.clear(namespace="llm-models")
         
         return {
             "message": f"Successfully configured {len(registered)} providers",
@@ -463,4 +622,105 @@ async def configure_providers(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Provider configuration failed: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+def _estimate_for(provider_name: str, request: CostEstimationRequest) -> Optional[CostEstimate]:
+    """
+    Estimate the cost of a request on a single provider.
+    
+    Uses the requested model when the provider offers it, otherwise the
+    provider's cheapest model. Returns None if the provider has no pricing.
+    """
+    prices = PRICING.get(provider_name)
+    if not prices:
+        return None
+    
+    model = request.model if request.model in prices else None
+    
+    input_tokens = get_token_counter().count_tokens(
+        text=request.messages,
+        model=model,
+        provider=provider_name
+    ).tokens
+    # Heuristic: output is usually 20-50% of input
+    output_tokens = request.max_tokens or min(int(input_tokens * 0.3), 1000)
+    
+    if model is None:
+        model = min(
+            prices,
+            key=lambda name: input_tokens * prices[name][0] + output_tokens * prices[name][1]
+        )
+    
+    input_price, output_price = prices[model]
+    cost = input_tokens * input_price + output_tokens * output_price
+    total_tokens = input_tokens + output_tokens
+    
+    return CostEstimate(
+        provider=provider_name,
+        model=model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        estimated_cost=round(cost, 6),
+        cost_per_1k_tokens=round(cost / total_tokens * 1000, 6) if total_tokens else 0.0
+    )
+
+
+async def _parallel_health_check():
+    """Health check every configured provider concurrently and log the results."""
+    providers = [
+        provider
+        for provider in map(get_configured_provider, list_available_providers())
+        if provider
+    ]
+    
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(provider.health_check(), timeout=settings.LLM_HEALTH_CHECK_TIMEOUT)
+            for provider in providers
+        ),
+        return_exceptions=True
+    )
+    
+    provider_status = get_status_trackers()
+    
+    for provider, result in zip(providers, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning(
+                f"Health check for {provider.provider_name} timed out after "
+                f"{settings.LLM_HEALTH_CHECK_TIMEOUT}s"
+            )
+            result = {
+                "status": "unhealthy",
+                "error": f"Health check timed out after {settings.LLM_HEALTH_CHECK_TIMEOUT}s"
+            }
+        elif isinstance(result, BaseException):
+            logger.error(f"Health check for {provider.provider_name} failed: {result!r}")
+            result = {"status": "unhealthy", "error": str(result)}
+        else:
+            logger.info(f"Health check for {provider.provider_name}: {result.get('status', 'unknown')}")
+        
+        provider_status[provider.provider_name].record_health_check(result)
+
+
+async def _sse_stream(provider: BaseLLMProvider, request: CompletionRequest) -> AsyncIterator[bytes]:
+    """Relay a provider's streamed completion as server-sent events."""
+    tracker = get_status_trackers()[provider.provider_name]
+    
+    try:
+        chunks = await provider.complete(
+            messages=request.messages,
+            model=request.model,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            stream=True
+        )
+        async for chunk in chunks:
+            yield b"data: " + orjson.dumps(asdict(chunk)) + b"\n\n"
+        tracker.record_success()
+    except Exception as e:
+        logger.error(f"Streaming completion failed: {e}")
+        tracker.record_error(str(e))
+        yield b"data: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+    
+    yield b"data: [DONE]\n\n"
@@ -1,31 +1,77 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
-from fastapi.security import HTTPBearer
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from datetime import datetime
+from types import MappingProxyType
+import asyncio
 import logging
+import time
 
+from fastapi_cache.decorator import cache
+
+from app.core.cache import request_key_builder
 from app.core.config import settings
 from app.core.security import (
     rbac_manager, jwt_manager, ip_restriction_manager, 
-    data_encryption, api_key_storage, password_security,
-    Permission, SecurityError, AuthenticationError, AuthorizationError
+    data_encryption, api_key_storage, Permission
 )
 from app.core.vulnerability_scanner import vulnerability_manager, test_password_strength
-from app.middleware.security import RateLimitConfig
+from app.middleware.security import RateLimitConfig, RedisTokenBucket
 from app.models.user import User
-from app.crud.user import get_current_user
+from app.api.deps import get_cached_current_user
 
 logger = logging.getLogger(__name__)
-security = HTTPBearer()
 
 router = APIRouter(prefix="/security", tags=["security"])
 
+# Response timestamps are shared at 100ms granularity instead of
+# formatting a new datetime on every request
+_TIMESTAMP_RESOLUTION_SECONDS = 0.1
+_now_iso_cache = (0.0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO format, refreshed at most every 100ms."""
+    global _now_iso_cache
+    refreshed_at, value = _now_iso_cache
+    now = time.monotonic()
+    if now - refreshed_at >= _TIMESTAMP_RESOLUTION_SECONDS:
+        value = datetime.utcnow().isoformat()
+        _now_iso_cache = (now, value)
+    return value
+
+
+def require_permission(permission: str):
+    """Dependency factory rejecting users whose role lacks `permission`."""
+    async def dependency(current_user: User = Depends(get_cached_current_user)) -> User:
+        if not rbac_manager.check_permission(current_user.role, permission):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions"
+            )
+        return current_user
+    return dependency
+
+
+require_admin_read = require_permission(Permission.ADMIN_READ)
+
+# Rate limits are static for the process lifetime, so the response body is
+# built once and only the timestamp is added per request
+_RATE_LIMITS_CONFIG = RateLimitConfig()
+_RATE_LIMITS_PAYLOAD = MappingProxyType({
+    "rate_limits": {
+        "default_per_minute": _RATE_LIMITS_CONFIG.DEFAULT_REQUESTS_PER_MINUTE,
+        "default_per_hour": _RATE_LIMITS_CONFIG.DEFAULT_REQUESTS_PER_HOUR,
+        "endpoint_limits": _RATE_LIMITS_CONFIG.ENDPOINT_LIMITS,
+        "role_limits": _RATE_LIMITS_CONFIG.ROLE_LIMITS
+    }
+})
+
 # ============================================================================
 # SECURITY CONFIGURATION ENDPOINTS
 # ============================================================================
 
 @router.get("/config", summary="Get security configuration")
-async def get_security_config(current_user: User = Depends(get_current_user)):
+async def get_security_config(current_user: User = Depends(get_cached_current_user)):
     """Get current security configuration (admin only)"""
     if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_SYSTEM):
         raise HTTPException(
@@ -35,23 +81,17 @@ async def get_security_config(current_user: User = Depends(get_current_user)):
     
     return {
         "security_config": settings.security_config,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 @router.get("/status", summary="Get security status overview")
-async def get_security_status(current_user: User = Depends(get_current_user)):
+async def get_security_status(current_user: User = Depends(require_admin_read)):
     """Get overall security status"""
-    if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_READ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions"
-        )
-    
     # Get latest vulnerability scan report
     latest_scan = vulnerability_manager.get_latest_report()
     
     security_status = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "encryption_enabled": settings.DATA_ENCRYPTION_ENABLED,
         "audit_logging_enabled": settings.AUDIT_LOGGING_ENABLED,
         "rate_limiting_enabled": settings.RATE_LIMIT_ENABLED,
@@ -70,7 +110,7 @@ async def get_security_status(current_user: User = Depends(get_current_user)):
 @router.post("/scan/dependencies", summary="Run dependency vulnerability scan")
 async def run_dependency_scan(
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Run dependency vulnerability scan"""
     if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_SYSTEM):
@@ -82,21 +122,16 @@ async def run_dependency_scan(
     # Run scan in background
     background_tasks.add_task(vulnerability_manager.run_dependency_scan)
     
+    now = datetime.utcnow()
     return {
         "message": "Dependency vulnerability scan initiated",
-        "scan_id": f"dep_scan_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-        "timestamp": datetime.utcnow().isoformat()
+        "scan_id": f"dep_scan_{now.strftime('%Y%m%d_%H%M%S')}",
+        "timestamp": now.isoformat()
     }
 
 @router.get("/scan/reports", summary="Get vulnerability scan reports")
-async def get_scan_reports(current_user: User = Depends(get_current_user)):
+async def get_scan_reports(current_user: User = Depends(require_admin_read)):
     """Get latest vulnerability scan reports"""
-    if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_READ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions"
-        )
-    
     latest_report = vulnerability_manager.get_latest_report()
     
     if not latest_report:
@@ -107,7 +142,7 @@ async def get_scan_reports(current_user: User = Depends(get_current_user)):
     
     return {
         "latest_report": latest_report,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 # ============================================================================
@@ -117,7 +152,7 @@ async def get_scan_reports(current_user: User = Depends(get_current_user)):
 @router.post("/test/password", summary="Test password strength")
 async def test_password(
     password_data: Dict[str, str],
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Test password strength and complexity"""
     password = password_data.get("password")
@@ -132,7 +167,7 @@ async def test_password(
     
     return {
         "password_test": result,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 # ============================================================================
@@ -142,7 +177,7 @@ async def test_password(
 @router.post("/test/encryption", summary="Test data encryption")
 async def test_encryption(
     test_data: Dict[str, str],
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Test data encryption and decryption"""
     if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_SYSTEM):
@@ -154,11 +189,13 @@ async def test_encryption(
     data = test_data.get("data", "test data")
     
     try:
+        # PBKDF2 key derivation takes tens of milliseconds per call, so
+        # run it off the event loop
         # Test encryption
-        encrypted = data_encryption.encrypt(data)
+        encrypted = await asyncio.to_thread(data_encryption.encrypt, data)
         
         # Test decryption
-        decrypted = data_encryption.decrypt(encrypted)
+        decrypted = await asyncio.to_thread(data_encryption.decrypt, encrypted)
         
         return {
             "encryption_test": {
@@ -167,7 +204,7 @@ async def test_encryption(
                 "decryption_successful": data == decrypted,
                 "encryption_working": True
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }
     
     except Exception as e:
@@ -177,7 +214,7 @@ async def test_encryption(
                 "encryption_working": False,
                 "error": str(e)
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }
 
 # ============================================================================
@@ -187,7 +224,7 @@ async def test_encryption(
 @router.get("/rbac/permissions/{role}", summary="Get permissions for role")
 async def get_role_permissions(
     role: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Get all permissions for a specific role"""
     if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_USERS):
@@ -202,13 +239,13 @@ async def get_role_permissions(
         "role": role,
         "permissions": permissions,
         "permission_count": len(permissions),
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 @router.post("/rbac/check", summary="Check permission for user")
 async def check_permission(
     permission_data: Dict[str, str],
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Check if current user has specific permission"""
     required_permission = permission_data.get("permission")
@@ -224,7 +261,7 @@ async def check_permission(
         "user_role": current_user.role,
         "required_permission": required_permission,
         "has_permission": has_permission,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 # ============================================================================
@@ -232,7 +269,7 @@ async def check_permission(
 # ============================================================================
 
 @router.get("/ip-restrictions", summary="Get IP restrictions")
-async def get_ip_restrictions(current_user: User = Depends(get_current_user)):
+async def get_ip_restrictions(current_user: User = Depends(get_cached_current_user)):
     """Get current IP restrictions configuration"""
     if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_SYSTEM):
         raise HTTPException(
@@ -242,17 +279,17 @@ async def get_ip_restrictions(current_user: User = Depends(get_current_user)):
     
     return {
         "ip_restrictions": {
-            "blocked_ips": list(ip_restriction_manager.blocked_ips),
+            "blocked_ips": ip_restriction_manager.get_blocked_ips(),
             "allowed_networks": [str(net) for net in ip_restriction_manager.allowed_networks],
             "admin_only_networks": [str(net) for net in ip_restriction_manager.admin_only_networks]
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 @router.post("/ip-restrictions/block", summary="Block IP address")
 async def block_ip(
     ip_data: Dict[str, str],
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Block an IP address"""
     if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_SYSTEM):
@@ -277,7 +314,7 @@ async def block_ip(
             "message": f"IP address {ip_address} blocked successfully",
             "ip_address": ip_address,
             "reason": reason,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }
     
     except Exception as e:
@@ -294,7 +331,7 @@ async def block_ip(
 @router.post("/api-keys/store", summary="Store encrypted API key")
 async def store_api_key(
     key_data: Dict[str, str],
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Store an encrypted API key"""
     if not rbac_manager.check_permission(current_user.role, Permission.API_KEYS_MANAGE):
@@ -320,13 +357,16 @@ async def store_api_key(
         )
     
     try:
-        storage_id = api_key_storage.store_api_key(str(current_user.id), provider, api_key)
+        # Per-key PBKDF2 derivation is CPU-bound, keep it off the event loop
+        storage_id = await asyncio.to_thread(
+            api_key_storage.store_api_key, str(current_user.id), provider, api_key
+        )
         
         return {
             "message": "API key stored successfully",
             "storage_id": storage_id,
             "provider": provider,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }
     
     except Exception as e:
@@ -345,15 +385,9 @@ async def get_audit_events(
     limit: int = 100,
     offset: int = 0,
     event_type: Optional[str] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_admin_read)
 ):
     """Get audit log events"""
-    if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_READ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions"
-        )
-    
     # In a real implementation, this would read from audit log files or database
     # For now, return a placeholder response
     
@@ -364,7 +398,7 @@ async def get_audit_events(
             "offset": offset,
             "event_type": event_type
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
 
 # ============================================================================
@@ -372,39 +406,19 @@ async def get_audit_events(
 # ============================================================================
 
 @router.get("/rate-limits", summary="Get rate limiting configuration")
-async def get_rate_limits(current_user: User = Depends(get_current_user)):
+@cache(expire=300, namespace="security-rate-limits", key_builder=request_key_builder)
+async def get_rate_limits(current_user: User = Depends(require_admin_read)):
     """Get current rate limiting configuration"""
-    if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_READ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions"
-        )
-    
-    config = RateLimitConfig()
-    
-    return {
-        "rate_limits": {
-            "default_per_minute": config.DEFAULT_REQUESTS_PER_MINUTE,
-            "default_per_hour": config.DEFAULT_REQUESTS_PER_HOUR,
-            "endpoint_limits": config.ENDPOINT_LIMITS,
-            "role_limits": config.ROLE_LIMITS
-        },
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return {**_RATE_LIMITS_PAYLOAD, "timestamp": _now_iso()}
 
 # ============================================================================
 # SECURITY METRICS
 # ============================================================================
 
 @router.get("/metrics", summary="Get security metrics")
-async def get_security_metrics(current_user: User = Depends(get_current_user)):
+@cache(expire=10, namespace="security-metrics", key_builder=request_key_builder)
+async def get_security_metrics(current_user: User = Depends(require_admin_read)):
     """Get security-related metrics"""
-    if not rbac_manager.check_permission(current_user.role, Permission.ADMIN_READ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Insufficient permissions"
-        )
-    
     # In a real implementation, these would come from monitoring systems
     metrics = {
         "authentication": {
@@ -423,7 +437,7 @@ async def get_security_metrics(current_user: User = Depends(get_current_user)):
             "rate_limiting_enabled": settings.RATE_LIMIT_ENABLED,
             "owasp_protection_enabled": settings.OWASP_TOP10_PROTECTION
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
     
     return metrics
@@ -432,11 +446,47 @@ async def get_security_metrics(current_user: User = Depends(get_current_user)):
 # INCIDENT RESPONSE
 # ============================================================================
 
-@router.post("/incident/report", summary="Report security incident")
+# Reported incidents are queued and written out in batches by a background
+# task instead of on the request path
+INCIDENT_BATCH_SIZE = 100
+INCIDENT_FLUSH_INTERVAL_SECONDS = 5.0
+_incident_queue: Optional[asyncio.Queue] = None
+_incident_flusher: Optional[asyncio.Task] = None
+
+# Each user may report a burst of 10 incidents, then one per minute
+INCIDENT_REPORT_BURST = 10
+INCIDENT_REPORTS_PER_SECOND = 1 / 60
+_incident_bucket = RedisTokenBucket()
+
+
+async def incident_rate_limit(current_user: User = Depends(get_cached_current_user)):
+    """Reject incident reports from users who have used up their bucket."""
+    try:
+        allowed, _ = await _incident_bucket.consume(
+            f"rl:incident:{current_user.id}",
+            INCIDENT_REPORT_BURST,
+            INCIDENT_REPORTS_PER_SECOND
+        )
+    except Exception as e:
+        # Continue without rate limiting if Redis is unavailable
+        logger.error(f"Incident rate limiting error: {e}")
+        return
+    
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many incident reports"
+        )
+
+@router.post(
+    "/incident/report",
+    summary="Report security incident",
+    dependencies=[Depends(incident_rate_limit)]
+)
 async def report_security_incident(
     incident_data: Dict[str, Any],
     request: Request,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_cached_current_user)
 ):
     """Report a security incident"""
     incident_type = incident_data.get("type")
@@ -451,9 +501,10 @@ async def report_security_incident(
     
     # Log security incident
     client_ip = request.client.host
+    now = datetime.utcnow()
     incident_log = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "incident_id": f"SEC_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+        "timestamp": now.isoformat(),
+        "incident_id": f"SEC_{now.strftime('%Y%m%d_%H%M%S')}",
         "type": incident_type,
         "description": description,
         "severity": severity,
@@ -462,7 +513,7 @@ async def report_security_incident(
         "user_agent": request.headers.get("user-agent")
     }
     
-    logger.warning(f"Security incident reported: {incident_log}")
+    _enqueue_incident(incident_log)
     
     return {
         "message": "Security incident reported successfully",
@@ -478,54 +529,75 @@ async def report_security_incident(
 async def security_health_check():
     """Check health of security systems"""
     health_status = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "overall_status": "healthy",
         "systems": {}
     }
     
-    # Test encryption
-    try:
-        test_data = "health_check_test"
-        encrypted = data_encryption.encrypt(test_data)
-        decrypted = data_encryption.decrypt(encrypted)
-        health_status["systems"]["encryption"] = {
-            "status": "healthy" if test_data == decrypted else "error",
-            "message": "Encryption/decryption working"
-        }
-    except Exception as e:
-        health_status["systems"]["encryption"] = {
-            "status": "error",
-            "message": f"Encryption test failed: {e}"
-        }
-        health_status["overall_status"] = "degraded"
-    
-    # Test JWT
-    try:
-        test_token = jwt_manager.create_access_token("health_check")
-        payload = jwt_manager.verify_token(test_token)
-        health_status["systems"]["jwt"] = {
-            "status": "healthy",
-            "message": "JWT creation/verification working"
-        }
-    except Exception as e:
-        health_status["systems"]["jwt"] = {
-            "status": "error",
-            "message": f"JWT test failed: {e}"
-        }
-        health_status["overall_status"] = "degraded"
-    
-    # Test RBAC
-    try:
-        permissions = rbac_manager.get_user_permissions("user")
-        health_status["systems"]["rbac"] = {
-            "status": "healthy",
-            "message": f"RBAC working, {len(permissions)} permissions for user role"
-        }
-    except Exception as e:
-        health_status["systems"]["rbac"] = {
-            "status": "error",
-            "message": f"RBAC test failed: {e}"
-        }
-        health_status["overall_status"] = "degraded"
-    
-    return health_status 
\ No newline at end of file
+    # The self-tests run concurrently off the event loop
+    checks = (("encryption", "Encryption", _check_encryption), ("jwt", "JWT", _check_jwt), ("rbac", "RBAC", _check_rbac))
+    results = await asyncio.gather(
+        *(asyncio.to_thread(check) for _, _, check in checks),
+        return_exceptions=True
+    )
+    
+    for (system, label, _), result in zip(checks, results):
+        if isinstance(result, Exception):
+            result = {
+                "status": "error",
+                "message": f"{label} test failed: {result}"
+            }
+        health_status["systems"][system] = result
+        if result["status"] != "healthy":
+            health_status["overall_status"] = "degraded"
+    
+    return health_status
+
+
+def _enqueue_incident(incident_log: Dict[str, Any]):
+    """Queue an incident, starting the flusher on first use."""
+    global _incident_queue, _incident_flusher
+    if _incident_queue is None:
+        _incident_queue = asyncio.Queue()
+    if _incident_flusher is None or _incident_flusher.done():
+        _incident_flusher = asyncio.create_task(_flush_incidents(_incident_queue))
+    _incident_queue.put_nowait(incident_log)
+
+
+async def _flush_incidents(queue: asyncio.Queue):
+    """Write queued incidents in batches of up to INCIDENT_BATCH_SIZE."""
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < INCIDENT_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        
+        logger.warning(f"Security incidents reported ({len(batch)}): {batch}")
+        await asyncio.sleep(INCIDENT_FLUSH_INTERVAL_SECONDS)
+
+
+def _check_encryption() -> Dict[str, str]:
+    """Encrypt and decrypt a probe value."""
+    test_data = "health_check_test"
+    decrypted = data_encryption.decrypt(data_encryption.encrypt(test_data))
+    return {
+        "status": "healthy" if test_data == decrypted else "error",
+        "message": "Encryption/decryption working"
+    }
+
+
+def _check_jwt() -> Dict[str, str]:
+    """Create and verify a probe token."""
+    jwt_manager.verify_token(jwt_manager.create_access_token("health_check"))
+    return {
+        "status": "healthy",
+        "message": "JWT creation/verification working"
+    }
+
+
+def _check_rbac() -> Dict[str, str]:
+    """Resolve the permissions of the user role."""
+    permissions = rbac_manager.get_user_permissions("user")
+    return {
+        "status": "healthy",
+        "message": f"RBAC working, {len(permissions)} permissions for user role"
+    }
@@ -10,10 +10,16 @@ from datetime import date, datetime
 from typing import Dict, List, Optional, Any
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select, update, union_all, literal, cast, String
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 
 from app.api import deps
+from app.core.cache import request_key_builder
+from app.crud.pagination import encode_cursor, decode_cursor
 from app.models.user import User
 from app.models.subscription import (
     SubscriptionTier as SubscriptionTierModel,
@@ -53,28 +59,32 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/subscription", tags=["subscription"])
 
+# Every route on the admin router requires a superuser
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(deps.get_current_superuser)])
+
 
 # Subscription Tier Management (Admin only)
-@router.get("/tiers", response_model=TierListResponse)
+@router.get("/tiers", response_model=None, responses={200: {"model": TierListResponse}})
+@cache(expire=300, namespace="subscription-tiers", key_builder=request_key_builder)
 async def get_subscription_tiers(
     active_only: bool = Query(True, description="Return only active tiers"),
     db: Session = Depends(deps.get_db)
 ):
     """Get all subscription tiers."""
-    query = db.query(SubscriptionTierModel)
+    query = select(SubscriptionTierModel)
     
     if active_only:
-        query = query.filter(SubscriptionTierModel.is_active == True)
+        query = query.where(SubscriptionTierModel.is_active == True)
     
-    tiers = query.order_by(SubscriptionTierModel.sort_order).all()
+    tiers = db.scalars(query.order_by(SubscriptionTierModel.sort_order)).all()
     
-    return TierListResponse(
-        tiers=tiers,
-        total=len(tiers)
-    )
+    return {
+        "tiers": [tier.to_dict() for tier in tiers],
+        "total": len(tiers)
+    }
 
 
-@router.get("/tiers/{tier_id}", response_model=SubscriptionTier)
+@router.get("/tiers/{tier_id}", response_model=None, responses={200: {"model": SubscriptionTier}})
 async def get_subscription_tier(
     tier_id: UUID,
     db: Session = Depends(deps.get_db)
@@ -90,22 +100,16 @@ async def get_subscription_tier(
             detail="Subscription tier not found"
         )
     
-    return tier
+    return ORJSONResponse(tier.to_dict())
 
 
 @router.post("/tiers", response_model=SubscriptionTier)
 async def create_subscription_tier(
     tier_data: SubscriptionTierCreate,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_superuser)
 ):
     """Create a new subscription tier (admin only)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can create subscription tiers"
-        )
-    
     # Check if tier name already exists
     existing_tier = db.query(SubscriptionTierModel).filter(
         SubscriptionTierModel.name == tier_data.name
@@ -117,10 +121,11 @@ async def create_subscription_tier(
             detail="Subscription tier with this name already exists"
         )
     
-    tier = SubscriptionTierModel(**tier_data.dict())
+    tier = SubscriptionTierModel(**tier_data.model_dump())
     db.add(tier)
     db.commit()
     db.refresh(tier)
+    await FastAPICache.clear(namespace="subscription-tiers")
     
     logger.info(f"Created subscription tier: {tier.name} by user {current_user.id}")
     
@@ -132,15 +137,9 @@ async def update_subscription_tier(
     tier_id: UUID,
     tier_data: SubscriptionTierUpdate,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_current_superuser)
 ):
     """Update a subscription tier (admin only)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can update subscription tiers"
-        )
-    
     tier = db.query(SubscriptionTierModel).filter(
         SubscriptionTierModel.id == tier_id
     ).first()
@@ -152,13 +151,14 @@ async def update_subscription_tier(
         )
     
     # Update tier with provided data
-    update_data = tier_data.dict(exclude_unset=True)
+    update_data = tier_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(tier, field, value)
     
     tier.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(tier)
+    await FastAPICache.clear(namespace="subscription-tiers")
     
     logger.info(f"Updated subscription tier: {tier.name} by user {current_user.id}")
     
@@ -169,36 +169,49 @@ async def update_subscription_tier(
 @router.get("/my-subscription", response_model=SubscriptionResponse)
 async def get_my_subscription(
     db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Get current user's subscription details."""
-    quota_service = QuotaTrackingService(db)
-    
     # Get user's active subscription
     subscription = quota_service.get_user_subscription(current_user.id)
     
     if not subscription:
-        # Create default free subscription if none exists
-        free_tier = db.query(SubscriptionTierModel).filter(
-            SubscriptionTierModel.name == "free"
-        ).first()
+        # Create default free subscription if none exists. Concurrent first
+        # requests race on the one-active-subscription index, and the losers
+        # read the winner's row instead of inserting a duplicate.
+        free_tier_id = _get_free_tier_id(db)
         
-        if not free_tier:
+        if not free_tier_id:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="No free tier available"
             )
         
-        subscription = UserSubscriptionModel(
-            user_id=current_user.id,
-            tier_id=free_tier.id,
-            status=SubscriptionStatusEnum.ACTIVE,
-            billing_cycle="monthly",
-            start_date=date.today()
-        )
-        db.add(subscription)
+        subscription = db.scalars(
+            pg_insert(UserSubscriptionModel)
+            .values(
+                user_id=current_user.id,
+                tier_id=free_tier_id,
+                status=SubscriptionStatusEnum.ACTIVE,
+                billing_cycle="monthly",
+                start_date=date.today()
+            )
+            .on_conflict_do_nothing(
+                index_elements=[UserSubscriptionModel.user_id],
+                index_where=UserSubscriptionModel.status == SubscriptionStatusEnum.ACTIVE
+            )
+            .returning(UserSubscriptionModel)
+        ).one_or_none()
         db.commit()
-        db.refresh(subscription)
+        
+        if subscription is None:
+            subscription = db.query(UserSubscriptionModel).filter(
+                and_(
+                    UserSubscriptionModel.user_id == current_user.id,
+                    UserSubscriptionModel.status == SubscriptionStatusEnum.ACTIVE
+                )
+            ).first()
     
     # Get quota status
     quota_status = quota_service.get_all_quota_status(current_user.id)
@@ -223,11 +236,10 @@ async def get_my_subscription(
 async def subscribe_to_tier(
     subscription_data: SubscriptionChangeRequest,
     db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Subscribe to a new tier or change existing subscription."""
-    quota_service = QuotaTrackingService(db)
-    
     # Validate tier exists
     tier = db.query(SubscriptionTierModel).filter(
         and_(
@@ -285,11 +297,10 @@ async def subscribe_to_tier(
 async def cancel_subscription(
     cancel_data: SubscriptionCancelRequest,
     db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Cancel current subscription."""
-    quota_service = QuotaTrackingService(db)
-    
     subscription = quota_service.get_user_subscription(current_user.id)
     
     if not subscription:
@@ -298,32 +309,40 @@ async def cancel_subscription(
             detail="No active subscription found"
         )
     
+    now = datetime.utcnow()
+    
     if cancel_data.cancel_at_period_end:
         # Schedule cancellation at period end
-        subscription.status = SubscriptionStatusEnum.CANCELLED
-        subscription.cancelled_at = datetime.utcnow()
         # Set end_date to next billing date or end of current period
         if subscription.next_billing_date:
-            subscription.end_date = subscription.next_billing_date
+            end_date = subscription.next_billing_date
         else:
-            # Default to end of current month
+            # Default to end of current month (first day of the next one)
             today = date.today()
-            if today.month == 12:
-                subscription.end_date = date(today.year + 1, 1, 1)
-            else:
-                subscription.end_date = date(today.year, today.month + 1, 1)
+            end_date = date(today.year + today.month // 12, today.month % 12 + 1, 1)
     else:
         # Cancel immediately
-        subscription.status = SubscriptionStatusEnum.CANCELLED
-        subscription.cancelled_at = datetime.utcnow()
-        subscription.end_date = date.today()
-    
-    # Add cancellation reason to metadata
-    if not subscription.metadata:
-        subscription.metadata = {}
-    subscription.metadata["cancellation_reason"] = cancel_data.reason
-    subscription.metadata["cancelled_at"] = datetime.utcnow().isoformat()
+        end_date = date.today()
     
+    # One UPDATE sets the cancellation and merges the reason into the
+    # existing metadata server-side, instead of rewriting the whole document
+    cancellation = func.jsonb_build_object(
+        "cancellation_reason", cast(cancel_data.reason, String),
+        "cancelled_at", cast(now.isoformat(), String)
+    )
+    db.execute(
+        update(UserSubscriptionModel)
+        .where(UserSubscriptionModel.id == subscription.id)
+        .values({
+            UserSubscriptionModel.status: SubscriptionStatusEnum.CANCELLED,
+            UserSubscriptionModel.cancelled_at: now,
+            UserSubscriptionModel.end_date: end_date,
+            UserSubscriptionModel.extra_metadata: func.coalesce(
+                UserSubscriptionModel.extra_metadata, cast("{}", JSONB)
+            ).op("||")(cancellation)
+        })
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
     
     logger.info(f"Cancelled subscription for user {current_user.id}")
@@ -332,108 +351,108 @@ async def cancel_subscription(
 
 
 # Quota and Usage Management
-@router.get("/quota", response_model=QuotaStatusResponse)
+@router.get("/quota", response_model=None, responses={200: {"model": QuotaStatusResponse}})
 async def get_quota_status(
-    db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Get current quota status for the user."""
-    quota_service = QuotaTrackingService(db)
     quota_status = quota_service.get_all_quota_status(current_user.id)
     
-    return QuotaStatusResponse(
-        upload=quota_status[UsageTypeEnum.UPLOAD.value],
-        token=quota_status[UsageTypeEnum.TOKEN.value],
-        search=quota_status[UsageTypeEnum.SEARCH.value]
-    )
+    return ORJSONResponse({
+        "upload": quota_status[UsageTypeEnum.UPLOAD.value].model_dump(),
+        "token": quota_status[UsageTypeEnum.TOKEN.value].model_dump(),
+        "search": quota_status[UsageTypeEnum.SEARCH.value].model_dump()
+    })
 
 
 @router.get("/usage", response_model=List[UsageTracking])
 async def get_usage_history(
     days: int = Query(30, description="Number of days to retrieve", ge=1, le=365),
     usage_type: Optional[UsageTypeEnum] = Query(None, description="Filter by usage type"),
-    db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Get usage history for the current user."""
-    quota_service = QuotaTrackingService(db)
-    
-    # Get usage history
-    usage_records = quota_service.get_usage_history(current_user.id, days)
-    
-    # Filter by usage type if specified
-    if usage_type:
-        usage_records = [r for r in usage_records if r.usage_type == usage_type]
-    
-    return usage_records
+    return quota_service.get_usage_history(current_user.id, days, usage_type)
 
 
-@router.get("/analytics", response_model=UsageAnalytics)
+@router.get("/analytics", response_model=None, responses={200: {"model": UsageAnalytics}})
 async def get_usage_analytics(
-    db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Get detailed usage analytics for the current user."""
-    quota_service = QuotaTrackingService(db)
-    analytics = quota_service.calculate_usage_analytics(current_user.id)
-    
-    return UsageAnalytics(**analytics)
+    # Already JSON-ready, so it skips validation and the model round trip
+    return ORJSONResponse(quota_service.calculate_usage_analytics(current_user.id))
 
 
 # Admin endpoints
-@router.get("/admin/subscriptions", response_model=SubscriptionListResponse)
+@admin_router.get("/subscriptions", response_model=SubscriptionListResponse)
 async def get_all_subscriptions(
-    page: int = Query(1, description="Page number", ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     size: int = Query(50, description="Page size", ge=1, le=100),
-    status: Optional[SubscriptionStatusEnum] = Query(None, description="Filter by status"),
+    subscription_status: Optional[SubscriptionStatusEnum] = Query(None, alias="status", description="Filter by status"),
     tier_id: Optional[UUID] = Query(None, description="Filter by tier"),
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: Session = Depends(deps.get_db)
 ):
-    """Get all subscriptions (admin only)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view all subscriptions"
-        )
+    """
+    Get all subscriptions, newest first (admin only).
     
+    Pass `next_cursor` of a full page back as `cursor` to fetch the next one.
+    """
     query = db.query(UserSubscriptionModel)
     
     # Apply filters
-    if status:
-        query = query.filter(UserSubscriptionModel.status == status)
+    if subscription_status:
+        query = query.filter(UserSubscriptionModel.status == subscription_status)
     if tier_id:
         query = query.filter(UserSubscriptionModel.tier_id == tier_id)
     
-    # Get total count
-    total = query.count()
+    # Start right after the cursor position instead of skipping rows
+    if cursor:
+        try:
+            created_at, subscription_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        query = query.filter(
+            or_(
+                UserSubscriptionModel.created_at < created_at,
+                and_(
+                    UserSubscriptionModel.created_at == created_at,
+                    UserSubscriptionModel.id < subscription_id
+                )
+            )
+        )
+    
+    # Fetch one extra row to know whether another page follows
+    subscriptions = query.order_by(
+        UserSubscriptionModel.created_at.desc(), UserSubscriptionModel.id.desc()
+    ).limit(size + 1).all()
     
-    # Apply pagination
-    offset = (page - 1) * size
-    subscriptions = query.offset(offset).limit(size).all()
+    next_cursor = None
+    if len(subscriptions) > size:
+        subscriptions = subscriptions[:size]
+        last = subscriptions[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
     
     return SubscriptionListResponse(
         subscriptions=subscriptions,
-        total=total,
-        page=page,
-        size=size
+        size=size,
+        next_cursor=next_cursor
     )
 
 
-@router.get("/admin/usage-stats")
+@admin_router.get("/usage-stats")
 async def get_usage_statistics(
     start_date: Optional[date] = Query(None, description="Start date for statistics"),
     end_date: Optional[date] = Query(None, description="End date for statistics"),
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user)
+    db: Session = Depends(deps.get_db)
 ):
     """Get usage statistics across all users (admin only)."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only administrators can view usage statistics"
-        )
-    
     # Default to current month if no dates provided
     if not start_date:
         today = date.today()
@@ -441,51 +460,61 @@ async def get_usage_statistics(
     if not end_date:
         end_date = date.today()
     
-    # Get usage statistics
-    usage_stats = db.query(
-        UsageTrackingModel.usage_type,
-        func.sum(UsageTrackingModel.amount).label('total_usage'),
+    # Usage per type and subscribers per tier, fetched in one round-trip
+    usage_stats = select(
+        literal("usage", String).label('kind'),
+        cast(UsageTrackingModel.usage_type, String).label('name'),
+        func.sum(UsageTrackingModel.amount).label('total'),
         func.count(UsageTrackingModel.id).label('total_operations'),
         func.count(func.distinct(UsageTrackingModel.user_id)).label('unique_users')
-    ).filter(
+    ).where(
         and_(
             UsageTrackingModel.usage_date >= start_date,
             UsageTrackingModel.usage_date <= end_date
         )
-    ).group_by(UsageTrackingModel.usage_type).all()
+    ).group_by(UsageTrackingModel.usage_type)
     
-    # Get subscription distribution
-    subscription_stats = db.query(
+    subscription_stats = select(
+        literal("subscription", String),
         SubscriptionTierModel.name,
-        func.count(UserSubscriptionModel.id).label('subscriber_count')
-    ).join(
-        UserSubscriptionModel, SubscriptionTierModel.id == UserSubscriptionModel.tier_id
-    ).filter(
+        func.count(UserSubscriptionModel.id),
+        literal(0),
+        literal(0)
+    ).join_from(
+        SubscriptionTierModel, UserSubscriptionModel,
+        SubscriptionTierModel.id == UserSubscriptionModel.tier_id
+    ).where(
         UserSubscriptionModel.status == SubscriptionStatusEnum.ACTIVE
-    ).group_by(SubscriptionTierModel.name).all()
+    ).group_by(SubscriptionTierModel.name)
+    
+    usage_statistics = []
+    subscription_distribution = []
+    for stat in db.execute(union_all(usage_stats, subscription_stats)):
+        if stat.kind == "usage":
+            usage_statistics.append({
+                "usage_type": UsageTypeEnum[stat.name].value,
+                "total_usage": stat.total,
+                "total_operations": stat.total_operations,
+                "unique_users": stat.unique_users
+            })
+        else:
+            subscription_distribution.append({
+                "tier_name": stat.name,
+                "subscriber_count": stat.total
+            })
     
-    return {
+    # Plain JSON types only, so skip jsonable_encoder and encode directly
+    return ORJSONResponse({
         "period": {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat()
         },
-        "usage_statistics": [
-            {
-                "usage_type": stat.usage_type.value,
-                "total_usage": stat.total_usage,
-                "total_operations": stat.total_operations,
-                "unique_users": stat.unique_users
-            }
-            for stat in usage_stats
-        ],
-        "subscription_distribution": [
-            {
-                "tier_name": stat.name,
-                "subscriber_count": stat.subscriber_count
-            }
-            for stat in subscription_stats
-        ]
-    }
+        "usage_statistics": usage_statistics,
+        "subscription_distribution": subscription_distribution
+    })
+
+
+router.include_router(admin_router)
 
 
 # Utility endpoints
@@ -493,19 +522,16 @@ async def get_usage_statistics(
 async def check_quota_limit(
     usage_type: UsageTypeEnum,
     amount: int = Query(1, description="Amount to check", ge=1),
-    db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Check if user can perform an operation without exceeding quota."""
-    quota_service = QuotaTrackingService(db)
-    
     try:
-        can_proceed = quota_service.check_quota_limit(current_user.id, usage_type, amount)
-        quota_status = quota_service.get_quota_status(current_user.id, usage_type)
+        can_proceed, quota_status = quota_service.check_quota(current_user.id, usage_type, amount)
         
         return {
             "can_proceed": can_proceed,
-            "quota_status": quota_status.__dict__
+            "quota_status": quota_status.model_dump()
         }
     except Exception as e:
         logger.error(f"Error checking quota: {e}")
@@ -518,12 +544,10 @@ async def check_quota_limit(
 @router.post("/record-usage")
 async def record_usage(
     usage_data: UsageRecord,
-    db: Session = Depends(deps.get_db),
+    quota_service: QuotaTrackingService = Depends(deps.get_quota_service),
     current_user: User = Depends(deps.get_current_user)
 ):
     """Record usage for the current user (internal use)."""
-    quota_service = QuotaTrackingService(db)
-    
     # Override user_id with current user
     usage_data.user_id = current_user.id
     
@@ -535,4 +559,18 @@ async def record_usage(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error recording usage"
-        )
\ No newline at end of file
+        )
+
+
+# Id of the free tier, looked up once per process
+_free_tier_id: Optional[UUID] = None
+
+
+def _get_free_tier_id(db: Session) -> Optional[UUID]:
+    """Get the id of the free tier, querying only until it is found."""
+    global _free_tier_id
+    if _free_tier_id is None:
+        _free_tier_id = db.query(SubscriptionTierModel.id).filter(
+            SubscriptionTierModel.name == "free"
+        ).scalar()
+    return _free_tier_id
@@ -5,26 +5,31 @@ This module provides API endpoints for document vector indexing,
 semantic search, and indexing status management.
 """
 
+import asyncio
+import json
 import uuid
 import time
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from celery import group
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app import models
 from app.api import deps
-from app.services.embeddings import EmbeddingService
-from app.services.vector_storage import VectorStorageService
-from app.services.reranker import BGERerankerService
+from app.services.embedding_cache import get_or_embed
+from app.services.semantic_cache import get_generation, semantic_cache
+from app.services.vector_storage import INDEXED_PAYLOAD_FIELDS, VectorStorageService
+from app.services.reranker import BGERerankerService, RerankResult
+from app.services.rerank_batcher import RerankBatcher
 from app.services.context_construction import ContextConstructionService
 from app.services.search_analytics import SearchAnalyticsService, SearchEvent
 from app.workers.vector_indexing import (
     index_document, 
     reindex_document,
-    batch_index_documents,
     delete_document_vectors,
     get_indexing_stats
 )
@@ -34,6 +39,22 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Payload keys lifted to the top level of a search result; the rest go
+# under "metadata"
+RESULT_FIELDS = frozenset({"text", "document_id", "document_type", "chunk_index", "start_char", "end_char"})
+
+# Shared reranker so the cross-encoder model is loaded once per process;
+# concurrent searches are scored together through the batcher
+reranker = BGERerankerService()
+rerank_batcher = RerankBatcher(reranker)
+
+# Vectors indexed before the owner was stored in their payload only match
+# by document ID, so searches filter on the user's document IDs until
+# backfill_vector_owners has covered every vector; rechecked at most this often
+OWNER_PAYLOAD_CHECK_INTERVAL = 60.0
+_owner_payload_complete = False
+_owner_payload_checked_at = float("-inf")
+
 
 # Pydantic models for request/response
 class VectorIndexRequest(BaseModel):
@@ -76,7 +97,7 @@ class SearchResponse(BaseModel):
 
 # Indexing endpoints
 @router.post("/documents/{document_id}/index")
-def start_document_indexing(
+async def start_document_indexing(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
@@ -85,7 +106,7 @@ def start_document_indexing(
 ):
     """Start vector indexing for a document."""
     # Get document and verify ownership
-    document = crud_document.get_by_id(db, document_id, current_user.id)
+    document = await asyncio.to_thread(crud_document.get_by_id, db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,7 +129,8 @@ def start_document_indexing(
     
     # Start indexing task
     try:
-        task = index_document.delay(
+        task = await asyncio.to_thread(
+            index_document.delay,
             str(document_id),
             chunking_config=index_request.chunking_config,
             embedding_config=index_request.embedding_config,
@@ -131,7 +153,7 @@ def start_document_indexing(
 
 
 @router.post("/documents/{document_id}/reindex")
-def reindex_document_endpoint(
+async def reindex_document_endpoint(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
@@ -141,7 +163,7 @@ def reindex_document_endpoint(
 ):
     """Reindex a document (delete existing vectors and create new ones)."""
     # Get document and verify ownership
-    document = crud_document.get_by_id(db, document_id, current_user.id)
+    document = await asyncio.to_thread(crud_document.get_by_id, db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -150,7 +172,7 @@ def reindex_document_endpoint(
     
     # Start reindexing task
     try:
-        task = reindex_document.delay(str(document_id), force=force)
+        task = await asyncio.to_thread(reindex_document.delay, str(document_id), force=force)
         
         return {
             "status": "success",
@@ -169,52 +191,63 @@ def reindex_document_endpoint(
 
 
 @router.post("/batch-index")
-def batch_index_documents_endpoint(
+async def batch_index_documents_endpoint(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
     batch_request: BatchIndexRequest
 ):
     """Index multiple documents in batch."""
-    # Verify all documents exist and belong to user
+    # Parse all IDs up front and report every malformed one together
     document_uuids = []
+    invalid_ids = []
     for doc_id in batch_request.document_ids:
         try:
-            doc_uuid = uuid.UUID(doc_id)
-            document = crud_document.get_by_id(db, doc_uuid, current_user.id)
-            if not document:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Document {doc_id} not found"
-                )
-            
-            if document.upload_status != "conversion_completed":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Document {doc_id} is not ready for indexing. Status: {document.upload_status}"
-                )
-            
-            document_uuids.append(doc_uuid)
-            
+            document_uuids.append(uuid.UUID(doc_id))
         except ValueError:
+            invalid_ids.append(doc_id)
+    
+    if invalid_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid document ID format: {', '.join(invalid_ids)}"
+        )
+    
+    # Verify all documents exist and belong to user
+    documents = await asyncio.to_thread(
+        crud_document.get_many_by_ids, db, document_uuids, current_user.id
+    )
+    for doc_uuid in document_uuids:
+        document = documents.get(doc_uuid)
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document {doc_uuid} not found"
+            )
+        
+        if document.upload_status != "conversion_completed":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid document ID format: {doc_id}"
+                detail=f"Document {doc_uuid} is not ready for indexing. Status: {document.upload_status}"
             )
     
-    # Start batch indexing task
+    # Dispatch one indexing task per document so workers index them in parallel
     try:
-        task = batch_index_documents.delay(
-            batch_request.document_ids,
-            chunking_config=batch_request.chunking_config,
-            embedding_config=batch_request.embedding_config,
-            storage_config=batch_request.storage_config
+        tasks = group(
+            index_document.s(
+                str(doc_uuid),
+                chunking_config=batch_request.chunking_config,
+                embedding_config=batch_request.embedding_config,
+                storage_config=batch_request.storage_config
+            )
+            for doc_uuid in document_uuids
         )
+        group_result = await asyncio.to_thread(tasks.apply_async)
         
         return {
             "status": "success",
             "message": f"Batch indexing started for {len(batch_request.document_ids)} documents",
-            "task_id": task.id,
+            "task_id": group_result.id,
             "document_ids": batch_request.document_ids
         }
         
@@ -227,7 +260,7 @@ def batch_index_documents_endpoint(
 
 
 @router.delete("/documents/{document_id}/vectors")
-def delete_document_vectors_endpoint(
+async def delete_document_vectors_endpoint(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
@@ -235,7 +268,7 @@ def delete_document_vectors_endpoint(
 ):
     """Delete all vectors for a document."""
     # Get document and verify ownership
-    document = crud_document.get_by_id(db, document_id, current_user.id)
+    document = await asyncio.to_thread(crud_document.get_by_id, db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -244,7 +277,7 @@ def delete_document_vectors_endpoint(
     
     # Start deletion task
     try:
-        task = delete_document_vectors.delay(str(document_id))
+        task = await asyncio.to_thread(delete_document_vectors.delay, str(document_id))
         
         return {
             "status": "success",
@@ -267,155 +300,13 @@ async def search_documents(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
-    search_request: SearchRequest
+    search_request: SearchRequest,
+    background_tasks: BackgroundTasks
 ):
     """Perform semantic search across indexed documents with k=8 retrieval and BGE reranking."""
-    import time
-    
-    start_time = time.time()
-    rerank_time_ms = None
-    context_window = None
-    
     try:
-        # Generate embedding for query
-        embedding_start = time.time()
-        embedding_service = EmbeddingService()
-        query_embedding_result = await embedding_service.generate_embedding(search_request.query)
-        embedding_time = (time.time() - embedding_start) * 1000
-        
-        # Search vectors with k=8 initial retrieval
-        search_start = time.time()
-        storage_service = VectorStorageService()
-        
-        # Add user filter to ensure user only sees their documents
-        filter_conditions = search_request.filter_conditions or {}
-        
-        # Get user's document IDs to filter results
-        user_documents = crud_document.get_user_documents(
-            db, current_user.id, limit=10000  # Large limit to get all docs
-        )
-        user_doc_ids = [str(doc.id) for doc in user_documents]
-        
-        if user_doc_ids:
-            filter_conditions["document_id"] = user_doc_ids
-        else:
-            # User has no documents, return empty results
-            return SearchResponse(
-                query=search_request.query,
-                results=[],
-                total_results=0,
-                search_time_ms=0,
-                embedding_time_ms=embedding_time,
-                reranking_enabled=False
-            )
-        
-        # Use k_retrieval for initial search (default k=8)
-        initial_results = storage_service.search_similar(
-            query_vector=query_embedding_result.embedding,
-            limit=max(search_request.k_retrieval, search_request.limit),
-            score_threshold=search_request.score_threshold,
-            filter_conditions=filter_conditions
-        )
-        
-        search_time = (time.time() - search_start) * 1000
-        
-        # Format initial results
-        formatted_results = []
-        for result in initial_results:
-            formatted_result = {
-                "id": result.id,
-                "score": result.score,
-                "text": result.text,
-                "document_id": result.payload.get("document_id"),
-                "document_type": result.payload.get("document_type"),
-                "chunk_index": result.payload.get("chunk_index"),
-                "start_char": result.payload.get("start_char"),
-                "end_char": result.payload.get("end_char"),
-                "metadata": {k: v for k, v in result.payload.items() 
-                           if k not in ["text", "document_id", "document_type", "chunk_index", "start_char", "end_char"]}
-            }
-            formatted_results.append(formatted_result)
-        
-        # Apply BGE reranking if enabled and we have results
-        final_results = formatted_results
-        if search_request.enable_reranking and formatted_results:
-            try:
-                rerank_start = time.time()
-                reranker = BGERerankerService()
-                
-                # Rerank the results
-                rerank_results = await reranker.rerank_async(
-                    query=search_request.query,
-                    search_results=formatted_results,
-                    top_k=search_request.rerank_top_k or search_request.limit
-                )
-                
-                rerank_time_ms = (time.time() - rerank_start) * 1000
-                
-                # Convert rerank results back to formatted results
-                final_results = []
-                for rerank_result in rerank_results:
-                    result_dict = rerank_result.metadata.copy()
-                    result_dict["rerank_score"] = rerank_result.rerank_score
-                    result_dict["original_index"] = rerank_result.original_index
-                    final_results.append(result_dict)
-                
-                logger.info(f"Reranked {len(formatted_results)} -> {len(final_results)} results")
-                
-            except Exception as e:
-                logger.error(f"Reranking failed, using original results: {e}")
-                # Fall back to original results if reranking fails
-                final_results = formatted_results
-                search_request.enable_reranking = False
-        
-        # Limit final results
-        final_results = final_results[:search_request.limit]
-        
-        # Construct context window if results available
-        if final_results:
-            try:
-                context_service = ContextConstructionService()
-                context_result = context_service.construct_context_window(
-                    search_results=final_results,
-                    query=search_request.query
-                )
-                context_window = context_result.context
-                
-            except Exception as e:
-                logger.error(f"Context window construction failed: {e}")
-                context_window = None
-        
-        # Track search analytics
-        try:
-            analytics_service = SearchAnalyticsService()
-            search_event = SearchEvent(
-                user_id=str(current_user.id),
-                query=search_request.query,
-                timestamp=datetime.now(),
-                results_count=len(final_results),
-                search_time_ms=search_time,
-                embedding_time_ms=embedding_time,
-                rerank_time_ms=rerank_time_ms,
-                reranking_enabled=search_request.enable_reranking,
-                top_score=max((r.get("score", r.get("rerank_score", 0)) for r in final_results), default=0.0),
-                avg_score=sum(r.get("score", r.get("rerank_score", 0)) for r in final_results) / len(final_results) if final_results else 0.0,
-                filters_used=search_request.filter_conditions or {},
-                context_window_generated=context_window is not None
-            )
-            analytics_service.track_search_event(search_event)
-        except Exception as e:
-            logger.error(f"Failed to track search analytics: {e}")
-        
-        return SearchResponse(
-            query=search_request.query,
-            results=final_results,
-            total_results=len(final_results),
-            search_time_ms=search_time,
-            embedding_time_ms=embedding_time,
-            rerank_time_ms=rerank_time_ms,
-            reranking_enabled=search_request.enable_reranking,
-            context_window=context_window
-        )
+        search_response, _ = await _do_search(db, current_user, search_request, background_tasks)
+        return search_response
         
     except Exception as e:
         logger.error(f"Search failed: {e}")
@@ -430,46 +321,33 @@ async def advanced_search(
     *,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
-    search_request: SearchRequest
+    search_request: SearchRequest,
+    background_tasks: BackgroundTasks
 ):
     """Advanced search with detailed analytics and reference extraction."""
     try:
         # Perform the standard search
-        search_response = await search_documents(
-            db=db,
-            current_user=current_user,
-            search_request=search_request
-        )
+        search_response, rerank_results = await _do_search(db, current_user, search_request, background_tasks)
         
         # Extract references
-        context_service = ContextConstructionService()
+        context_service = _get_context_service()
         references = context_service.extract_references(search_response.results)
         
-        # Get reranking statistics if reranking was enabled
+        # Get reranking statistics from the rerank results of this search
         rerank_stats = None
-        if search_request.enable_reranking and search_response.results:
+        if rerank_results:
             try:
-                reranker = BGERerankerService()
-                # Mock rerank results for stats (we already have scores in results)
-                mock_rerank_results = []
-                for result in search_response.results:
-                    from app.services.reranker import RerankResult
-                    mock_result = RerankResult(
-                        original_index=result.get("original_index", 0),
-                        rerank_score=result.get("rerank_score", result.get("score", 0.0)),
-                        passage=result.get("text", ""),
-                        metadata=result
-                    )
-                    mock_rerank_results.append(mock_result)
-                
-                rerank_stats = reranker.get_reranking_stats(mock_rerank_results)
+                rerank_stats = reranker.get_reranking_stats(rerank_results)
             except Exception as e:
                 logger.error(f"Failed to get rerank stats: {e}")
                 rerank_stats = None
         
+        scores = _result_scores(search_response.results)
+        mean_score = sum(scores) / len(scores) if scores else 0
+        
         # Enhanced response
         return {
-            "search_results": search_response.dict(),
+            "search_results": search_response.model_dump(),
             "references": references,
             "reranking_stats": rerank_stats,
             "analytics": {
@@ -479,21 +357,14 @@ async def advanced_search(
                     (search_response.rerank_time_ms or 0)
                 ),
                 "unique_documents": len(references),
-                "avg_relevance_score": (
-                    sum(r.get("score", r.get("rerank_score", 0)) for r in search_response.results) / 
-                    len(search_response.results) if search_response.results else 0
-                ),
+                "avg_relevance_score": mean_score,
                 "search_effectiveness": {
                     "top_3_avg_score": (
-                        sum(r.get("score", r.get("rerank_score", 0)) for r in search_response.results[:3]) / 
-                        min(3, len(search_response.results)) if search_response.results else 0
+                        sum(scores[:3]) / min(3, len(scores)) if scores else 0
                     ),
                     "score_variance": (
-                        sum((r.get("score", r.get("rerank_score", 0)) - 
-                             sum(res.get("score", res.get("rerank_score", 0)) for res in search_response.results) / 
-                             len(search_response.results))**2 
-                            for r in search_response.results) / 
-                        len(search_response.results) if len(search_response.results) > 1 else 0
+                        sum((score - mean_score) ** 2 for score in scores) / len(scores)
+                        if len(scores) > 1 else 0
                     )
                 }
             }
@@ -517,8 +388,8 @@ def get_similar_documents(
     score_threshold: Optional[float] = Query(None, ge=0.0, le=1.0)
 ):
     """Find documents similar to a specific document."""
-    # Get document and verify ownership
-    document = crud_document.get_by_id(db, document_id, current_user.id)
+    # Get the document's centroid and verify ownership
+    document = crud_document.get_centroid(db, document_id, current_user.id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -531,45 +402,44 @@ def get_similar_documents(
             detail="Document is not indexed for search"
         )
     
+    if not document.centroid_vector:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Document was indexed before similarity search was available. Reindex it to enable it."
+        )
+    
     try:
-        # Get vectors for this document
-        storage_service = VectorStorageService()
-        document_vectors = storage_service.get_document_vectors(str(document_id))
-        
-        if not document_vectors:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No vectors found for this document"
-            )
-        
-        # Use the first vector as the query (could be improved by averaging or other methods)
-        query_vector_id = document_vectors[0].id
-        
-        # Search for similar vectors, excluding the source document
-        filter_conditions = {}
-        
-        # Get user's other documents
-        user_documents = crud_document.get_user_documents(
-            db, current_user.id, limit=10000
+        # Search the user's other documents with the centroid; several chunks
+        # usually match per document, so fetch extra and keep each one's best
+        storage_service = _get_storage_service()
+        results = storage_service.search_similar(
+            query_vector=document.centroid_vector,
+            limit=limit * 5,
+            score_threshold=score_threshold,
+            filter_conditions=_owner_filter(db, current_user.id, {}),
+            exclude_conditions={"document_id": str(document_id)}
         )
-        user_doc_ids = [str(doc.id) for doc in user_documents if str(doc.id) != str(document_id)]
         
-        if user_doc_ids:
-            filter_conditions["document_id"] = user_doc_ids
-        else:
-            return {
-                "document_id": document_id,
-                "similar_documents": [],
-                "total_results": 0
-            }
+        similar_documents = {}
+        for result in results:
+            similar_id = result.payload.get("document_id")
+            if similar_id not in similar_documents:
+                similar_documents[similar_id] = {
+                    "document_id": similar_id,
+                    "score": result.score,
+                    "filename": result.payload.get("filename"),
+                    "best_match": {
+                        "chunk_index": result.payload.get("chunk_index"),
+                        "text": result.text
+                    }
+                }
+                if len(similar_documents) == limit:
+                    break
         
-        # Get the embedding from Qdrant (we'd need to modify the storage service for this)
-        # For now, return empty results with message
         return {
             "document_id": document_id,
-            "similar_documents": [],
-            "total_results": 0,
-            "message": "Similar document search requires vector retrieval feature"
+            "similar_documents": list(similar_documents.values()),
+            "total_results": len(similar_documents)
         }
         
     except Exception as e:
@@ -582,14 +452,15 @@ def get_similar_documents(
 
 # Status and management endpoints
 @router.get("/stats")
-def get_indexing_statistics(
+async def get_indexing_statistics(
     *,
     current_user: models.User = Depends(deps.get_current_user)
 ):
     """Get overall indexing statistics."""
     try:
-        task = get_indexing_stats.delay()
-        result = task.get(timeout=30)  # Wait up to 30 seconds for result
+        task = await asyncio.to_thread(get_indexing_stats.delay)
+        # Wait up to 30 seconds for result without holding the event loop
+        result = await asyncio.wait_for(asyncio.to_thread(task.get, timeout=30), 30)
         
         return {
             "status": "success",
@@ -624,7 +495,7 @@ def get_document_indexing_status(
         # Get vector storage info if indexed
         vector_info = None
         if document.vector_indexed:
-            storage_service = VectorStorageService()
+            storage_service = _get_storage_service()
             try:
                 document_vectors = storage_service.get_document_vectors(str(document_id))
                 vector_info = {
@@ -656,18 +527,26 @@ def get_document_indexing_status(
 
 
 @router.get("/health")
-def vector_search_health():
+async def vector_search_health():
     """Health check for vector search service."""
     try:
         # Test Qdrant connection
-        storage_service = VectorStorageService()
-        collection_info = storage_service.get_collection_info()
+        collection_info = await asyncio.to_thread(
+            lambda: _get_storage_service().get_collection_info()
+        )
+        
+        # Unindexed filter fields make every filtered search scan payloads
+        missing_indexes = [
+            field for field in INDEXED_PAYLOAD_FIELDS
+            if field not in collection_info["payload_indexes"]
+        ]
         
         return {
-            "status": "healthy",
+            "status": "degraded" if missing_indexes else "healthy",
             "services": {
                 "qdrant": "connected",
-                "collection_info": collection_info
+                "collection_info": collection_info,
+                "missing_payload_indexes": missing_indexes
             },
             "timestamp": time.time()
         }
@@ -690,8 +569,8 @@ def get_search_analytics_overview(
 ):
     """Get search analytics overview."""
     try:
-        analytics_service = SearchAnalyticsService()
-        analytics = analytics_service.get_search_analytics(days_back=days_back)
+        analytics_service = _get_analytics_service()
+        analytics = analytics_service.get_search_analytics_overview(days_back=days_back)
         
         return {
             "status": "success",
@@ -715,7 +594,7 @@ def get_popular_queries(
 ):
     """Get most popular search queries."""
     try:
-        analytics_service = SearchAnalyticsService()
+        analytics_service = _get_analytics_service()
         popular_queries = analytics_service.get_popular_queries(limit=limit)
         
         return {
@@ -739,7 +618,7 @@ def get_user_search_history(
 ):
     """Get search history for the current user."""
     try:
-        analytics_service = SearchAnalyticsService()
+        analytics_service = _get_analytics_service()
         history = analytics_service.get_user_search_history(
             user_id=str(current_user.id),
             limit=limit
@@ -766,7 +645,7 @@ def get_real_time_analytics(
 ):
     """Get real-time search analytics."""
     try:
-        analytics_service = SearchAnalyticsService()
+        analytics_service = _get_analytics_service()
         real_time_stats = analytics_service.get_real_time_stats()
         
         return {
@@ -787,13 +666,14 @@ def get_real_time_analytics(
 def track_result_click(
     *,
     current_user: models.User = Depends(deps.get_current_user),
-    click_data: Dict[str, Any]
+    click_data: Dict[str, Any],
+    background_tasks: BackgroundTasks
 ):
     """Track a result click event."""
     try:
         from app.services.search_analytics import ClickEvent
         
-        analytics_service = SearchAnalyticsService()
+        analytics_service = _get_analytics_service()
         click_event = ClickEvent(
             user_id=str(current_user.id),
             query=click_data.get("query", ""),
@@ -803,7 +683,7 @@ def track_result_click(
             timestamp=datetime.now()
         )
         
-        analytics_service.track_click_event(click_event)
+        background_tasks.add_task(analytics_service.track_click_event, click_event)
         
         return {"status": "success", "message": "Click event tracked"}
         
@@ -812,4 +692,229 @@ def track_result_click(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to track click event"
-        ) 
\ No newline at end of file
+        ) 
+
+
+async def _do_search(
+    db: Session,
+    current_user: models.User,
+    search_request: SearchRequest,
+    background_tasks: BackgroundTasks
+) -> Tuple[SearchResponse, List[RerankResult]]:
+    """Run a search and return the response with the rerank results behind it."""
+    rerank_time_ms = None
+    context_window = None
+    
+    # Generate embedding for query
+    embedding_start = time.time()
+    query_embedding_result = await get_or_embed(search_request.query)
+    embedding_time = (time.time() - embedding_start) * 1000
+    
+    # Answer near-duplicates of a recent query from the semantic cache,
+    # unless the user's documents changed since it was cached
+    user_id = str(current_user.id)
+    generation = await get_generation(user_id)
+    params_key = json.dumps(
+        [generation, search_request.model_dump(exclude={"query"})], sort_keys=True, default=str
+    )
+    cached = None
+    if generation is not None:
+        cached = semantic_cache.lookup(
+            query_embedding_result.embedding, user_id, params_key
+        )
+    if cached is not None:
+        response, rerank_results = cached
+        return response.model_copy(update={
+            "query": search_request.query,
+            "search_time_ms": 0,
+            "embedding_time_ms": embedding_time,
+            "rerank_time_ms": None
+        }), rerank_results
+    
+    # Search vectors with k=8 initial retrieval
+    search_start = time.time()
+    storage_service = _get_storage_service()
+    
+    # Restrict results to the user's own documents
+    filter_conditions = _owner_filter(db, current_user.id, search_request.filter_conditions or {})
+    
+    # Use k_retrieval for initial search (default k=8); the extra candidates
+    # only matter when the reranker can promote them into the top results
+    if search_request.enable_reranking:
+        retrieval_limit = max(search_request.k_retrieval, search_request.limit)
+    else:
+        retrieval_limit = search_request.limit
+    if filter_conditions.get("document_id") == []:
+        # None of the user's documents can match
+        initial_results = []
+    else:
+        initial_results = storage_service.search_similar(
+            query_vector=query_embedding_result.embedding,
+            limit=retrieval_limit,
+            score_threshold=search_request.score_threshold,
+            filter_conditions=filter_conditions
+        )
+    
+    search_time = (time.time() - search_start) * 1000
+    
+    # Format initial results
+    formatted_results = []
+    for result in initial_results:
+        formatted_result = {
+            "id": result.id,
+            "score": result.score,
+            "text": result.text,
+            "document_id": result.payload.get("document_id"),
+            "document_type": result.payload.get("document_type"),
+            "chunk_index": result.payload.get("chunk_index"),
+            "start_char": result.payload.get("start_char"),
+            "end_char": result.payload.get("end_char"),
+            "metadata": {k: result.payload[k] for k in result.payload.keys() - RESULT_FIELDS}
+        }
+        formatted_results.append(formatted_result)
+    
+    # Apply BGE reranking if enabled and we have results
+    final_results = formatted_results
+    rerank_results: List[RerankResult] = []
+    if search_request.enable_reranking and formatted_results:
+        try:
+            rerank_start = time.time()
+            
+            # Rerank the results
+            rerank_results = await rerank_batcher.rerank(
+                query=search_request.query,
+                search_results=formatted_results,
+                top_k=min(search_request.rerank_top_k or search_request.limit, search_request.limit)
+            )
+            
+            rerank_time_ms = (time.time() - rerank_start) * 1000
+            
+            # Convert rerank results back to formatted results
+            final_results = []
+            for rerank_result in rerank_results:
+                result_dict = rerank_result.metadata.copy()
+                result_dict["rerank_score"] = rerank_result.rerank_score
+                result_dict["original_index"] = rerank_result.original_index
+                final_results.append(result_dict)
+            
+            logger.info(f"Reranked {len(formatted_results)} -> {len(final_results)} results")
+            
+        except Exception as e:
+            logger.error(f"Reranking failed, using original results: {e}")
+            # Fall back to original results if reranking fails
+            final_results = formatted_results
+            rerank_results = []
+            search_request.enable_reranking = False
+    
+    # Limit final results
+    final_results = final_results[:search_request.limit]
+    rerank_results = rerank_results[:search_request.limit]
+    
+    # Construct context window if results available
+    if final_results:
+        try:
+            context_service = _get_context_service()
+            context_result = context_service.construct_context_window(
+                search_results=final_results,
+                query=search_request.query
+            )
+            context_window = context_result.context
+            
+        except Exception as e:
+            logger.error(f"Context window construction failed: {e}")
+            context_window = None
+    
+    # Track search analytics after the response is sent
+    try:
+        scores = _result_scores(final_results)
+        analytics_service = _get_analytics_service()
+        search_event = SearchEvent(
+            user_id=str(current_user.id),
+            query=search_request.query,
+            timestamp=datetime.now(),
+            results_count=len(final_results),
+            search_time_ms=search_time,
+            embedding_time_ms=embedding_time,
+            rerank_time_ms=rerank_time_ms,
+            reranking_enabled=search_request.enable_reranking,
+            top_score=max(scores, default=0.0),
+            avg_score=sum(scores) / len(scores) if scores else 0.0,
+            filters_used=search_request.filter_conditions or {},
+            context_window_generated=context_window is not None
+        )
+        background_tasks.add_task(analytics_service.track_search_event, search_event)
+    except Exception as e:
+        logger.error(f"Failed to track search analytics: {e}")
+    
+    response = SearchResponse(
+        query=search_request.query,
+        results=final_results,
+        total_results=len(final_results),
+        search_time_ms=search_time,
+        embedding_time_ms=embedding_time,
+        rerank_time_ms=rerank_time_ms,
+        reranking_enabled=search_request.enable_reranking,
+        context_window=context_window
+    )
+    if generation is not None:
+        semantic_cache.put(
+            query_embedding_result.embedding, user_id, params_key, (response, rerank_results)
+        )
+    return response, rerank_results
+
+
+def _result_scores(results: List[Dict[str, Any]]) -> List[float]:
+    """Score of each result: the vector score, or the rerank score if it has none."""
+    scores = []
+    for result in results:
+        score = result.get("score")
+        scores.append(result.get("rerank_score", 0) if score is None else score)
+    return scores
+
+
+# Shared service instances, created on first use so each process keeps one
+# Qdrant client, tokenizer and Redis connection instead of one per request
+@lru_cache(maxsize=None)
+def _get_storage_service() -> VectorStorageService:
+    return VectorStorageService()
+
+
+def _owner_filter(db: Session, user_id: uuid.UUID, filter_conditions: Dict[str, Any]) -> Dict[str, Any]:
+    """Narrow payload filter conditions to a user's vectors.
+    
+    Filters on the payload owner once every vector has one, and on the
+    user's indexed document IDs before that; a requested document_id is
+    intersected with them, so an empty list means nothing can match.
+    """
+    filter_conditions = dict(filter_conditions)
+    global _owner_payload_complete, _owner_payload_checked_at
+    
+    now = time.monotonic()
+    if not _owner_payload_complete and now - _owner_payload_checked_at >= OWNER_PAYLOAD_CHECK_INTERVAL:
+        _owner_payload_checked_at = now
+        try:
+            _owner_payload_complete = _get_storage_service().count_missing_payload("user_id") == 0
+        except Exception as e:
+            logger.warning(f"Failed to check vector owner backfill: {e}")
+    
+    if _owner_payload_complete:
+        filter_conditions["user_id"] = str(user_id)
+        return filter_conditions
+    
+    document_ids = [str(document_id) for document_id in crud_document.get_indexed_document_ids(db, user_id)]
+    requested = filter_conditions.get("document_id")
+    if requested is not None:
+        requested = set(requested) if isinstance(requested, list) else {requested}
+        document_ids = [document_id for document_id in document_ids if document_id in requested]
+    filter_conditions["document_id"] = document_ids
+    return filter_conditions
+
+
+@lru_cache(maxsize=None)
+def _get_context_service() -> ContextConstructionService:
+    return ContextConstructionService()
+
+
+@lru_cache(maxsize=None)
+def _get_analytics_service() -> SearchAnalyticsService:
+    return SearchAnalyticsService()
@@ -1,19 +1,48 @@
+from importlib import import_module
+
 from .token import Token, TokenPayload
 from .user import User, UserCreate
-from .document import Document, DocumentUploadInit, DocumentUploadResponse, DocumentUploadProgress, DocumentList
-from .chat import ChatRequest, ChatResponse, ChatMessage, ConversationSummary, ConversationDetail
-from .subscription import (
-    SubscriptionTier,
-    SubscriptionTierCreate,
-    SubscriptionTierUpdate,
-    UserSubscription,
-    UserSubscriptionCreate,
-    UserSubscriptionUpdate,
-    UsageTracking,
-    QuotaStatus,
-    QuotaStatusResponse,
-    UsageAnalytics,
-    SubscriptionResponse,
-    SubscriptionChangeRequest,
-    SubscriptionCancelRequest
-) 
\ No newline at end of file
+
+# Schemas of the other submodules are imported on first access, so code that
+# only needs the auth schemas does not build every document, chat and
+# subscription model at import time
+_LAZY_EXPORTS = {
+    "Document": "document",
+    "DocumentUploadInit": "document",
+    "DocumentUploadResponse": "document",
+    "DocumentUploadProgress": "document",
+    "DocumentUploadComplete": "document",
+    "DocumentList": "document",
+    "PreprocessingOptions": "document",
+    "PipelineOptions": "document",
+    "ChatRequest": "chat",
+    "ChatResponse": "chat",
+    "ChatMessage": "chat",
+    "ChatMessageMetadata": "chat",
+    "ConversationSummary": "chat",
+    "ConversationDetail": "chat",
+    "SubscriptionTier": "subscription",
+    "SubscriptionTierCreate": "subscription",
+    "SubscriptionTierUpdate": "subscription",
+    "UserSubscription": "subscription",
+    "UserSubscriptionCreate": "subscription",
+    "UserSubscriptionUpdate": "subscription",
+    "UsageTracking": "subscription",
+    "QuotaStatus": "subscription",
+    "QuotaStatusResponse": "subscription",
+    "UsageAnalytics": "subscription",
+    "SubscriptionResponse": "subscription",
+    "SubscriptionChangeRequest": "subscription",
+    "SubscriptionCancelRequest": "subscription",
+}
+
+__all__ = ("Token", "TokenPayload", "User", "UserCreate", *_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,16 @@
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, validator
+from typing import Annotated, List, Literal, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+
+class ChatMessageMetadata(BaseModel):
+    """Generation details attached to a chat message; other keys pass through."""
+    model: Optional[str] = None
+    tokens: Optional[int] = None
+    latency_ms: Optional[float] = None
+
+    model_config = ConfigDict(extra='allow')
 
 
 class ChatMessage(BaseModel):
@@ -9,23 +18,17 @@ class ChatMessage(BaseModel):
     role: str  # "user" or "assistant"
     content: str
     timestamp: datetime
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[ChatMessageMetadata] = None
+
+    model_config = ConfigDict(frozen=True, extra='forbid')
 
 
 class ChatRequest(BaseModel):
     """Request to send a chat message."""
-    message: str
+    message: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=2000)]
     document_ids: Optional[List[uuid.UUID]] = None  # Specific documents to search
     conversation_id: Optional[uuid.UUID] = None  # Continue existing conversation
     search_params: Optional[Dict[str, Any]] = None  # Custom search parameters
-    
-    @validator('message')
-    def validate_message(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Message cannot be empty')
-        if len(v) > 2000:
-            raise ValueError('Message too long (max 2000 characters)')
-        return v.strip()
 
 
 class ChatResponse(BaseModel):
@@ -35,7 +38,7 @@ class ChatResponse(BaseModel):
     sources: List[Dict[str, Any]]  # Source documents/chunks used
     search_results_count: int
     response_time: float
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[ChatMessageMetadata] = None
 
 
 class ConversationSummary(BaseModel):
@@ -47,6 +50,8 @@ class ConversationSummary(BaseModel):
     message_count: int
     last_message: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
 
 class ConversationDetail(BaseModel):
     """Detailed conversation with all messages."""
@@ -71,30 +76,11 @@ class ConversationUpdate(BaseModel):
 
 class ChatSettings(BaseModel):
     """User chat preferences and settings."""
-    max_search_results: int = 10
-    similarity_threshold: float = 0.7
-    response_style: str = "detailed"  # "concise", "detailed", "technical"
+    max_search_results: Annotated[int, Field(ge=1, le=50)] = 10
+    similarity_threshold: Annotated[float, Field(ge=0.0, le=1.0)] = 0.7
+    response_style: Literal['concise', 'detailed', 'technical'] = 'detailed'
     include_sources: bool = True
     auto_title_conversations: bool = True
-    
-    @validator('max_search_results')
-    def validate_max_results(cls, v):
-        if v < 1 or v > 50:
-            raise ValueError('Max search results must be between 1 and 50')
-        return v
-    
-    @validator('similarity_threshold')
-    def validate_threshold(cls, v):
-        if v < 0.0 or v > 1.0:
-            raise ValueError('Similarity threshold must be between 0.0 and 1.0')
-        return v
-    
-    @validator('response_style')
-    def validate_style(cls, v):
-        allowed_styles = ['concise', 'detailed', 'technical']
-        if v not in allowed_styles:
-            raise ValueError(f'Response style must be one of: {", ".join(allowed_styles)}')
-        return v
 
 
 class ChatAnalytics(BaseModel):
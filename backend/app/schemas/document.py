@@ -1,7 +1,26 @@
+import json
+import re
 import uuid
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, validator
+from typing import Annotated, Literal, Optional, List, Dict, Any
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator
+
+# Lowercase strings so file types match case-insensitively
+def _lowercase(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+# Supported upload formats
+FileType = Annotated[Literal['pdf', 'epub', 'txt', 'docx'], BeforeValidator(_lowercase)]
+
+# Response schema read from ORM rows; rows come from the database already
+# valid, so from_orm_fast builds the schema without validating it again.
+# Read-only: frozen, and unknown keys are rejected instead of collected
+class ORMResponseModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
+
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        return cls.model_construct(**{field: getattr(obj, field) for field in cls.model_fields})
 
 # Shared properties
 class DocumentBase(BaseModel):
@@ -15,28 +34,15 @@ class DocumentUploadInit(BaseModel):
     filename: str
     file_size: int
     file_hash: str
-    file_type: str
-    
-    @validator('file_type')
-    def validate_file_type(cls, v):
-        allowed_types = ['pdf', 'epub', 'txt', 'docx']
-        if v.lower() not in allowed_types:
-            raise ValueError(f'File type must be one of: {", ".join(allowed_types)}')
-        return v.lower()
+    file_type: FileType
 
 # Properties to receive on upload progress update
 class DocumentUploadProgress(BaseModel):
-    upload_progress: int
+    upload_progress: Annotated[int, Field(ge=0, le=100)]
     upload_status: str
-    
-    @validator('upload_progress')
-    def validate_progress(cls, v):
-        if not 0 <= v <= 100:
-            raise ValueError('Upload progress must be between 0 and 100')
-        return v
 
 # Properties to return to client
-class Document(DocumentBase):
+class Document(DocumentBase, ORMResponseModel):
     id: uuid.UUID
     file_hash: str
     storage_path: str
@@ -48,11 +54,8 @@ class Document(DocumentBase):
     content_extracted: bool
     vector_indexed: bool
 
-    class Config:
-        orm_mode = True
-
 # Properties for document listing with pagination
-class DocumentList(BaseModel):
+class DocumentList(ORMResponseModel):
     id: uuid.UUID
     filename: str
     original_filename: str
@@ -64,11 +67,73 @@ class DocumentList(BaseModel):
     content_extracted: bool
     vector_indexed: bool
 
-    class Config:
-        orm_mode = True
+# Presigned URL for one part of a multipart upload
+class UploadPartUrl(BaseModel):
+    part_number: int
+    url: str
+
+# Part reported back by the client once it has been uploaded
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+# S3 ETag: MD5 hex digest, with a part count suffix for multipart objects
+ETAG_PATTERN = re.compile(r'^"?([0-9a-fA-F]{32}(?:-\d+)?)"?$')
+
+# Properties to receive on upload completion
+class DocumentUploadComplete(BaseModel):
+    parts: Optional[List[UploadedPart]] = None  # Required for multipart uploads
+    etag: Optional[str] = None  # ETag returned by the presigned PUT
+    
+    @field_validator('etag')
+    @classmethod
+    def validate_etag(cls, v):
+        if v is None:
+            return v
+        match = ETAG_PATTERN.match(v)
+        if not match:
+            raise ValueError('ETag must be an S3 MD5 ETag')
+        return match.group(1).lower()
 
 # Response for upload initiation
 class DocumentUploadResponse(BaseModel):
     document_id: uuid.UUID
-    upload_url: str  # Presigned URL for S3/MinIO
-    chunk_size: int = 5242880  # 5MB chunks 
\ No newline at end of file
+    upload_url: Optional[str] = None  # Presigned URL for S3/MinIO, single-request uploads
+    chunk_size: int = 5242880  # 5MB chunks
+    upload_id: Optional[str] = None  # Multipart upload ID for large files
+    parts: Optional[List[UploadPartUrl]] = None  # Presigned URL per part for large files 
+
+# Upper bound on the serialized size of free-form stage options
+MAX_STAGE_CONFIG_BYTES = 4096
+
+# Options for enhanced conversion preprocessing
+class PreprocessingOptions(BaseModel):
+    ocr: bool = False
+    language: Optional[str] = Field(None, max_length=16)
+    max_pages: Optional[int] = Field(None, ge=1, le=10000)
+
+    model_config = ConfigDict(extra='forbid')
+
+# Options for the complete processing pipeline
+class PipelineOptions(BaseModel):
+    format_detection: bool = True
+    text_extraction: bool = True
+    content_preprocessing: bool = True
+    metadata_enrichment: bool = True
+    vector_indexing: bool = True
+    extraction_config: Optional[Dict[str, Any]] = None
+    preprocessing_config: Optional[PreprocessingOptions] = None
+    metadata_config: Optional[Dict[str, Any]] = None
+    indexing_config: Optional[Dict[str, Any]] = None
+    continue_on_failure: bool = False
+    save_intermediate_results: bool = True
+    parallel_processing: bool = False
+
+    model_config = ConfigDict(extra='forbid')
+
+    @field_validator('extraction_config', 'metadata_config', 'indexing_config')
+    @classmethod
+    def validate_config_size(cls, v):
+        if v is not None and len(json.dumps(v, default=str)) > MAX_STAGE_CONFIG_BYTES:
+            raise ValueError(f'Stage configuration must not exceed {MAX_STAGE_CONFIG_BYTES} bytes')
+        return v
@@ -5,13 +5,11 @@ Pydantic models for subscription management API endpoints.
 """
 
 from datetime import date, datetime
-from decimal import Decimal
 from typing import Dict, List, Optional, Any
 from uuid import UUID
-from pydantic import BaseModel, Field, validator
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
-from app.models.subscription import SubscriptionTierEnum, SubscriptionStatusEnum, UsageTypeEnum
+from app.models.subscription import SubscriptionStatusEnum, UsageTypeEnum
 
 
 # Base schemas
@@ -19,8 +17,8 @@ class SubscriptionTierBase(BaseModel):
     name: str = Field(..., description="Tier name (free, pro, enterprise)")
     display_name: str = Field(..., description="Display name for the tier")
     description: Optional[str] = Field(None, description="Tier description")
-    price_monthly: Decimal = Field(..., description="Monthly price in USD")
-    price_yearly: Decimal = Field(..., description="Yearly price in USD")
+    price_monthly_cents: int = Field(..., description="Monthly price in US cents")
+    price_yearly_cents: int = Field(..., description="Yearly price in US cents")
     upload_quota_mb: int = Field(..., description="Monthly upload quota in MB")
     token_quota: int = Field(..., description="Monthly token quota")
     search_quota: int = Field(..., description="Monthly search quota")
@@ -40,8 +38,8 @@ class SubscriptionTierCreate(SubscriptionTierBase):
 class SubscriptionTierUpdate(BaseModel):
     display_name: Optional[str] = None
     description: Optional[str] = None
-    price_monthly: Optional[Decimal] = None
-    price_yearly: Optional[Decimal] = None
+    price_monthly_cents: Optional[int] = None
+    price_yearly_cents: Optional[int] = None
     upload_quota_mb: Optional[int] = None
     token_quota: Optional[int] = None
     search_quota: Optional[int] = None
@@ -59,8 +57,7 @@ class SubscriptionTier(SubscriptionTierBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
 
 
 # User Subscription schemas
@@ -107,7 +104,7 @@ class UserSubscription(UserSubscriptionBase):
     user_id: UUID
     status: SubscriptionStatusEnum
     last_payment_date: Optional[datetime]
-    last_payment_amount: Optional[Decimal]
+    last_payment_amount_cents: Optional[int]
     cancelled_at: Optional[datetime]
     metadata: Optional[Dict[str, Any]]
     created_at: datetime
@@ -116,8 +113,7 @@ class UserSubscription(UserSubscriptionBase):
     # Related data
     tier: SubscriptionTier
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
 
 
 # Usage tracking schemas
@@ -127,7 +123,7 @@ class UsageTrackingBase(BaseModel):
     resource_id: Optional[UUID] = Field(None, description="Related resource ID")
     operation: Optional[str] = Field(None, description="Operation performed")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
-    cost: Optional[Decimal] = Field(None, description="Associated cost")
+    cost_cents: Optional[int] = Field(None, description="Associated cost in US cents")
 
 
 class UsageTrackingCreate(UsageTrackingBase):
@@ -142,8 +138,7 @@ class UsageTracking(UsageTrackingBase):
     usage_month: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
 
 
 # Quota status schemas
@@ -151,11 +146,23 @@ class QuotaStatus(BaseModel):
     quota_type: str = Field(..., description="Type of quota")
     current_usage: int = Field(..., description="Current usage amount")
     limit: int = Field(..., description="Quota limit")
-    percentage_used: float = Field(..., description="Percentage of quota used")
-    remaining: int = Field(..., description="Remaining quota")
-    is_exceeded: bool = Field(..., description="Whether quota is exceeded")
     reset_date: date = Field(..., description="Date when quota resets")
 
+    @computed_field(description="Percentage of quota used")
+    @property
+    def percentage_used(self) -> float:
+        return self.current_usage / self.limit * 100 if self.limit > 0 else 100.0
+
+    @computed_field(description="Remaining quota")
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.current_usage)
+
+    @computed_field(description="Whether quota is exceeded")
+    @property
+    def is_exceeded(self) -> bool:
+        return self.current_usage >= self.limit
+
 
 class QuotaStatusResponse(BaseModel):
     upload: QuotaStatus
@@ -194,9 +201,8 @@ class SubscriptionResponse(BaseModel):
 
 class SubscriptionListResponse(BaseModel):
     subscriptions: List[UserSubscription]
-    total: int
-    page: int
     size: int
+    next_cursor: Optional[str] = None
 
 
 class TierListResponse(BaseModel):
@@ -217,7 +223,7 @@ class PaymentMethod(BaseModel):
 
 class BillingHistory(BaseModel):
     id: str
-    amount: Decimal
+    amount_cents: int
     currency: str = "USD"
     status: str
     description: str
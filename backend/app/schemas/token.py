@@ -8,4 +8,5 @@ class Token(BaseModel):
 
 
 class TokenPayload(BaseModel):
-    sub: Optional[str] = None 
\ No newline at end of file
+    sub: Optional[str] = None
+    exp: Optional[int] = None 
\ No newline at end of file
@@ -1,5 +1,5 @@
 import uuid
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 # Shared properties
 class UserBase(BaseModel):
@@ -19,8 +19,7 @@ class UserInDBBase(UserBase):
     is_active: bool
     is_superuser: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Properties to return to client
 class User(UserInDBBase):
@@ -0,0 +1,44 @@
+"""
+Export the BGE Reranker to a Quantized ONNX Model
+
+This script exports the reranker to ONNX and writes an INT8 dynamically
+quantized copy for CPU inference. To use it, set RerankerConfig.model_name
+to the output directory and onnx_file_name to the quantized file.
+"""
+
+import sys
+import os
+import argparse
+
+# Add the parent directory to the path so we can import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentence_transformers import CrossEncoder, export_dynamic_quantized_onnx_model
+from app.services.reranker import RerankerConfig
+
+
+def export_reranker(output_dir: str, quantization_config: str):
+    """Export the reranker to ONNX and save an INT8 quantized copy."""
+    config = RerankerConfig()
+    
+    print(f"Exporting {config.model_name} to ONNX...")
+    model = CrossEncoder(config.model_name, max_length=config.max_length, backend="onnx")
+    model.save_pretrained(output_dir)
+    
+    print(f"Quantizing with the {quantization_config} configuration...")
+    export_dynamic_quantized_onnx_model(model, quantization_config, output_dir)
+    
+    print(f"Quantized model written to {output_dir}/onnx/model_qint8_{quantization_config}.onnx")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output_dir", help="Directory to write the ONNX models to")
+    parser.add_argument(
+        "--quantization",
+        default="avx512_vnni",
+        choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+        help="Target CPU instruction set for INT8 quantization"
+    )
+    args = parser.parse_args()
+    export_reranker(args.output_dir, args.quantization)
@@ -0,0 +1,55 @@
+"""
+In-process cache for search query embeddings.
+
+Repeated and paginated searches embed the same query text over and over;
+this keeps the most recent query embeddings in memory so those searches
+skip the embedding API call entirely.
+"""
+
+import logging
+from typing import Optional
+
+from cachetools import LRUCache
+
+from app.services.embeddings import EmbeddingService, EmbeddingResult
+
+logger = logging.getLogger(__name__)
+
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+# Only touched from the event loop with no await between lookup and store,
+# so no lock is needed
+_query_embeddings: LRUCache = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+
+# Shared service so the OpenAI client and Redis connection are reused
+_embedding_service: Optional[EmbeddingService] = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the process-wide embedding service, creating it on first use."""
+    global _embedding_service
+    if _embedding_service is None:
+        _embedding_service = EmbeddingService()
+    return _embedding_service
+
+
+async def get_or_embed(query: str) -> EmbeddingResult:
+    """
+    Get the embedding of a search query, generating it only on a cache miss.
+
+    Args:
+        query: Search query text
+
+    Returns:
+        Embedding result, with cached=True when served from memory
+    """
+    embedding_service = get_embedding_service()
+    key = f"{embedding_service.config.model.name}\0{query.strip().lower()}"
+
+    cached = _query_embeddings.get(key)
+    if cached is not None:
+        return cached.model_copy(update={"cached": True})
+
+    result = await embedding_service.generate_embedding(query)
+    _query_embeddings[key] = result
+    return result
@@ -0,0 +1,95 @@
+"""
+Idempotency cache for retried API calls.
+
+Stores the response of a side-effecting request in Redis so that a client
+retrying the same request gets the original response back instead of
+repeating the work.
+"""
+
+import logging
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Value stored under a key while the request that reserved it is running
+IN_PROGRESS = "__in_progress__"
+
+
+class IdempotencyCache:
+    """Redis-backed store of serialized responses keyed by idempotency key."""
+
+    def __init__(self, ttl: int = 600, reservation_ttl: int = 60):
+        """Initialize the idempotency cache.
+
+        Args:
+            ttl: Seconds a stored response stays replayable
+            reservation_ttl: Seconds a reservation blocks retries if its request never finishes
+        """
+        self.ttl = ttl
+        self.reservation_ttl = reservation_ttl
+        try:
+            self.redis_client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD or None,
+                db=2,  # Use separate DB for request caches
+                decode_responses=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create Redis client for idempotency cache: {e}")
+            self.redis_client = None
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the stored response for a key, if any."""
+        if not self.redis_client:
+            return None
+
+        try:
+            return self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read idempotency key {key}: {e}")
+            return None
+
+    def reserve(self, key: str) -> bool:
+        """Atomically claim a key for a request that is about to run.
+
+        Returns:
+            True if the caller should run the request, False if another
+            request already holds the key or has stored its response
+        """
+        if not self.redis_client:
+            return True
+
+        try:
+            return bool(self.redis_client.set(key, IN_PROGRESS, nx=True, ex=self.reservation_ttl))
+        except Exception as e:
+            logger.warning(f"Failed to reserve idempotency key {key}: {e}")
+            return True
+
+    def release(self, key: str) -> None:
+        """Drop a reservation whose request failed, so a retry can run it again."""
+        if not self.redis_client:
+            return
+
+        try:
+            self.redis_client.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to release idempotency key {key}: {e}")
+
+    def set(self, key: str, value: str) -> None:
+        """Store a serialized response under a key."""
+        if not self.redis_client:
+            return
+
+        try:
+            self.redis_client.setex(key, self.ttl, value)
+        except Exception as e:
+            logger.warning(f"Failed to store idempotency key {key}: {e}")
+
+
+# Global instance
+idempotency_cache = IdempotencyCache()
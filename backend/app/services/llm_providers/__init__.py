@@ -17,7 +17,17 @@ from .base_provider import BaseLLMProvider, LLMProviderError, LLMResponse, LLMSt
 from .openai_provider import OpenAIProvider
 from .claude_provider import ClaudeProvider
 from .gemini_provider import GeminiProvider
-from .provider_factory import LLMProviderFactory, get_provider, list_available_providers
+from .provider_factory import (
+    LLMProviderFactory,
+    configure_providers,
+    get_all_models,
+    get_provider,
+    get_configured_provider,
+    get_provider_status,
+    get_provider_status_summary,
+    list_available_providers,
+    ProviderStatus
+)
 from .cost_calculator import CostCalculator, ModelCosts
 from .token_counter import TokenCounter, estimate_tokens
 
@@ -35,7 +45,13 @@ __all__ = [
     
     # Factory and utilities
     'LLMProviderFactory',
+    'configure_providers',
+    'get_all_models',
     'get_provider',
+    'get_configured_provider',
+    'get_provider_status',
+    'get_provider_status_summary',
+    'ProviderStatus',
     'list_available_providers',
     
     # Cost and token utilities
@@ -12,6 +12,8 @@ from enum import Enum
 import time
 import logging
 
+import httpx
+
 logger = logging.getLogger(__name__)
 
 
@@ -187,6 +189,7 @@ class BaseLLMProvider(ABC):
         
         # Initialize provider-specific client
         self._client = None
+        self._http_client: Optional[httpx.AsyncClient] = None
         self._setup_client()
     
     @property
@@ -324,6 +327,33 @@ class BaseLLMProvider(ABC):
                 "timestamp": time.time()
             }
     
+    async def warm_up(self) -> None:
+        """
+        Open a pooled connection to the provider ahead of the first request.
+        
+        Any response (including 4xx) leaves a kept-alive connection in the
+        pool, so failures are only logged.
+        """
+        if self._http_client is None:
+            return
+        
+        try:
+            await self._http_client.head(str(self._client.base_url))
+        except Exception as e:
+            logger.debug(f"Warm-up request to {self.provider_name} failed: {e}")
+    
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client shared by all requests to this provider."""
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=10.0)
+        )
+        return self._http_client
+    
     def get_fastest_model(self) -> str:
         """Get the fastest model for this provider."""
         return self.default_models.get("fast", self.supported_models[0])
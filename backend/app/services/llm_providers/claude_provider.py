@@ -149,7 +149,8 @@ class ClaudeProvider(BaseLLMProvider):
                 api_key=self.api_key,
                 base_url=self.base_url,
                 timeout=self.timeout,
-                max_retries=self.max_retries
+                max_retries=self.max_retries,
+                http_client=self._create_http_client()
             )
         except Exception as e:
             raise LLMProviderError(f"Failed to initialize Claude client: {e}")
@@ -12,7 +12,6 @@ from typing import Dict, List, Optional, Any, AsyncIterator, Union
 
 import openai
 from openai import AsyncOpenAI
-import tiktoken
 
 from .base_provider import (
     BaseLLMProvider, 
@@ -28,6 +27,7 @@ from .base_provider import (
     InvalidRequestError,
     ProviderUnavailableError
 )
+from .token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -176,7 +176,8 @@ class OpenAIProvider(BaseLLMProvider):
                 base_url=self.base_url,
                 organization=self.organization,
                 timeout=self.timeout,
-                max_retries=self.max_retries
+                max_retries=self.max_retries,
+                http_client=self._create_http_client()
             )
         except Exception as e:
             raise LLMProviderError(f"Failed to initialize OpenAI client: {e}")
@@ -364,44 +365,9 @@ class OpenAIProvider(BaseLLMProvider):
         messages: List[Dict[str, str]],
         model: Optional[str] = None
     ) -> int:
-        """Count tokens using tiktoken."""
+        """Count tokens using the shared tiktoken-backed token counter."""
         model = model or self.default_model or "gpt-4o"
-        
-        try:
-            # Get the encoding for the model
-            if model.startswith("gpt-4o"):
-                encoding = tiktoken.encoding_for_model("gpt-4o")
-            elif model.startswith("gpt-4"):
-                encoding = tiktoken.encoding_for_model("gpt-4")
-            elif model.startswith("gpt-3.5"):
-                encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-            else:
-                # Fallback to cl100k_base encoding
-                encoding = tiktoken.get_encoding("cl100k_base")
-            
-            # Count tokens for each message
-            total_tokens = 0
-            
-            for message in messages:
-                # Each message follows <|start|>{role/name}\n{content}<|end|>\n
-                total_tokens += 4  # Message formatting tokens
-                
-                for key, value in message.items():
-                    if isinstance(value, str):
-                        total_tokens += len(encoding.encode(value))
-                    
-                    if key == "name":  # If there's a name, the role is omitted
-                        total_tokens -= 1  # Role is omitted
-            
-            total_tokens += 3  # Every reply is primed with <|start|>assistant<|message|>
-            
-            return total_tokens
-            
-        except Exception as e:
-            logger.warning(f"Token counting failed for model {model}: {e}")
-            # Fallback: estimate 4 characters per token
-            total_chars = sum(len(str(msg.get('content', ''))) for msg in messages)
-            return total_chars // 4
+        return get_token_counter().count_tokens(messages, model=model, provider="openai").tokens
     
     def _calculate_cost(self, model: str, usage: TokenUsage) -> float:
         """Calculate cost based on token usage."""
@@ -5,8 +5,10 @@ Factory class for creating and managing LLM provider instances.
 Supports provider selection, configuration, and fallback mechanisms.
 """
 
-from typing import Dict, List, Optional, Type, Any
+from typing import Dict, List, Optional, Tuple, Type, Any
 import logging
+import time
+from app.core.config import settings
 from .base_provider import BaseLLMProvider
 from .openai_provider import OpenAIProvider
 from .claude_provider import ClaudeProvider
@@ -14,6 +16,87 @@ from .gemini_provider import GeminiProvider
 
 logger = logging.getLogger(__name__)
 
+
+class ProviderStatus:
+    """
+    Health and request counters for a configured provider.
+    
+    The success rate is updated along with the counters, and the serialized
+    form is rebuilt only after a counter changes.
+    """
+    
+    __slots__ = (
+        "name",
+        "available",
+        "last_check",
+        "response_time_ms",
+        "success_count",
+        "error_count",
+        "success_rate",
+        "last_error",
+        "_snapshot",
+    )
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.available = True
+        self.last_check: Optional[float] = None
+        self.response_time_ms: Optional[int] = None
+        self.success_count = 0
+        self.error_count = 0
+        self.success_rate = 0.0
+        self.last_error: Optional[str] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+    
+    @property
+    def healthy(self) -> bool:
+        """Whether the provider is available and mostly succeeding."""
+        return self.available and (self.error_count == 0 or self.success_count > self.error_count)
+    
+    def record_success(self, response_time_ms: Optional[int] = None):
+        """Record a successful request or health check."""
+        self.available = True
+        self.success_count += 1
+        if response_time_ms is not None:
+            self.response_time_ms = response_time_ms
+        self._counters_changed()
+    
+    def record_error(self, error: str):
+        """Record a failed request or health check."""
+        self.error_count += 1
+        self.last_error = error
+        self._counters_changed()
+    
+    def record_health_check(self, result: Dict[str, Any]):
+        """Record the result of BaseLLMProvider.health_check()."""
+        self.last_check = result.get("timestamp", time.time())
+        if result.get("status") == "healthy":
+            self.record_success(result.get("response_time_ms"))
+        else:
+            self.available = False
+            self.record_error(result.get("error", "unknown error"))
+    
+    def _counters_changed(self):
+        global _status_summary
+        self.success_rate = self.success_count / (self.success_count + self.error_count)
+        self._snapshot = None
+        _status_summary = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the status as a response dictionary."""
+        if self._snapshot is None:
+            self._snapshot = {
+                "available": self.available,
+                "last_check": self.last_check,
+                "response_time_ms": self.response_time_ms,
+                "error_count": self.error_count,
+                "success_count": self.success_count,
+                "last_error": self.last_error,
+                "success_rate": self.success_rate
+            }
+        return self._snapshot
+
+
 class LLMProviderFactory:
     """Factory for creating LLM provider instances."""
     
@@ -23,10 +106,16 @@ class LLMProviderFactory:
         'gemini': GeminiProvider,
     }
     
+    # Bumped whenever registered or configured providers change, so cached
+    # views of them know to rebuild
+    _config_version = 0
+    _provider_names: Optional[Tuple[int, Tuple[str, ...]]] = None
+    
     @classmethod
     def register_provider(cls, name: str, provider_class: Type[BaseLLMProvider]):
         """Register a new provider class."""
         cls._providers[name] = provider_class
+        cls._config_version += 1
         logger.info(f"Registered LLM provider: {name}")
     
     @classmethod
@@ -57,9 +146,12 @@ class LLMProviderFactory:
             raise ValueError(f"Failed to create provider '{provider_name}': {e}")
     
     @classmethod
-    def list_providers(cls) -> List[str]:
+    def list_providers(cls) -> Tuple[str, ...]:
         """List all available provider names."""
-        return list(cls._providers.keys())
+        cached = cls._provider_names
+        if cached is None or cached[0] != cls._config_version:
+            cached = cls._provider_names = (cls._config_version, tuple(cls._providers))
+        return cached[1]
     
     @classmethod
     def get_provider_class(cls, provider_name: str) -> Type[BaseLLMProvider]:
@@ -83,12 +175,144 @@ def get_provider(provider_name: str, **kwargs) -> BaseLLMProvider:
     return LLMProviderFactory.create_provider(provider_name, **kwargs)
 
 
-def list_available_providers() -> List[str]:
+# Provider instances built from settings, created on first use and reused
+# so each provider keeps a single client per process
+_configured_providers: Dict[str, BaseLLMProvider] = {}
+_provider_statuses: Dict[str, ProviderStatus] = {}
+
+# Aggregated status of all providers, rebuilt only after a tracker changes
+_status_summary: Optional[Dict[str, Any]] = None
+
+# Supported models of all configured providers, tagged with the config
+# version they were built for
+_all_models: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
+
+
+def get_configured_provider(provider_name: str) -> Optional[BaseLLMProvider]:
+    """
+    Get the provider instance configured from application settings.
+    
+    Args:
+        provider_name: Name of the provider
+        
+    Returns:
+        Shared provider instance, or None if the provider has no API key configured
+    """
+    provider = _configured_providers.get(provider_name)
+    if provider is not None:
+        return provider
+    
+    config = settings.llm_providers_config.get(provider_name)
+    if not config or not config.get("enabled", True):
+        return None
+    
+    provider = LLMProviderFactory.create_provider(
+        provider_name,
+        api_key=config["api_key"],
+        timeout=config["timeout"],
+        max_retries=config["max_retries"],
+        **config.get("options", {})
+    )
+    _set_provider(provider_name, provider)
+    return provider
+
+
+def _set_provider(provider_name: str, provider: BaseLLMProvider):
+    """Store a configured provider with a fresh status tracker."""
+    global _status_summary
+    _configured_providers[provider_name] = provider
+    _provider_statuses[provider_name] = ProviderStatus(provider_name)
+    _status_summary = None
+
+
+async def configure_providers(providers_config: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Create or replace configured provider instances.
+    
+    Args:
+        providers_config: Provider name to constructor options (api_key, default_model, ...)
+        
+    Returns:
+        Names of the providers that were configured
+    """
+    registered = []
+    
+    for provider_name, config in providers_config.items():
+        try:
+            provider = LLMProviderFactory.create_provider(provider_name, **config)
+        except ValueError as e:
+            logger.error(f"Skipping provider '{provider_name}': {e}")
+            continue
+        
+        previous = _configured_providers.get(provider_name)
+        _set_provider(provider_name, provider)
+        registered.append(provider_name)
+        
+        if previous is not None:
+            # Release the replaced instance's connection pool
+            await previous.__aexit__(None, None, None)
+    
+    LLMProviderFactory._config_version += 1
+    return registered
+
+
+def get_all_models() -> Dict[str, Dict[str, Any]]:
+    """
+    Get supported and default models of every configured provider.
+    
+    Returns:
+        Provider name to its models, rebuilt only when providers change
+    """
+    global _all_models
+    version = LLMProviderFactory._config_version
+    if _all_models is None or _all_models[0] != version:
+        models = {}
+        for provider_name in list_available_providers():
+            provider = get_configured_provider(provider_name)
+            if provider:
+                models[provider_name] = {
+                    "models": provider.supported_models,
+                    "default_models": provider.default_models
+                }
+        _all_models = (version, models)
+    return _all_models[1]
+
+
+def get_provider_status() -> Dict[str, ProviderStatus]:
+    """
+    Get status trackers for all configured providers.
+    
+    Returns:
+        Mapping of provider name to its status
+    """
+    return _provider_statuses
+
+
+def get_provider_status_summary() -> Dict[str, Any]:
+    """
+    Get the status of all configured providers with aggregate counts.
+    
+    Returns:
+        Per-provider status plus total, available and healthy counts
+    """
+    global _status_summary
+    if _status_summary is None:
+        statuses = list(_provider_statuses.values())
+        _status_summary = {
+            "providers": {tracker.name: tracker.as_dict() for tracker in statuses},
+            "total_providers": len(statuses),
+            "available_providers": sum(tracker.available for tracker in statuses),
+            "healthy_providers": sum(tracker.healthy for tracker in statuses)
+        }
+    return _status_summary
+
+
+def list_available_providers() -> Tuple[str, ...]:
     """
-    Get list of available provider names.
+    Get available provider names.
     
     Returns:
-        List of available provider names
+        Tuple of available provider names, rebuilt only when providers change
     """
     return LLMProviderFactory.list_providers()
 
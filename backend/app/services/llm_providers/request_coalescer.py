@@ -0,0 +1,43 @@
+"""
+Request Coalescer for LLM Providers
+
+Shares one upstream call between identical requests that are in flight
+at the same time, so a burst of duplicate completions costs one request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """Runs at most one call per key at a time and shares its result."""
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+    
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the in-flight call for a key, starting it if there is none.
+        
+        Args:
+            key: Identity of the request; equal keys share one call
+            call: Starts the upstream call when no call is in flight
+            
+        Returns:
+            Result of the shared call
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        
+        # One caller disconnecting must not cancel the call for the others
+        return await asyncio.shield(future)
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._in_flight)
@@ -5,9 +5,13 @@ Provides accurate token counting across different LLM providers
 with fallback estimation methods when exact tokenizers aren't available.
 """
 
+import hashlib
+import json
 import logging
 import re
-from typing import Dict, List, Optional, Any, Union
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -85,10 +89,28 @@ class TokenCounter:
         "gpt-3.5-turbo-instruct": "gpt-3.5-turbo",
     }
     
-    def __init__(self):
-        """Initialize token counter."""
+    # Above this many characters, message contents are encoded with
+    # tiktoken's threaded batch encoder instead of one at a time
+    BATCH_ENCODE_MIN_CHARS = 32768
+    
+    def __init__(self, cache_size: int = 8192):
+        """
+        Initialize token counter.
+        
+        Args:
+            cache_size: Maximum number of token counts kept in the LRU cache
+        """
         self._tiktoken_encoders = {}
+        self._model_encoders = {}
         self._load_tiktoken_encoders()
+        
+        # LRU cache of results keyed by (input digest, model, provider);
+        # counts are requested from worker threads, so access is locked
+        self._cache: "OrderedDict[Tuple[bytes, Optional[str], Optional[str]], TokenCount]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
     
     def _load_tiktoken_encoders(self):
         """Load tiktoken encoders if available."""
@@ -110,6 +132,12 @@ class TokenCounter:
                 self._tiktoken_encoders["cl100k_base"] = tiktoken.get_encoding("cl100k_base")
             except Exception as e:
                 logger.warning(f"Could not load cl100k_base encoder: {e}")
+            
+            # Resolve every known model to its encoder once
+            for model, encoder_key in self.TIKTOKEN_MODELS.items():
+                encoder = self._tiktoken_encoders.get(encoder_key)
+                if encoder:
+                    self._model_encoders[model] = encoder
                 
         except Exception as e:
             logger.error(f"Error loading tiktoken encoders: {e}")
@@ -135,11 +163,58 @@ class TokenCounter:
         if not provider and model:
             provider = self._get_provider_from_model(model)
         
+        cache_key = (self._digest(text), model, provider)
+        result = self._cache_get(cache_key)
+        if result is not None:
+            return result
+        
         # Handle different input types
         if isinstance(text, list):
-            return self._count_message_tokens(text, model, provider)
+            result = self._count_message_tokens(text, model, provider)
         else:
-            return self._count_text_tokens(text, model, provider)
+            result = self._count_text_tokens(text, model, provider)
+        
+        self._cache_put(cache_key, result)
+        return result
+    
+    def _cache_get(self, cache_key: Tuple[bytes, Optional[str], Optional[str]]) -> Optional[TokenCount]:
+        """Look up a cached count, recording the hit or miss."""
+        with self._cache_lock:
+            result = self._cache.get(cache_key)
+            if result is not None:
+                self._cache.move_to_end(cache_key)
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+            return result
+    
+    def _cache_put(self, cache_key: Tuple[bytes, Optional[str], Optional[str]], result: TokenCount):
+        """Store a count, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+    
+    @staticmethod
+    def _digest(text: Union[str, List[Dict[str, str]]]) -> bytes:
+        """Hash text or messages into a compact cache key."""
+        if isinstance(text, list):
+            data = b"m" + json.dumps(text, sort_keys=True).encode("utf-8")
+        else:
+            data = b"s" + text.encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the token count cache."""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": round(self._cache_hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._cache),
+                "max_size": self._cache_size
+            }
     
     def _count_message_tokens(
         self,
@@ -150,7 +225,7 @@ class TokenCounter:
         """Count tokens in a list of messages."""
         provider = provider or "openai"  # Default to OpenAI format
         
-        if provider == "openai" and model and TIKTOKEN_AVAILABLE:
+        if provider == "openai" and TIKTOKEN_AVAILABLE:
             return self._count_openai_message_tokens(messages, model)
         elif provider == "claude":
             return self._count_claude_message_tokens(messages)
@@ -168,47 +243,49 @@ class TokenCounter:
         """Count tokens in plain text."""
         provider = provider or "openai"  # Default to OpenAI
         
-        if provider == "openai" and model and TIKTOKEN_AVAILABLE:
+        if provider == "openai" and TIKTOKEN_AVAILABLE:
             return self._count_openai_text_tokens(text, model)
         else:
             return self._estimate_text_tokens(text, provider)
     
+    def _get_tiktoken_encoder(self, model: Optional[str]):
+        """Get the preloaded encoder for a model, falling back to cl100k_base."""
+        return self._model_encoders.get(model) or self._tiktoken_encoders.get("cl100k_base")
+    
     def _count_openai_message_tokens(
         self,
         messages: List[Dict[str, str]],
-        model: str
+        model: Optional[str]
     ) -> TokenCount:
         """Count tokens for OpenAI messages using tiktoken."""
         if not TIKTOKEN_AVAILABLE:
             return self._estimate_message_tokens(messages, "openai")
         
         try:
-            # Get the appropriate encoder
-            encoder_key = self.TIKTOKEN_MODELS.get(model, "cl100k_base")
-            encoder = self._tiktoken_encoders.get(encoder_key)
-            
-            if not encoder:
-                # Fallback to cl100k_base
-                encoder = self._tiktoken_encoders.get("cl100k_base")
+            encoder = self._get_tiktoken_encoder(model)
                 
             if not encoder:
                 return self._estimate_message_tokens(messages, "openai")
             
-            # Count tokens for each message
-            total_tokens = 0
+            values = []
+            named_messages = 0
             
             for message in messages:
-                # Each message follows <|start|>{role/name}\n{content}<|end|>\n
-                total_tokens += 4  # Message formatting tokens
-                
                 for key, value in message.items():
                     if isinstance(value, str):
-                        total_tokens += len(encoder.encode(value))
+                        values.append(value)
                     
                     if key == "name":  # If there's a name, the role is omitted
-                        total_tokens -= 1  # Role is omitted
+                        named_messages += 1
             
-            total_tokens += 3  # Every reply is primed with <|start|>assistant<|message|>
+            if sum(map(len, values)) >= self.BATCH_ENCODE_MIN_CHARS:
+                content_tokens = sum(map(len, encoder.encode_ordinary_batch(values)))
+            else:
+                content_tokens = sum(len(encoder.encode_ordinary(value)) for value in values)
+            
+            # Each message follows <|start|>{role/name}\n{content}<|end|>\n,
+            # and every reply is primed with <|start|>assistant<|message|>
+            total_tokens = content_tokens + 4 * len(messages) - named_messages + 3
             
             return TokenCount(
                 tokens=total_tokens,
@@ -221,22 +298,18 @@ class TokenCounter:
             logger.warning(f"tiktoken counting failed for {model}: {e}")
             return self._estimate_message_tokens(messages, "openai")
     
-    def _count_openai_text_tokens(self, text: str, model: str) -> TokenCount:
+    def _count_openai_text_tokens(self, text: str, model: Optional[str]) -> TokenCount:
         """Count tokens for OpenAI text using tiktoken."""
         if not TIKTOKEN_AVAILABLE:
             return self._estimate_text_tokens(text, "openai")
         
         try:
-            encoder_key = self.TIKTOKEN_MODELS.get(model, "cl100k_base")
-            encoder = self._tiktoken_encoders.get(encoder_key)
-            
-            if not encoder:
-                encoder = self._tiktoken_encoders.get("cl100k_base")
+            encoder = self._get_tiktoken_encoder(model)
                 
             if not encoder:
                 return self._estimate_text_tokens(text, "openai")
             
-            tokens = len(encoder.encode(text))
+            tokens = len(encoder.encode_ordinary(text))
             
             return TokenCount(
                 tokens=tokens,
@@ -418,10 +491,45 @@ class TokenCounter:
         Returns:
             List of token counts
         """
-        return [
-            self.count_tokens(text, model, provider)
-            for text in texts
-        ]
+        if not provider and model:
+            provider = self._get_provider_from_model(model)
+        
+        encoder = None
+        if (provider or "openai") == "openai" and TIKTOKEN_AVAILABLE:
+            encoder = self._get_tiktoken_encoder(model)
+        
+        results: List[Optional[TokenCount]] = [None] * len(texts)
+        pending = []  # Uncached plain strings, encoded together below
+        
+        for index, text in enumerate(texts):
+            if encoder and isinstance(text, str):
+                cache_key = (self._digest(text), model, provider)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    results[index] = cached
+                else:
+                    pending.append((index, text, cache_key))
+            else:
+                results[index] = self.count_tokens(text, model, provider)
+        
+        if pending:
+            pending_texts = [text for _, text, _ in pending]
+            if len(pending_texts) > 1:
+                encoded = encoder.encode_ordinary_batch(pending_texts)
+            else:
+                encoded = [encoder.encode_ordinary(pending_texts[0])]
+            
+            for (index, _, cache_key), tokens in zip(pending, encoded):
+                result = TokenCount(
+                    tokens=len(tokens),
+                    method=TokenizerType.TIKTOKEN,
+                    model=model,
+                    confidence=0.98
+                )
+                self._cache_put(cache_key, result)
+                results[index] = result
+        
+        return results
     
     def get_supported_models(self) -> Dict[str, List[str]]:
         """Get list of supported models by provider."""
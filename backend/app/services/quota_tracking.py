@@ -6,10 +6,9 @@ This service handles quota tracking, enforcement, and management for the subscri
 
 import logging
 from datetime import datetime, date, timedelta
-from decimal import Decimal
 from typing import Dict, List, Optional, Tuple, Any
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, and_, or_
 from dataclasses import dataclass
 from enum import Enum
@@ -24,6 +23,7 @@ from app.models.subscription import (
 )
 from app.models.user import User
 from app.models.document import Document
+from app.schemas.subscription import QuotaStatus
 
 logger = logging.getLogger(__name__)
 
@@ -37,18 +37,6 @@ class QuotaExceededException(Exception):
         super().__init__(message)
 
 
-@dataclass
-class QuotaStatus:
-    """Data class for quota status information."""
-    quota_type: str
-    current_usage: int
-    limit: int
-    percentage_used: float
-    remaining: int
-    is_exceeded: bool
-    reset_date: date
-
-
 @dataclass
 class UsageRecord:
     """Data class for usage recording."""
@@ -58,7 +46,11 @@ class UsageRecord:
     resource_id: Optional[UUID] = None
     operation: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
-    cost: Optional[Decimal] = None
+    cost_cents: Optional[int] = None
+
+
+# Usage types with a monthly quota
+QUOTA_USAGE_TYPES = (UsageTypeEnum.UPLOAD, UsageTypeEnum.TOKEN, UsageTypeEnum.SEARCH)
 
 
 class QuotaTrackingService:
@@ -66,67 +58,113 @@ class QuotaTrackingService:
     
     def __init__(self, db: Session):
         self.db = db
+        # Active subscriptions found so far, so repeated quota checks within
+        # one request load each user's subscription only once
+        self._subscriptions: Dict[UUID, UserSubscription] = {}
         
     def get_user_subscription(self, user_id: UUID) -> Optional[UserSubscription]:
-        """Get the active subscription for a user."""
-        return self.db.query(UserSubscription).filter(
-            and_(
-                UserSubscription.user_id == user_id,
-                UserSubscription.status == SubscriptionStatusEnum.ACTIVE,
-                or_(
-                    UserSubscription.end_date.is_(None),
-                    UserSubscription.end_date >= date.today()
+        """Get the active subscription for a user, with its tier loaded."""
+        subscription = self._subscriptions.get(user_id)
+        if subscription is None:
+            subscription = self.db.query(UserSubscription).options(
+                selectinload(UserSubscription.tier)
+            ).filter(
+                and_(
+                    UserSubscription.user_id == user_id,
+                    UserSubscription.status == SubscriptionStatusEnum.ACTIVE,
+                    or_(
+                        UserSubscription.end_date.is_(None),
+                        UserSubscription.end_date >= date.today()
+                    )
                 )
-            )
-        ).first()
+            ).first()
+            if subscription is not None:
+                self._subscriptions[user_id] = subscription
+        return subscription
     
     def get_current_month_usage(self, user_id: UUID, usage_type: UsageTypeEnum) -> int:
         """Get current month usage for a specific type."""
-        current_month = date.today().strftime("%Y-%m")
-        
         result = self.db.query(func.sum(UsageTracking.amount)).filter(
             and_(
                 UsageTracking.user_id == user_id,
                 UsageTracking.usage_type == usage_type,
-                UsageTracking.usage_month == current_month
+                UsageTracking.usage_date >= date.today().replace(day=1)
             )
         ).scalar()
         
         return int(result or 0)
     
+    def get_month_usage_by_type(self, user_id: UUID) -> Dict[UsageTypeEnum, int]:
+        """Get current month usage for every usage type in a single aggregate query."""
+        rows = self.db.query(
+            UsageTracking.usage_type,
+            func.sum(UsageTracking.amount)
+        ).filter(
+            and_(
+                UsageTracking.user_id == user_id,
+                UsageTracking.usage_date >= date.today().replace(day=1)
+            )
+        ).group_by(UsageTracking.usage_type).all()
+        
+        return {usage_type: int(total or 0) for usage_type, total in rows}
+    
+    def get_usage_history(
+        self,
+        user_id: UUID,
+        days: int = 30,
+        usage_type: Optional[UsageTypeEnum] = None
+    ) -> List[UsageTracking]:
+        """Get a user's usage records for the last `days` days, newest first."""
+        query = self.db.query(UsageTracking).filter(
+            and_(
+                UsageTracking.user_id == user_id,
+                UsageTracking.usage_date >= date.today() - timedelta(days=days)
+            )
+        )
+        if usage_type:
+            query = query.filter(UsageTracking.usage_type == usage_type)
+        
+        return query.order_by(UsageTracking.created_at.desc()).all()
+    
     def get_quota_status(self, user_id: UUID, usage_type: UsageTypeEnum) -> QuotaStatus:
         """Get quota status for a user and usage type."""
+        current_usage = self.get_current_month_usage(user_id, usage_type)
+        return self._build_quota_status(user_id, usage_type, current_usage)
+    
+    def get_all_quota_status(self, user_id: UUID) -> Dict[str, QuotaStatus]:
+        """Get quota status for every quota-limited usage type."""
+        usage = self.get_month_usage_by_type(user_id)
+        return {
+            usage_type.value: self._build_quota_status(user_id, usage_type, usage.get(usage_type, 0))
+            for usage_type in QUOTA_USAGE_TYPES
+        }
+    
+    def _build_quota_status(self, user_id: UUID, usage_type: UsageTypeEnum, current_usage: int) -> QuotaStatus:
         subscription = self.get_user_subscription(user_id)
         if not subscription:
             limit = self._get_default_quota_limit(usage_type)
         else:
             limit = self._get_effective_quota_limit(subscription, usage_type)
         
-        current_usage = self.get_current_month_usage(user_id, usage_type)
-        percentage_used = (current_usage / limit * 100) if limit > 0 else 100
-        remaining = max(0, limit - current_usage)
-        is_exceeded = current_usage >= limit
-        
+        # First day of next month
         today = date.today()
-        if today.month == 12:
-            reset_date = date(today.year + 1, 1, 1)
-        else:
-            reset_date = date(today.year, today.month + 1, 1)
+        reset_date = date(today.year + today.month // 12, today.month % 12 + 1, 1)
         
         return QuotaStatus(
             quota_type=usage_type.value,
             current_usage=current_usage,
             limit=limit,
-            percentage_used=percentage_used,
-            remaining=remaining,
-            is_exceeded=is_exceeded,
             reset_date=reset_date
         )
     
+    def check_quota(self, user_id: UUID, usage_type: UsageTypeEnum, amount: int = 1) -> Tuple[bool, QuotaStatus]:
+        """Check if adding the specified amount would exceed quota limits, along with the status checked."""
+        quota_status = self.get_quota_status(user_id, usage_type)
+        return (quota_status.current_usage + amount) <= quota_status.limit, quota_status
+    
     def check_quota_limit(self, user_id: UUID, usage_type: UsageTypeEnum, amount: int = 1) -> bool:
         """Check if adding the specified amount would exceed quota limits."""
-        quota_status = self.get_quota_status(user_id, usage_type)
-        return (quota_status.current_usage + amount) <= quota_status.limit
+        return self.check_quota(user_id, usage_type, amount)[0]
     
     def enforce_quota_limit(self, user_id: UUID, usage_type: UsageTypeEnum, amount: int = 1) -> None:
         """Enforce quota limits, raising exception if exceeded."""
@@ -145,23 +183,11 @@ class QuotaTrackingService:
     
     def record_usage(self, usage_record: UsageRecord) -> UsageTracking:
         """Record usage for a user."""
-        current_date = date.today()
-        current_month = current_date.strftime("%Y-%m")
-        
-        subscription = self.get_user_subscription(usage_record.user_id)
-        subscription_id = subscription.id if subscription else None
-        
         tracking_record = UsageTracking(
             user_id=usage_record.user_id,
-            subscription_id=subscription_id,
             usage_type=usage_record.usage_type,
-            usage_date=current_date,
-            usage_month=current_month,
-            amount=usage_record.amount,
-            cost=usage_record.cost,
-            resource_id=usage_record.resource_id,
-            operation=usage_record.operation,
-            metadata=usage_record.metadata
+            usage_date=date.today(),
+            amount=usage_record.amount
         )
         
         self.db.add(tracking_record)
@@ -172,6 +198,56 @@ class QuotaTrackingService:
         
         return tracking_record
     
+    def calculate_usage_analytics(self, user_id: UUID, days: int = 30) -> Dict[str, Any]:
+        """
+        Calculate usage analytics for a user.
+        
+        Monthly totals and the daily trend are aggregated in SQL, so the
+        cost does not grow with the number of usage records.
+        """
+        today = date.today()
+        usage = self.get_month_usage_by_type(user_id)
+        
+        trend = self.db.query(
+            UsageTracking.usage_date,
+            UsageTracking.usage_type,
+            func.sum(UsageTracking.amount)
+        ).filter(
+            and_(
+                UsageTracking.user_id == user_id,
+                UsageTracking.usage_date >= today - timedelta(days=days)
+            )
+        ).group_by(
+            UsageTracking.usage_date, UsageTracking.usage_type
+        ).order_by(UsageTracking.usage_date).all()
+        
+        document_count = self.db.query(func.count(Document.id)).filter(
+            Document.user_id == user_id
+        ).scalar()
+        
+        subscription = self.get_user_subscription(user_id)
+        
+        return {
+            "current_month": today.strftime("%Y-%m"),
+            "usage_by_type": {usage_type.value: total for usage_type, total in usage.items()},
+            "quota_status": {
+                usage_type.value: self._build_quota_status(user_id, usage_type, usage.get(usage_type, 0)).model_dump()
+                for usage_type in QUOTA_USAGE_TYPES
+            },
+            "usage_trend": [
+                {"date": usage_date.isoformat(), "usage_type": usage_type.value, "amount": int(total or 0)}
+                for usage_date, usage_type, total in trend
+            ],
+            "document_count": document_count or 0,
+            "subscription": {
+                "id": str(subscription.id),
+                "tier": subscription.tier.name,
+                "status": subscription.status.value,
+                "billing_cycle": subscription.billing_cycle,
+                "start_date": subscription.start_date.isoformat()
+            } if subscription else None
+        }
+    
     def _get_effective_quota_limit(self, subscription: UserSubscription, usage_type: UsageTypeEnum) -> int:
         """Get effective quota limit for a subscription and usage type."""
         if usage_type == UsageTypeEnum.UPLOAD:
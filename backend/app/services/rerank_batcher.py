@@ -0,0 +1,131 @@
+"""
+Micro-batching for reranker calls.
+
+Concurrent searches each rerank a handful of passages; scoring every
+request on its own spends most of the cross-encoder time on per-call
+overhead. The batcher collects the (query, passage) pairs of requests
+that arrive within a few milliseconds of each other and scores them in
+a single model call.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.reranker import BGERerankerService, RerankResult
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 64
+MAX_WAIT_MS = 5
+
+
+class RerankBatcher:
+    """Coalesces concurrent rerank requests into shared model calls."""
+
+    def __init__(
+        self,
+        reranker: BGERerankerService,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS
+    ):
+        """Initialize the batcher.
+
+        Args:
+            reranker: Reranker whose model scores the batches
+            max_batch: Pairs after which a batch is scored without waiting further
+            max_wait_ms: Longest time the first request of a batch waits for others
+        """
+        self.reranker = reranker
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, query: str, passages: List[str]) -> List[float]:
+        """Score passages against a query as part of the next batch.
+
+        Args:
+            query: Search query
+            passages: Passages to score
+
+        Returns:
+            Score of each passage, in input order
+        """
+        if not passages:
+            return []
+
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(([(query, passage) for passage in passages], future))
+        return await future
+
+    async def rerank(
+        self,
+        query: str,
+        search_results: List[Dict[str, Any]],
+        top_k: Optional[int] = None
+    ) -> List[RerankResult]:
+        """Rerank search results, same as BGERerankerService.rerank_async but batched.
+
+        Args:
+            query: Search query
+            search_results: List of search results with text content
+            top_k: Number of top results to return (None for all)
+
+        Returns:
+            List of reranked results ordered by relevance score
+        """
+        if not search_results:
+            return []
+
+        start_time = time.time()
+        passages = self.reranker.extract_passages(search_results)
+        scores = await self.submit(query, passages)
+        rerank_results = self.reranker.build_results(search_results, passages, scores, top_k)
+
+        logger.info(
+            f"Reranked {len(search_results)} results in {(time.time() - start_time):.3f}s"
+        )
+        return rerank_results
+
+    async def _run(self):
+        """Collect pending requests into batches and score them until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[List[Tuple[str, str]], asyncio.Future]] = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            pairs = [pair for item_pairs, _ in batch for pair in item_pairs]
+            try:
+                scores = await loop.run_in_executor(
+                    self.reranker.executor, self.reranker.score_pairs, pairs
+                )
+            except Exception as e:
+                logger.error(f"Batched reranking of {len(pairs)} pairs failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_pairs, future in batch:
+                if not future.done():
+                    future.set_result(scores[offset:offset + len(item_pairs)])
+                offset += len(item_pairs)
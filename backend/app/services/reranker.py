@@ -24,6 +24,10 @@ class RerankerConfig:
     batch_size: int = 32
     device: str = "cpu"  # or "cuda" if GPU available
     cache_enabled: bool = True
+    backend: str = "onnx"  # "onnx" (ONNX Runtime) or "torch"
+    # ONNX file within model_name, e.g. the INT8 model written by
+    # app/scripts/export_reranker_onnx.py; None uses onnx/model.onnx
+    onnx_file_name: Optional[str] = None
     
 @dataclass 
 class RerankResult:
@@ -50,23 +54,37 @@ class BGERerankerService:
             self.model = CrossEncoder(
                 self.config.model_name,
                 max_length=self.config.max_length,
-                device=self.config.device
+                device=self.config.device,
+                backend=self.config.backend,
+                model_kwargs=self._model_kwargs()
             )
             logger.info("BGE reranker model loaded successfully")
         return self.model
         
+    def _model_kwargs(self) -> Dict[str, Any]:
+        """Backend options: CUDA provider for ONNX, FP16 weights for torch on GPU."""
+        on_gpu = self.config.device.startswith("cuda")
+        if self.config.backend == "onnx":
+            kwargs: Dict[str, Any] = {
+                "provider": "CUDAExecutionProvider" if on_gpu else "CPUExecutionProvider"
+            }
+            if self.config.onnx_file_name:
+                kwargs["file_name"] = self.config.onnx_file_name
+            return kwargs
+        if on_gpu:
+            import torch
+            return {"torch_dtype": torch.float16}
+        return {}
+    
     def _get_cache_key(self, query: str, passage: str) -> str:
         """Generate cache key for query-passage pair."""
         combined = f"{query}|||{passage}"
         return hashlib.md5(combined.encode()).hexdigest()
         
-    def _compute_scores(self, query: str, passages: List[str]) -> List[float]:
-        """Compute reranking scores for query-passage pairs."""
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Compute reranking scores for (query, passage) pairs in one model call."""
         model = self._get_model()
         
-        # Prepare input pairs
-        pairs = [(query, passage) for passage in passages]
-        
         # Check cache for existing scores
         if self.cache is not None:
             cached_scores = []
@@ -83,7 +101,7 @@ class BGERerankerService:
             
             # Compute scores for uncached pairs
             if uncached_pairs:
-                uncached_scores = model.predict(uncached_pairs)
+                uncached_scores = model.predict(uncached_pairs, batch_size=self.config.batch_size)
                 
                 # Cache the new scores
                 for (q, p), score in zip(uncached_pairs, uncached_scores):
@@ -102,9 +120,51 @@ class BGERerankerService:
             return all_scores
         else:
             # No caching, compute all scores
-            scores = model.predict(pairs)
+            scores = model.predict(pairs, batch_size=self.config.batch_size)
             return [float(score) for score in scores]
     
+    def _compute_scores(self, query: str, passages: List[str]) -> List[float]:
+        """Compute reranking scores for query-passage pairs."""
+        return self.score_pairs([(query, passage) for passage in passages])
+    
+    def extract_passages(self, search_results: List[Dict[str, Any]]) -> List[str]:
+        """Get the passage text of each search result."""
+        passages = []
+        for result in search_results:
+            text = result.get('text', result.get('content', ''))
+            if not text:
+                logger.warning(f"Empty text in search result: {result}")
+                text = ""
+            passages.append(text)
+        return passages
+    
+    def build_results(
+        self,
+        search_results: List[Dict[str, Any]],
+        passages: List[str],
+        scores: List[float],
+        top_k: Optional[int] = None
+    ) -> List[RerankResult]:
+        """Pair search results with their scores, best first, cut to top_k."""
+        rerank_results = []
+        for i, (result, score) in enumerate(zip(search_results, scores)):
+            rerank_result = RerankResult(
+                original_index=i,
+                rerank_score=score,
+                passage=passages[i],
+                metadata=result
+            )
+            rerank_results.append(rerank_result)
+        
+        # Sort by rerank score (descending)
+        rerank_results.sort(key=lambda x: x.rerank_score, reverse=True)
+        
+        # Apply top_k limit if specified
+        if top_k is not None:
+            rerank_results = rerank_results[:top_k]
+        
+        return rerank_results
+    
     async def rerank_async(
         self,
         query: str,
@@ -128,13 +188,7 @@ class BGERerankerService:
         start_time = time.time()
         
         # Extract passages from search results
-        passages = []
-        for result in search_results:
-            text = result.get('text', result.get('content', ''))
-            if not text:
-                logger.warning(f"Empty text in search result: {result}")
-                text = ""
-            passages.append(text)
+        passages = self.extract_passages(search_results)
         
         # Compute reranking scores in thread pool
         loop = asyncio.get_event_loop()
@@ -145,23 +199,7 @@ class BGERerankerService:
             passages
         )
         
-        # Create rerank results
-        rerank_results = []
-        for i, (result, score) in enumerate(zip(search_results, scores)):
-            rerank_result = RerankResult(
-                original_index=i,
-                rerank_score=score,
-                passage=passages[i],
-                metadata=result
-            )
-            rerank_results.append(rerank_result)
-        
-        # Sort by rerank score (descending)
-        rerank_results.sort(key=lambda x: x.rerank_score, reverse=True)
-        
-        # Apply top_k limit if specified
-        if top_k is not None:
-            rerank_results = rerank_results[:top_k]
+        rerank_results = self.build_results(search_results, passages, scores, top_k)
         
         end_time = time.time()
         logger.info(
@@ -16,6 +16,11 @@ from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Overview periods kept precomputed by the refresh_analytics_snapshots task,
+# and how long a snapshot stays usable if the task stops running
+OVERVIEW_SNAPSHOT_DAYS = (1, 7, 30)
+OVERVIEW_SNAPSHOT_TTL = 180
+
 @dataclass
 class SearchEvent:
     """Represents a search event for analytics."""
@@ -68,6 +73,7 @@ class SearchAnalyticsService:
         self.search_events_key = "search_analytics:events"
         self.click_events_key = "search_analytics:clicks"
         self.query_stats_key = "search_analytics:queries"
+        self.overview_snapshot_key = "search_analytics:overview"
         
     def _get_time_window_key(self, window: str = "daily") -> str:
         """Get Redis key for time window."""
@@ -89,29 +95,35 @@ class SearchAnalyticsService:
             
             event_data = asdict(search_event)
             event_data["timestamp"] = search_event.timestamp.isoformat()
+            event_json = json.dumps(event_data)
+            
+            # Send all updates in one round-trip
+            pipe = self.redis_client.pipeline(transaction=False)
             
             # Store event
-            self.redis_client.lpush(daily_key, json.dumps(event_data))
-            self.redis_client.lpush(hourly_key, json.dumps(event_data))
+            pipe.lpush(daily_key, event_json)
+            pipe.lpush(hourly_key, event_json)
             
             # Set expiration (30 days for daily, 7 days for hourly)
-            self.redis_client.expire(daily_key, 30 * 24 * 3600)
-            self.redis_client.expire(hourly_key, 7 * 24 * 3600)
+            pipe.expire(daily_key, 30 * 24 * 3600)
+            pipe.expire(hourly_key, 7 * 24 * 3600)
             
             # Update query frequency
-            self.redis_client.zincrby(
+            pipe.zincrby(
                 f"{self.query_stats_key}:frequency",
                 1,
                 search_event.query.lower()
             )
             
             # Update user search count
-            self.redis_client.hincrby(
+            pipe.hincrby(
                 f"{self.query_stats_key}:users",
                 search_event.user_id,
                 1
             )
             
+            pipe.execute()
+            
             logger.debug(f"Tracked search event for user {search_event.user_id}")
             
         except Exception as e:
@@ -282,6 +294,28 @@ class SearchAnalyticsService:
             logger.error(f"Failed to get user search history: {e}")
             return []
     
+    def refresh_overview_snapshots(self, ttl: int = OVERVIEW_SNAPSHOT_TTL) -> None:
+        """Precompute the analytics overview for the commonly requested periods."""
+        for days_back in OVERVIEW_SNAPSHOT_DAYS:
+            analytics = self.get_search_analytics(days_back=days_back)
+            self.redis_client.setex(
+                f"{self.overview_snapshot_key}:{days_back}",
+                ttl,
+                json.dumps(asdict(analytics))
+            )
+    
+    def get_search_analytics_overview(self, days_back: int = 7) -> Dict[str, Any]:
+        """Get the analytics overview, from its snapshot when one is fresh."""
+        if days_back in OVERVIEW_SNAPSHOT_DAYS:
+            try:
+                snapshot = self.redis_client.get(f"{self.overview_snapshot_key}:{days_back}")
+                if snapshot:
+                    return json.loads(snapshot)
+            except Exception as e:
+                logger.warning(f"Failed to read analytics snapshot: {e}")
+        
+        return asdict(self.get_search_analytics(days_back=days_back))
+    
     def get_popular_queries(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular search queries."""
         try:
@@ -0,0 +1,163 @@
+"""
+Semantic cache for search responses.
+
+Responses are stored with the embedding of the query that produced them,
+so a later search by the same user whose query embedding is close enough
+(a paraphrase or a near-duplicate) can be answered without running the
+vector search, reranking and context construction again.
+
+Each user has a generation counter in Redis that is bumped whenever their
+indexed documents change. Searches include it in the cache parameters, so
+responses cached by any API worker before the change stop matching.
+"""
+
+import logging
+import math
+import operator
+import time
+from typing import Any, List, Optional, Tuple
+
+import redis
+from cachetools import LRUCache
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "semantic-cache:generation:{}"
+
+
+class SemanticSearchCache:
+    """
+    Recent search responses per user, matched by query embedding similarity.
+
+    Entries are only compared with the same user's entries for the same
+    search parameters, which keeps each lookup to a few dozen dot products.
+    """
+
+    def __init__(
+        self,
+        max_users: int = 1000,
+        entries_per_user: int = 32,
+        ttl: float = 300,
+        threshold: float = 0.95
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_users: Number of users with cached responses, least recent evicted first
+            entries_per_user: Cached responses kept per user, oldest evicted first
+            ttl: Seconds a cached response stays valid
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.entries_per_user = entries_per_user
+        self.ttl = ttl
+        self.threshold = threshold
+        # user_id -> [(expires_at, params_key, unit_vector, response), ...]
+        self._entries: LRUCache = LRUCache(maxsize=max_users)
+
+    def lookup(self, embedding: List[float], user_id: str, params_key: str) -> Optional[Any]:
+        """Get the cached response of the most similar earlier query.
+
+        Args:
+            embedding: Query embedding
+            user_id: User performing the search
+            params_key: Serialized search parameters other than the query
+
+        Returns:
+            Cached response, or None if no entry is similar enough
+        """
+        entries = self._entries.get(user_id)
+        if not entries:
+            return None
+
+        now = time.monotonic()
+        entries[:] = [entry for entry in entries if entry[0] > now]
+
+        query = _normalize(embedding)
+        best_score = self.threshold
+        best = None
+        for _, entry_params, vector, response in entries:
+            if entry_params != params_key:
+                continue
+            score = sum(map(operator.mul, query, vector))
+            if score >= best_score:
+                best_score = score
+                best = response
+        return best
+
+    def put(self, embedding: List[float], user_id: str, params_key: str, response: Any) -> None:
+        """Cache a search response.
+
+        Args:
+            embedding: Query embedding
+            user_id: User who performed the search
+            params_key: Serialized search parameters other than the query
+            response: Response to return for similar queries
+        """
+        entries = self._entries.get(user_id)
+        if entries is None:
+            entries = self._entries[user_id] = []
+        entries.append((time.monotonic() + self.ttl, params_key, _normalize(embedding), response))
+        if len(entries) > self.entries_per_user:
+            del entries[0]
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop every cached response of a user in this process."""
+        self._entries.pop(user_id, None)
+
+
+def _normalize(vector: List[float]) -> Tuple[float, ...]:
+    """Scale a vector to unit length so dot products are cosine similarities."""
+    norm = math.sqrt(sum(map(operator.mul, vector, vector))) or 1.0
+    return tuple(value / norm for value in vector)
+
+
+def _redis_kwargs() -> dict:
+    return {
+        "host": settings.REDIS_HOST,
+        "port": settings.REDIS_PORT,
+        "password": settings.REDIS_PASSWORD or None,
+        "db": 3,  # Use separate DB for response caches
+        "decode_responses": True
+    }
+
+
+_redis_client: Optional[redis.Redis] = None
+_async_redis_client: Optional[aioredis.Redis] = None
+
+
+async def get_generation(user_id: str) -> Optional[str]:
+    """Get the cache generation of a user's search results.
+
+    Returns:
+        Generation to include in the cache parameters, or None if Redis is
+        unavailable and cached responses cannot be trusted
+    """
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.Redis(**_redis_kwargs())
+    try:
+        return await _async_redis_client.get(GENERATION_KEY.format(user_id)) or "0"
+    except Exception as e:
+        logger.warning(f"Failed to read semantic cache generation for user {user_id}: {e}")
+        return None
+
+
+def invalidate_user(user_id: str) -> None:
+    """Invalidate a user's cached search responses in every process.
+
+    Call after the user's documents or their vectors change.
+    """
+    global _redis_client
+    semantic_cache.invalidate(user_id)
+    if _redis_client is None:
+        _redis_client = redis.Redis(**_redis_kwargs())
+    try:
+        _redis_client.incr(GENERATION_KEY.format(user_id))
+    except Exception as e:
+        logger.warning(f"Failed to bump semantic cache generation for user {user_id}: {e}")
+
+
+semantic_cache = SemanticSearchCache()
@@ -1,19 +1,48 @@
 import uuid
 import hashlib
+import logging
+import ssl
 from datetime import datetime, timedelta
-from typing import Optional
+import math
+from typing import Optional, List, Dict, Any
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from app.core.config import settings
 
+# S3 caps a multipart upload at 10,000 parts
+MAX_MULTIPART_PARTS = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def compute_sha256(content: bytes) -> str:
+    """Compute the hex SHA-256 digest used for document deduplication."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def log_hash_backend() -> None:
+    """Log which implementation backs hashlib.sha256, so a build without OpenSSL shows up at startup."""
+    # hashlib.sha256 is _hashlib.openssl_sha256 when OpenSSL is available,
+    # which uses the CPU's SHA extensions; otherwise it is the builtin _sha2
+    backend = "OpenSSL" if hashlib.sha256.__name__ == "openssl_sha256" else "builtin"
+    logger.info(f"SHA-256 backend: {backend} ({ssl.OPENSSL_VERSION})")
+
 class StorageService:
     def __init__(self):
+        # One client per process, shared by all requests; its connection pool
+        # must be large enough that concurrent requests do not queue on it
         self.s3_client = boto3.client(
             's3',
             endpoint_url=settings.MINIO_URL,
             aws_access_key_id=settings.MINIO_ACCESS_KEY,
             aws_secret_access_key=settings.MINIO_SECRET_KEY,
-            region_name='us-east-1'  # MinIO default
+            region_name='us-east-1',  # MinIO default
+            config=Config(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={'max_attempts': 3, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
         )
         self.bucket_name = settings.MINIO_BUCKET
         
@@ -83,6 +112,81 @@ class StorageService:
             print(f"Error generating download URL: {e}")
             return None
     
+    def should_use_multipart(self, file_size: int) -> bool:
+        """Whether a file is large enough to be uploaded in parallel parts."""
+        return file_size > settings.MULTIPART_UPLOAD_THRESHOLD_MB * 1024 * 1024
+    
+    def get_multipart_part_size(self, file_size: int) -> int:
+        """Get the part size for a multipart upload, growing it to stay under the part limit."""
+        part_size = settings.MULTIPART_PART_SIZE_MB * 1024 * 1024
+        return max(part_size, math.ceil(file_size / MAX_MULTIPART_PARTS))
+    
+    def create_multipart_upload(self, storage_path: str) -> Optional[str]:
+        """Start a multipart upload and return its upload ID."""
+        try:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=storage_path,
+                ContentType='application/octet-stream'
+            )
+            return response['UploadId']
+        except ClientError as e:
+            print(f"Error creating multipart upload: {e}")
+            return None
+    
+    def generate_presigned_part_urls(
+        self, 
+        storage_path: str, 
+        upload_id: str, 
+        part_count: int, 
+        expiration: int = 3600
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Generate a presigned URL for each part of a multipart upload."""
+        try:
+            return [
+                {
+                    "part_number": part_number,
+                    "url": self.s3_client.generate_presigned_url(
+                        'upload_part',
+                        Params={
+                            'Bucket': self.bucket_name,
+                            'Key': storage_path,
+                            'UploadId': upload_id,
+                            'PartNumber': part_number
+                        },
+                        ExpiresIn=expiration
+                    )
+                }
+                for part_number in range(1, part_count + 1)
+            ]
+        except ClientError as e:
+            print(f"Error generating presigned part URLs: {e}")
+            return None
+    
+    def complete_multipart_upload(
+        self, 
+        storage_path: str, 
+        upload_id: str, 
+        parts: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Assemble uploaded parts into the final object and return its ETag."""
+        try:
+            response = self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=storage_path,
+                UploadId=upload_id,
+                MultipartUpload={
+                    'Parts': [
+                        {'PartNumber': part['part_number'], 'ETag': part['etag']}
+                        for part in sorted(parts, key=lambda p: p['part_number'])
+                    ]
+                }
+            )
+            return response['ETag'].strip('"')
+        except ClientError as e:
+            print(f"Error completing multipart upload: {e}")
+            return None
+    
     def check_file_exists(self, storage_path: str) -> bool:
         """Check if a file exists in storage."""
         try:
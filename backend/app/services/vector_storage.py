@@ -7,11 +7,12 @@ in Qdrant vector database with proper collection management.
 
 import uuid
 import logging
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     VectorParams, Distance, PointStruct, Filter, FieldCondition, 
-    MatchValue, SearchParams, CollectionInfo
+    MatchValue, MatchAny, SearchParams, CollectionInfo, PayloadSchemaType,
+    IsEmptyCondition, PayloadField
 )
 from pydantic import BaseModel
 
@@ -22,6 +23,10 @@ from app.services.embeddings import EmbeddingResult
 logger = logging.getLogger(__name__)
 
 
+# Payload fields every collection keeps a keyword index on
+INDEXED_PAYLOAD_FIELDS = ("user_id", "document_id")
+
+
 class VectorPoint(BaseModel):
     """Vector point for storage in Qdrant."""
     id: str
@@ -51,6 +56,11 @@ class VectorStorageConfig(BaseModel):
 class VectorStorageService:
     """Service for storing and retrieving vectors in Qdrant."""
     
+    # One client per process, shared by all service instances so the gRPC
+    # channel and its connections are reused
+    _client: Optional[QdrantClient] = None
+    _ensured_collections: Set[str] = set()
+    
     def __init__(self, config: Optional[VectorStorageConfig] = None):
         """Initialize the vector storage service.
         
@@ -58,10 +68,30 @@ class VectorStorageService:
             config: Configuration for vector storage
         """
         self.config = config or VectorStorageConfig()
-        self.client = QdrantClient(url=settings.QDRANT_URL)
+        self.client = self._get_client()
         
         # Initialize collection if it doesn't exist
-        self._ensure_collection_exists()
+        if self.config.collection_name not in VectorStorageService._ensured_collections:
+            self._ensure_collection_exists()
+            VectorStorageService._ensured_collections.add(self.config.collection_name)
+    
+    @classmethod
+    def _get_client(cls) -> QdrantClient:
+        """Get the shared Qdrant client, creating it on first use."""
+        if cls._client is None:
+            cls._client = QdrantClient(
+                url=settings.QDRANT_URL,
+                api_key=settings.QDRANT_API_KEY,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+                grpc_options={
+                    "grpc.keepalive_time_ms": 10_000,
+                    "grpc.keepalive_timeout_ms": 5_000,
+                    "grpc.keepalive_permit_without_calls": 1,
+                    "grpc.max_receive_message_length": 64 * 1024 * 1024
+                }
+            )
+        return cls._client
     
     def _ensure_collection_exists(self) -> None:
         """Ensure the collection exists in Qdrant."""
@@ -89,6 +119,11 @@ class VectorStorageService:
                 logger.info(f"Collection {self.config.collection_name} created successfully")
             else:
                 logger.info(f"Collection {self.config.collection_name} already exists")
+            
+            # Searches filter on the owner and document lookups on the document,
+            # so keep both indexed for filtered HNSW traversal
+            for field_name in INDEXED_PAYLOAD_FIELDS:
+                self.ensure_payload_index(field_name)
                 
         except Exception as e:
             logger.error(f"Failed to ensure collection exists: {e}")
@@ -110,7 +145,8 @@ class VectorStorageService:
                 "distance_metric": info.config.params.vectors.distance.value,
                 "status": info.status.value,
                 "optimizer_status": "ok",  # Simplified - just report as ok if collection exists
-                "indexed_vectors_count": info.indexed_vectors_count if hasattr(info, 'indexed_vectors_count') else 0
+                "indexed_vectors_count": info.indexed_vectors_count if hasattr(info, 'indexed_vectors_count') else 0,
+                "payload_indexes": sorted(info.payload_schema or {})
             }
         except Exception as e:
             logger.error(f"Failed to get collection info: {e}")
@@ -181,7 +217,8 @@ class VectorStorageService:
         query_vector: List[float],
         limit: int = 10,
         score_threshold: Optional[float] = None,
-        filter_conditions: Optional[Dict[str, Any]] = None
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
         """Search for similar vectors.
         
@@ -189,7 +226,10 @@ class VectorStorageService:
             query_vector: Query vector to search for
             limit: Maximum number of results to return
             score_threshold: Minimum similarity score threshold
-            filter_conditions: Optional filter conditions
+            filter_conditions: Optional payload filters; every key must match,
+                a list value matches any of its items
+            exclude_conditions: Optional payload filters in the same form;
+                points matching any of them are left out
             
         Returns:
             List of search results
@@ -197,22 +237,11 @@ class VectorStorageService:
         try:
             # Build filter if conditions provided
             search_filter = None
-            if filter_conditions:
-                conditions = []
-                for key, value in filter_conditions.items():
-                    if isinstance(value, list):
-                        # Handle multiple values (OR condition)
-                        for v in value:
-                            conditions.append(
-                                FieldCondition(key=key, match=MatchValue(value=v))
-                            )
-                    else:
-                        conditions.append(
-                            FieldCondition(key=key, match=MatchValue(value=value))
-                        )
-                
-                if conditions:
-                    search_filter = Filter(should=conditions) if len(conditions) > 1 else Filter(must=[conditions[0]])
+            if filter_conditions or exclude_conditions:
+                search_filter = Filter(
+                    must=_field_conditions(filter_conditions),
+                    must_not=_field_conditions(exclude_conditions)
+                )
             
             # Perform search
             search_results = self.client.search(
@@ -377,6 +406,66 @@ class VectorStorageService:
             logger.error(f"Failed to update metadata for document {document_id}: {e}")
             return False
     
+    def set_document_payload(self, document_id: str, payload: Dict[str, Any]) -> bool:
+        """Set payload keys on all vectors of a document in one request.
+        
+        Args:
+            document_id: ID of the document
+            payload: Payload keys to set, other keys are kept
+            
+        Returns:
+            True if update was successful
+        """
+        try:
+            self.client.set_payload(
+                collection_name=self.config.collection_name,
+                payload=payload,
+                points=Filter(
+                    must=[
+                        FieldCondition(
+                            key="document_id",
+                            match=MatchValue(value=document_id)
+                        )
+                    ]
+                )
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to set payload for document {document_id}: {e}")
+            return False
+    
+    def ensure_payload_index(self, field_name: str) -> None:
+        """Create a keyword payload index on a field if it does not exist yet.
+        
+        Args:
+            field_name: Payload key to index
+        """
+        info = self.client.get_collection(self.config.collection_name)
+        if field_name not in (info.payload_schema or {}):
+            self.client.create_payload_index(
+                collection_name=self.config.collection_name,
+                field_name=field_name,
+                field_schema=PayloadSchemaType.KEYWORD
+            )
+    
+    def count_missing_payload(self, field_name: str) -> int:
+        """Count vectors whose payload does not have a field yet.
+        
+        Args:
+            field_name: Payload key to look for
+            
+        Returns:
+            Number of vectors without the key
+        """
+        return self.client.count(
+            collection_name=self.config.collection_name,
+            count_filter=Filter(
+                must=[IsEmptyCondition(is_empty=PayloadField(key=field_name))]
+            ),
+            exact=True
+        ).count
+    
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics.
         
@@ -413,4 +502,17 @@ class VectorStorageService:
             
         except Exception as e:
             logger.error(f"Failed to get storage stats: {e}")
-            raise 
\ No newline at end of file
+            raise 
+
+
+def _field_conditions(conditions: Optional[Dict[str, Any]]) -> Optional[List[FieldCondition]]:
+    """Turn {key: value} filters into conditions; list values match any item."""
+    if not conditions:
+        return None
+    return [
+        FieldCondition(
+            key=key,
+            match=MatchAny(any=value) if isinstance(value, list) else MatchValue(value=value)
+        )
+        for key, value in conditions.items()
+    ]
@@ -0,0 +1,28 @@
+"""
+Celery tasks for search analytics.
+
+This module keeps the precomputed search analytics snapshots that the
+analytics endpoints serve up to date.
+"""
+
+import logging
+
+from app.workers.celery_app import celery_app
+from app.services.search_analytics import SearchAnalyticsService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="analytics.refresh_analytics_snapshots",
+    max_retries=0,
+    ignore_result=True
+)
+def refresh_analytics_snapshots(self) -> None:
+    """Recompute the analytics overview snapshots."""
+    try:
+        SearchAnalyticsService().refresh_overview_snapshots()
+    except Exception as e:
+        logger.error(f"Failed to refresh analytics snapshots: {str(e)}")
+        raise
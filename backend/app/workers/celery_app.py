@@ -1,6 +1,8 @@
 from celery import Celery
 from celery.signals import worker_ready, worker_shutting_down, task_prerun, task_postrun, task_failure
+from kombu.serialization import register
 import logging
+import orjson
 from datetime import datetime
 from app.core.config import settings
 
@@ -8,6 +10,16 @@ from app.core.config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# orjson-encoded task messages: faster to produce and consume than the
+# stdlib-backed json serializer, and compact for the config dicts tasks take
+register(
+    'orjson',
+    orjson.dumps,
+    orjson.loads,
+    content_type='application/x-orjson',
+    content_encoding='utf-8'
+)
+
 # Create Celery app with enhanced configuration
 celery_app = Celery(
     "document_processor",
@@ -17,15 +29,17 @@ celery_app = Celery(
         "app.workers.document_conversion", 
         "app.workers.vector_indexing",
         "app.workers.enhanced_document_conversion",
-        "app.workers.document_pipeline"
+        "app.workers.document_pipeline",
+        "app.workers.upload_verification",
+        "app.workers.analytics"
     ]
 )
 
 # Enhanced Celery configuration
 celery_app.conf.update(
     # Serialization
-    task_serializer='json',
-    accept_content=['json'],
+    task_serializer='orjson',
+    accept_content=['orjson', 'json'],  # json for messages queued before the switch
     result_serializer='json',
     result_accept_content=['json'],
     
@@ -91,6 +105,10 @@ celery_app.conf.update(
     },
     
     # Worker settings
+    # Conversion and pipeline tasks can run for minutes: reserve one task per
+    # process and ack after completion so idle workers pick up queued work
+    # (workers are started with -O fair). Long tasks are routed to their own
+    # queues above so they do not starve the short tasks on the default queue.
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
@@ -134,6 +152,10 @@ celery_app.conf.update(
         'update-processing-stats': {
             'task': 'app.workers.maintenance.update_processing_stats',
             'schedule': 900.0,  # Every 15 minutes
+        },
+        'refresh-analytics-snapshots': {
+            'task': 'analytics.refresh_analytics_snapshots',
+            'schedule': 60.0,  # Every minute
         }
     }
 )
@@ -143,6 +165,9 @@ celery_app.conf.update(
 def worker_ready_handler(sender=None, **kwargs):
     """Called when worker is ready to accept tasks."""
     logger.info(f"Worker {sender} is ready to process tasks")
+    # One-shot backfill of the owner into vectors indexed before search
+    # filtered on it; a no-op once every vector has one
+    celery_app.send_task("vector_indexing.backfill_vector_owners")
 
 @worker_shutting_down.connect  
 def worker_shutting_down_handler(sender=None, **kwargs):
@@ -52,6 +52,24 @@ def convert_document(self, document_id: str, user_id: str) -> Dict[str, Any]:
     Returns:
         Dictionary with conversion results
     """
+    try:
+        return convert_document_sync(document_id, user_id)
+    except Exception as exc:
+        # Retry logic
+        if self.request.retries < self.max_retries:
+            logger.info(f"Retrying document conversion for document {document_id}. Retry {self.request.retries + 1}/{self.max_retries}")
+            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+        
+        raise exc
+
+def convert_document_sync(document_id: str, user_id: str) -> Dict[str, Any]:
+    """
+    Convert a document to Markdown in the calling process.
+    
+    Shared by the Celery task and callers that convert tiny documents
+    inline. On failure the document is marked as conversion_failed and
+    the exception is re-raised.
+    """
     logger.info(f"Starting document conversion for document {document_id}")
     
     db = SessionLocal()
@@ -92,6 +110,7 @@ def convert_document(self, document_id: str, user_id: str) -> Dict[str, Any]:
         # Update document record
         document.upload_status = "conversion_completed"
         document.content_extracted = True
+        document.markdown_storage_path = markdown_storage_path
         document.content_text = markdown_content[:10000]  # Store first 10k chars for quick access
         db.commit()
         
@@ -117,11 +136,6 @@ def convert_document(self, document_id: str, user_id: str) -> Dict[str, Any]:
         except Exception as e:
             logger.error(f"Failed to update document status after conversion failure: {e}")
         
-        # Retry logic
-        if self.request.retries < self.max_retries:
-            logger.info(f"Retrying document conversion for document {document_id}. Retry {self.request.retries + 1}/{self.max_retries}")
-            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
-        
         raise exc
         
     finally:
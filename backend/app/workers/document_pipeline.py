@@ -328,6 +328,7 @@ def execute_text_extraction(self, document_id: str, extraction_config: Optional[
             # Update document
             document.content_text = extraction_result.extracted_text[:10000]
             document.content_extracted = True
+            document.markdown_storage_path = markdown_storage_path
             db.commit()
         
         db.close()
@@ -358,7 +359,7 @@ def execute_content_preprocessing(self, document_id: str, preprocessing_config:
             raise ValueError(f"Document {document_id} not found")
         
         # Get extracted text
-        markdown_storage_path = document.storage_path.rsplit('.', 1)[0] + '.md'
+        markdown_storage_path = document.markdown_storage_path or document.storage_path.rsplit('.', 1)[0] + '.md'
         text_content = storage_service.s3_client.get_object(
             Bucket=storage_service.bucket_name,
             Key=markdown_storage_path
@@ -419,7 +420,7 @@ def execute_metadata_enrichment(self, document_id: str, metadata_config: Optiona
             Key=document.storage_path
         )['Body'].read()
         
-        markdown_storage_path = document.storage_path.rsplit('.', 1)[0] + '.md'
+        markdown_storage_path = document.markdown_storage_path or document.storage_path.rsplit('.', 1)[0] + '.md'
         text_content = storage_service.s3_client.get_object(
             Bucket=storage_service.bucket_name,
             Key=markdown_storage_path
@@ -180,6 +180,7 @@ def enhanced_convert_document(
         
         document.upload_status = "conversion_completed"
         document.content_extracted = True
+        document.markdown_storage_path = markdown_storage_path
         document.content_text = markdown_content[:10000]
         document.indexing_metadata = conversion_metadata
         
@@ -0,0 +1,42 @@
+import uuid
+import logging
+from typing import Dict, Any
+
+from app.workers.celery_app import celery_app
+from app.db.session import SessionLocal
+from app import crud
+from app.services.storage import storage_service
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+@celery_app.task
+def verify_upload(document_id: str, user_id: str) -> Dict[str, Any]:
+    """
+    Confirm an uploaded file landed in storage and finalize its upload status.
+    
+    Args:
+        document_id: The UUID of the uploaded document
+        user_id: The UUID of the user who owns the document
+        
+    Returns:
+        Dictionary with the resulting upload status
+    """
+    db = SessionLocal()
+    try:
+        document = crud.document.get_by_id(db, uuid.UUID(document_id), uuid.UUID(user_id))
+        if not document:
+            return {"status": "not_found", "document_id": document_id}
+        
+        if storage_service.check_file_exists(document.storage_path):
+            crud.document.mark_completed(db, document.id)
+            logger.info(f"Upload verified for document {document_id}")
+            return {"status": "completed", "document_id": document_id}
+        
+        crud.document.update_status(
+            db, document_id, "failed", error_message="File not found in storage"
+        )
+        logger.warning(f"Upload verification failed for document {document_id}: file missing")
+        return {"status": "failed", "document_id": document_id}
+    finally:
+        db.close()
@@ -7,6 +7,7 @@ chunking, embedding, and storage pipeline for vector search.
 
 import asyncio
 import logging
+import math
 from typing import List, Dict, Any, Optional
 from celery import Task
 from datetime import datetime
@@ -16,6 +17,7 @@ from app.services.storage import StorageService
 from app.services.chunking import DocumentChunkingService, ChunkingConfig
 from app.services.embeddings import EmbeddingService, EmbeddingConfig
 from app.services.vector_storage import VectorStorageService, VectorStorageConfig
+from app.services.semantic_cache import invalidate_user
 from app.crud.crud_document import crud_document
 from app.api.deps import get_db
 
@@ -129,6 +131,7 @@ def index_document(
             markdown_content=markdown_content,
             document_id=document_id,
             additional_metadata={
+                "user_id": str(document.user_id),
                 "filename": document.filename,
                 "original_size": document.file_size,
                 "upload_date": document.created_at.isoformat(),
@@ -157,6 +160,7 @@ def index_document(
         point_ids = storage_service.store_embeddings(embeddings_data)
         
         logger.info(f"Stored {len(point_ids)} vectors in Qdrant")
+        invalidate_user(str(document.user_id))
         
         # Step 4: Update document status and metadata
         crud_document.update_status(
@@ -177,7 +181,8 @@ def index_document(
         crud_document.update_metadata(
             db=db,
             document_id=document_id,
-            metadata=indexing_metadata
+            metadata=indexing_metadata,
+            centroid_vector=_centroid([result.embedding for _, result in embeddings_data])
         )
         
         # Generate statistics
@@ -266,6 +271,7 @@ def reindex_document(
         
         if deleted:
             logger.info(f"Deleted existing vectors for document {document_id}")
+            invalidate_user(str(document.user_id))
         
         # Trigger new indexing
         result = index_document.apply_async(args=[document_id])
@@ -375,6 +381,8 @@ def delete_document_vectors(self, document_id: str) -> Dict[str, Any]:
             # Update document status
             db = next(get_db())
             document = crud_document.get(db=db, id=document_id)
+            if document:
+                invalidate_user(str(document.user_id))
             if document and document.upload_status == "indexed":
                 crud_document.update_status(
                     db=db,
@@ -426,4 +434,59 @@ def get_indexing_stats(self) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Failed to get indexing statistics: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+
+@celery_app.task(
+    bind=True,
+    name="vector_indexing.backfill_vector_owners",
+    max_retries=1
+)
+def backfill_vector_owners(self) -> Dict[str, Any]:
+    """
+    Write the owning user's ID into the payload of already indexed vectors.
+    
+    Vectors indexed before the owner was stored in their payload cannot be
+    matched by the per-user search filter until this has run once.
+    
+    Returns:
+        Dictionary with backfill results
+    """
+    try:
+        logger.info("Backfilling user_id into vector payloads")
+        
+        db = next(get_db())
+        storage_service = VectorStorageService()
+        
+        if storage_service.count_missing_payload("user_id") == 0:
+            logger.info("Every vector already has its owner, nothing to backfill")
+            return {
+                "documents_updated": 0,
+                "failed_documents": [],
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        
+        updated = 0
+        failed = []
+        for document_id, user_id in crud_document.get_indexed_document_owners(db):
+            if storage_service.set_document_payload(str(document_id), {"user_id": str(user_id)}):
+                updated += 1
+            else:
+                failed.append(str(document_id))
+        
+        return {
+            "documents_updated": updated,
+            "failed_documents": failed,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to backfill vector owners: {str(e)}")
+        raise
+
+
+def _centroid(embeddings: List[List[float]]) -> List[float]:
+    """Unit-length mean of a document's chunk embeddings, used as its similarity query."""
+    centroid = [sum(column) / len(embeddings) for column in zip(*embeddings)]
+    norm = math.sqrt(sum(value * value for value in centroid)) or 1.0
+    return [value / norm for value in centroid]
@@ -23,7 +23,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.database import get_db
+from app.api.deps import get_db
 from app.db.base import Base
 from app.core.config import settings
 from app.models.user import User
@@ -294,7 +294,7 @@ def cleanup_test_files():
 @pytest.fixture(autouse=True)
 def test_settings():
     """Override settings for testing."""
-    original_settings = settings.dict()
+    original_settings = settings.model_dump()
     
     # Override with test-specific settings
     test_overrides = {
@@ -309,8 +309,10 @@ def test_settings():
         "REDIS_URL": "redis://localhost:6379",
     }
     
+    # Settings has no field for some of these in every deployment; skip those
     for key, value in test_overrides.items():
-        setattr(settings, key, value)
+        if key in type(settings).model_fields:
+            setattr(settings, key, value)
     
     yield settings
     
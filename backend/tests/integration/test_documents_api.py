@@ -0,0 +1,280 @@
+"""
+Integration tests for document API endpoints.
+
+Tests the document routes with the database, storage and Celery
+dependencies replaced.
+"""
+
+import sys
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.crud.pagination import encode_cursor
+from app.main import app
+from app.routers import documents as documents_router
+from app.schemas.document import DocumentUploadResponse
+from app.services.idempotency import IN_PROGRESS
+
+BASE_URL = "/api/v1/documents"
+
+
+@pytest.fixture
+def current_user():
+    """User the overridden auth dependencies resolve to."""
+    return SimpleNamespace(id=uuid.uuid4())
+
+
+@pytest.fixture
+def owned_document():
+    """Document the overridden ownership dependency resolves to."""
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        upload_status="completed",
+        content_extracted=False,
+        storage_path="documents/test.pdf",
+    )
+
+
+@pytest.fixture
+def documents_client(current_user, owned_document):
+    """Create a test client with auth and database dependencies overridden."""
+    app.dependency_overrides[deps.get_db] = lambda: Mock()
+    app.dependency_overrides[deps.get_current_user] = lambda: current_user
+    app.dependency_overrides[deps.get_current_user_and_document] = lambda: (current_user, owned_document)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _listing_row(created_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        filename="book.pdf",
+        original_filename="book.pdf",
+        file_size=1024,
+        file_type="pdf",
+        upload_status="completed",
+        upload_progress=100,
+        created_at=created_at,
+        content_extracted=True,
+        vector_indexed=True,
+    )
+
+
+@pytest.mark.integration
+class TestInitiateUpload:
+    """Test idempotent upload initiation."""
+
+    upload_data = {"filename": "book.pdf", "file_size": 1024, "file_hash": "abc123", "file_type": "pdf"}
+
+    def test_first_request_stores_response(self, documents_client):
+        """Test a new request creates the document and stores its response."""
+        response_model = DocumentUploadResponse(document_id=uuid.uuid4(), upload_url="https://upload")
+
+        with patch.object(documents_router, "idempotency_cache") as cache, \
+                patch.object(documents_router, "_initiate_upload", return_value=response_model) as initiate:
+            cache.reserve.return_value = True
+            response = documents_client.post(f"{BASE_URL}/upload/init", json=self.upload_data)
+
+        assert response.status_code == 200
+        assert response.json()["document_id"] == str(response_model.document_id)
+        initiate.assert_called_once()
+        cache.set.assert_called_once()
+        assert cache.set.call_args.args[1] == response_model.model_dump_json()
+
+    def test_retry_replays_stored_response(self, documents_client):
+        """Test a retry gets the original response without creating a document."""
+        stored = DocumentUploadResponse(document_id=uuid.uuid4(), upload_url="https://upload")
+
+        with patch.object(documents_router, "idempotency_cache") as cache, \
+                patch.object(documents_router, "_initiate_upload") as initiate:
+            cache.reserve.return_value = False
+            cache.get.return_value = stored.model_dump_json()
+            response = documents_client.post(
+                f"{BASE_URL}/upload/init", json=self.upload_data, headers={"Idempotency-Key": "retry-1"}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["document_id"] == str(stored.document_id)
+        initiate.assert_not_called()
+
+    def test_concurrent_retry_conflicts(self, documents_client):
+        """Test a retry while the original request is still running is rejected."""
+        with patch.object(documents_router, "idempotency_cache") as cache, \
+                patch.object(documents_router, "_initiate_upload") as initiate:
+            cache.reserve.return_value = False
+            cache.get.return_value = IN_PROGRESS
+            response = documents_client.post(f"{BASE_URL}/upload/init", json=self.upload_data)
+
+        assert response.status_code == 409
+        initiate.assert_not_called()
+
+    def test_failure_releases_reservation(self, documents_client):
+        """Test a failed request frees its key so the client can retry."""
+        with patch.object(documents_router, "idempotency_cache") as cache, \
+                patch.object(documents_router, "_initiate_upload", side_effect=RuntimeError("db down")):
+            cache.reserve.return_value = True
+            with pytest.raises(RuntimeError):
+                documents_client.post(f"{BASE_URL}/upload/init", json=self.upload_data)
+
+        cache.release.assert_called_once()
+        cache.set.assert_not_called()
+
+
+@pytest.mark.integration
+class TestListDocuments:
+    """Test keyset-paginated document listing."""
+
+    def test_full_page_returns_next_cursor(self, documents_client, current_user):
+        """Test a full page links to the next one through X-Next-Cursor."""
+        rows = [_listing_row(datetime(2025, 6, 9, 12, 0, i)) for i in range(2, 0, -1)]
+
+        with patch.object(documents_router.crud.document, "get_user_documents", return_value=rows) as get_documents:
+            response = documents_client.get(f"{BASE_URL}/", params={"limit": 2})
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [str(row.id) for row in rows]
+        assert response.headers["X-Next-Cursor"] == encode_cursor(rows[-1].created_at, rows[-1].id)
+        assert get_documents.call_args.kwargs["after"] is None
+
+    def test_cursor_is_passed_as_keyset_position(self, documents_client):
+        """Test a cursor is decoded into the position the next page starts after."""
+        created_at, row_id = datetime(2025, 6, 9, 12, 0, 0), uuid.uuid4()
+
+        with patch.object(documents_router.crud.document, "get_user_documents", return_value=[]) as get_documents:
+            response = documents_client.get(
+                f"{BASE_URL}/", params={"cursor": encode_cursor(created_at, row_id), "limit": 2}
+            )
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert "X-Next-Cursor" not in response.headers
+        assert get_documents.call_args.kwargs["after"] == (created_at, row_id)
+
+    def test_invalid_cursor(self, documents_client):
+        """Test a malformed cursor is a client error."""
+        response = documents_client.get(f"{BASE_URL}/", params={"cursor": "not-base64!"})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestDocumentLookups:
+    """Test routes that read a narrow set of document columns."""
+
+    def test_download_url(self, documents_client, current_user):
+        """Test a completed upload gets a presigned download URL."""
+        document_id = uuid.uuid4()
+        row = SimpleNamespace(storage_path="documents/test.pdf", upload_status="completed")
+
+        with patch.object(documents_router.crud.document, "get_download_info", return_value=row) as get_info, \
+                patch.object(documents_router, "storage_service") as storage:
+            storage.generate_presigned_download_url.return_value = "https://download"
+            response = documents_client.get(f"{BASE_URL}/{document_id}/download")
+
+        assert response.status_code == 200
+        assert response.json() == {"download_url": "https://download"}
+        assert get_info.call_args.args[1:] == (document_id, current_user.id)
+
+    def test_download_url_not_found(self, documents_client):
+        """Test another user's or a missing document is not found."""
+        with patch.object(documents_router.crud.document, "get_download_info", return_value=None):
+            response = documents_client.get(f"{BASE_URL}/{uuid.uuid4()}/download")
+
+        assert response.status_code == 404
+
+    def test_conversion_status(self, documents_client):
+        """Test the conversion status is built from the processing state."""
+        document_id = uuid.uuid4()
+        row = SimpleNamespace(
+            upload_status="converting",
+            content_extracted=False,
+            vector_indexed=False,
+            storage_path="documents/test.pdf",
+            original_filename="test.pdf",
+            file_type="pdf",
+        )
+
+        with patch.object(documents_router.crud.document, "get_processing_state", return_value=row):
+            response = documents_client.get(f"{BASE_URL}/{document_id}/conversion-status")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["document_id"] == str(document_id)
+        assert data["upload_status"] == "converting"
+        assert data["conversion_status"] == "Converting to Markdown"
+
+    def test_conversion_status_not_found(self, documents_client):
+        """Test a missing document is not found."""
+        with patch.object(documents_router.crud.document, "get_processing_state", return_value=None):
+            response = documents_client.get(f"{BASE_URL}/{uuid.uuid4()}/conversion-status")
+
+        assert response.status_code == 404
+
+    def test_markdown(self, documents_client, current_user):
+        """Test converted documents return a Markdown URL and a short preview."""
+        document_id = uuid.uuid4()
+        row = SimpleNamespace(
+            id=document_id,
+            content_extracted=True,
+            storage_path="documents/test.pdf",
+            markdown_storage_path="documents/test.md",
+            content_preview="# Title",
+        )
+
+        with patch.object(documents_router.crud.document, "get_markdown_preview", return_value=row) as get_preview, \
+                patch.object(documents_router, "storage_service") as storage:
+            storage.generate_presigned_download_url.return_value = "https://markdown"
+            response = documents_client.get(f"{BASE_URL}/{document_id}/markdown")
+
+        assert response.status_code == 200
+        assert response.json()["markdown_download_url"] == "https://markdown"
+        assert response.json()["content_preview"] == "# Title"
+        storage.generate_presigned_download_url.assert_called_once_with("documents/test.md")
+        assert get_preview.call_args.args[1:] == (document_id, current_user.id)
+
+    def test_markdown_not_converted(self, documents_client):
+        """Test unconverted documents have no Markdown yet."""
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            content_extracted=False,
+            storage_path="documents/test.pdf",
+            markdown_storage_path=None,
+            content_preview=None,
+        )
+
+        with patch.object(documents_router.crud.document, "get_markdown_preview", return_value=row):
+            response = documents_client.get(f"{BASE_URL}/{row.id}/markdown")
+
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestEnhancedConversion:
+    """Test triggering enhanced conversion."""
+
+    def test_starts_task(self, documents_client, current_user, owned_document):
+        """Test the task is queued for the owned document."""
+        task = Mock()
+        task.delay.return_value = Mock(id="test-task-id")
+        # The router imports the task module when the endpoint runs, so stand in for it there
+        worker_module = Mock(enhanced_convert_document=task)
+        with patch.dict(sys.modules, {"app.workers.enhanced_document_conversion": worker_module}):
+            response = documents_client.post(f"{BASE_URL}/{owned_document.id}/convert-enhanced")
+
+        assert response.status_code == 200
+        assert response.json()["task_id"] == "test-task-id"
+        task.delay.assert_called_once_with(str(owned_document.id), str(current_user.id), None)
+
+    def test_already_converted(self, documents_client, owned_document):
+        """Test converted documents are not converted again."""
+        owned_document.content_extracted = True
+
+        response = documents_client.post(f"{BASE_URL}/{owned_document.id}/convert-enhanced")
+
+        assert response.status_code == 409
@@ -0,0 +1,64 @@
+"""
+Unit tests for the idempotency cache.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.services.idempotency import IN_PROGRESS, IdempotencyCache
+
+
+@pytest.fixture
+def cache():
+    """Create an idempotency cache backed by a mock Redis client."""
+    idempotency_cache = IdempotencyCache(ttl=600, reservation_ttl=60)
+    idempotency_cache.redis_client = Mock()
+    return idempotency_cache
+
+
+class TestIdempotencyCache:
+    """Test reserving, storing and replaying idempotency keys."""
+
+    def test_reserve_uses_set_nx(self, cache):
+        """Test a key is claimed atomically with the reservation TTL."""
+        cache.redis_client.set.return_value = True
+
+        assert cache.reserve("idem:key") is True
+        cache.redis_client.set.assert_called_once_with("idem:key", IN_PROGRESS, nx=True, ex=60)
+
+    def test_reserve_fails_when_key_is_held(self, cache):
+        """Test a second request cannot claim a key that is already held."""
+        cache.redis_client.set.return_value = None
+
+        assert cache.reserve("idem:key") is False
+
+    def test_set_stores_response_with_ttl(self, cache):
+        """Test a finished response replaces the reservation and expires after ttl."""
+        cache.set("idem:key", '{"document_id": "1"}')
+
+        cache.redis_client.setex.assert_called_once_with("idem:key", 600, '{"document_id": "1"}')
+
+    def test_release_deletes_key(self, cache):
+        """Test releasing a failed request's reservation lets a retry run."""
+        cache.release("idem:key")
+
+        cache.redis_client.delete.assert_called_once_with("idem:key")
+
+    def test_redis_errors_do_not_block_requests(self, cache):
+        """Test the request still runs when Redis is unavailable."""
+        cache.redis_client.get.side_effect = ConnectionError("redis down")
+        cache.redis_client.set.side_effect = ConnectionError("redis down")
+
+        assert cache.get("idem:key") is None
+        assert cache.reserve("idem:key") is True
+
+    def test_without_client(self):
+        """Test the cache degrades to a no-op without a Redis client."""
+        idempotency_cache = IdempotencyCache()
+        idempotency_cache.redis_client = None
+
+        assert idempotency_cache.get("idem:key") is None
+        assert idempotency_cache.reserve("idem:key") is True
+        idempotency_cache.set("idem:key", "{}")
+        idempotency_cache.release("idem:key")
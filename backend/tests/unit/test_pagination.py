@@ -0,0 +1,36 @@
+"""
+Unit tests for keyset pagination cursors.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.crud.pagination import encode_cursor, decode_cursor
+
+
+class TestPaginationCursor:
+    """Test cursor encoding and decoding."""
+
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes back to the position it was built from."""
+        created_at = datetime(2025, 6, 9, 12, 30, 15, 123456)
+        row_id = uuid.uuid4()
+
+        cursor = encode_cursor(created_at, row_id)
+
+        assert decode_cursor(cursor) == (created_at, row_id)
+
+    def test_cursor_is_url_safe(self):
+        """Test cursors can be passed as query parameters unescaped."""
+        cursor = encode_cursor(datetime.utcnow(), uuid.uuid4())
+
+        assert "+" not in cursor
+        assert "/" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "Zm9v", "MjAyNS0wNi0wOXxub3QtYS11dWlk"])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        """Test malformed cursors are rejected with ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,83 @@
+"""
+Unit tests for monthly quota usage.
+"""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base_class import Base
+from app.models.subscription import SubscriptionTier, UsageTracking, UsageTypeEnum, UserSubscription
+from app.services.quota_tracking import QUOTA_USAGE_TYPES, QuotaTrackingService
+
+
+@pytest.fixture
+def db_session():
+    """In-memory SQLite session with only the tables the quota service reads."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [SubscriptionTier.__table__, UserSubscription.__table__, UsageTracking.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def user_id(db_session):
+    """User with usage in this month and the last one."""
+    user_id = uuid.uuid4()
+    this_month = date.today().replace(day=1)
+    last_month = this_month - timedelta(days=1)
+
+    db_session.add_all([
+        UsageTracking(user_id=user_id, usage_type=UsageTypeEnum.SEARCH, amount=3, usage_date=this_month),
+        UsageTracking(user_id=user_id, usage_type=UsageTypeEnum.SEARCH, amount=2, usage_date=date.today()),
+        UsageTracking(user_id=user_id, usage_type=UsageTypeEnum.TOKEN, amount=500, usage_date=date.today()),
+        UsageTracking(user_id=user_id, usage_type=UsageTypeEnum.SEARCH, amount=100, usage_date=last_month),
+        UsageTracking(user_id=uuid.uuid4(), usage_type=UsageTypeEnum.SEARCH, amount=7, usage_date=date.today()),
+    ])
+    db_session.commit()
+    return user_id
+
+
+class TestMonthlyUsage:
+    """Test usage is counted from the first day of the current month."""
+
+    def test_current_month_usage(self, db_session, user_id):
+        """Test last month's and other users' usage is not counted."""
+        service = QuotaTrackingService(db_session)
+
+        assert service.get_current_month_usage(user_id, UsageTypeEnum.SEARCH) == 5
+        assert service.get_current_month_usage(user_id, UsageTypeEnum.UPLOAD) == 0
+
+    def test_month_usage_by_type(self, db_session, user_id):
+        """Test every usage type is totalled in one query."""
+        service = QuotaTrackingService(db_session)
+
+        assert service.get_month_usage_by_type(user_id) == {
+            UsageTypeEnum.SEARCH: 5,
+            UsageTypeEnum.TOKEN: 500,
+        }
+
+    def test_all_quota_status_uses_free_tier(self, db_session, user_id):
+        """Test users without a subscription get the default limits."""
+        service = QuotaTrackingService(db_session)
+
+        statuses = service.get_all_quota_status(user_id)
+
+        assert set(statuses) == {usage_type.value for usage_type in QUOTA_USAGE_TYPES}
+        assert statuses[UsageTypeEnum.SEARCH.value].current_usage == 5
+        assert statuses[UsageTypeEnum.SEARCH.value].limit == 1000
+        assert service.check_quota_limit(user_id, UsageTypeEnum.SEARCH, amount=995) is True
+        assert service.check_quota_limit(user_id, UsageTypeEnum.SEARCH, amount=996) is False
@@ -0,0 +1,86 @@
+"""
+Unit tests for reranker result building and batching.
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.services.rerank_batcher import RerankBatcher
+from app.services.reranker import BGERerankerService, RerankerConfig
+
+
+@pytest.fixture
+def reranker():
+    """Create a reranker whose model scores a pair by its passage length."""
+    service = BGERerankerService(RerankerConfig(cache_enabled=False))
+    service.model = Mock()
+    service.model.predict.side_effect = lambda pairs, batch_size: [float(len(p)) for _, p in pairs]
+    return service
+
+
+class TestBuildResults:
+    """Test pairing search results with their scores."""
+
+    def test_results_sorted_by_score(self, reranker):
+        """Test results come back best first and keep their original index."""
+        search_results = [{"text": "a"}, {"text": "abc"}, {"text": "ab"}]
+        passages = reranker.extract_passages(search_results)
+
+        results = reranker.build_results(search_results, passages, [0.1, 0.9, 0.5])
+
+        assert [r.original_index for r in results] == [1, 2, 0]
+        assert results[0].passage == "abc"
+        assert results[0].metadata is search_results[1]
+
+    def test_top_k(self, reranker):
+        """Test results are cut to top_k."""
+        search_results = [{"text": "a"}, {"content": "b"}, {"text": "c"}]
+        passages = reranker.extract_passages(search_results)
+
+        results = reranker.build_results(search_results, passages, [0.3, 0.2, 0.1], top_k=2)
+
+        assert len(results) == 2
+        assert [r.passage for r in results] == ["a", "b"]
+
+
+class TestRerankBatcher:
+    """Test coalescing concurrent rerank requests."""
+
+    async def test_concurrent_requests_share_a_model_call(self, reranker):
+        """Test requests arriving together are scored in one call and get their own scores back."""
+        batcher = RerankBatcher(reranker, max_batch=64, max_wait_ms=20)
+
+        first, second = await asyncio.gather(
+            batcher.submit("q1", ["a", "abcd"]),
+            batcher.submit("q2", ["abc"]),
+        )
+
+        assert first == [1.0, 4.0]
+        assert second == [3.0]
+        reranker.model.predict.assert_called_once()
+
+    async def test_rerank_returns_ordered_results(self, reranker):
+        """Test batched reranking matches the reranker's own result order."""
+        batcher = RerankBatcher(reranker, max_wait_ms=1)
+        search_results = [{"text": "ab"}, {"text": "abcd"}, {"text": "a"}]
+
+        results = await batcher.rerank("query", search_results, top_k=2)
+
+        assert [r.original_index for r in results] == [1, 0]
+
+    async def test_model_errors_reach_every_request(self, reranker):
+        """Test a failed batch raises in each waiting request."""
+        reranker.model.predict.side_effect = RuntimeError("model failed")
+        batcher = RerankBatcher(reranker, max_wait_ms=1)
+
+        with pytest.raises(RuntimeError):
+            await batcher.submit("query", ["a"])
+
+    async def test_empty_passages(self, reranker):
+        """Test nothing is queued for an empty request."""
+        batcher = RerankBatcher(reranker)
+
+        assert await batcher.submit("query", []) == []
+        assert await batcher.rerank("query", []) == []
@@ -0,0 +1,44 @@
+"""
+Unit tests for the Redis token bucket.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+from app.middleware.security import RedisTokenBucket
+
+
+class TestRedisTokenBucket:
+    """Test consuming tokens through the refill-and-consume script."""
+
+    async def test_consume_allowed(self):
+        """Test an allowed request reports the tokens left."""
+        bucket = RedisTokenBucket()
+        bucket._script = AsyncMock(return_value=[1, "4.5"])
+
+        with patch("app.middleware.security.time.time", return_value=1000.0):
+            allowed, remaining = await bucket.consume("bucket:user", capacity=10, rate=0.5, cost=2)
+
+        assert allowed is True
+        assert remaining == 4.5
+        bucket._script.assert_awaited_once_with(keys=["bucket:user"], args=[10, 0.5, 1000.0, 2])
+
+    async def test_consume_denied(self):
+        """Test an empty bucket rejects the request without going negative."""
+        bucket = RedisTokenBucket()
+        bucket._script = AsyncMock(return_value=[0, "0.25"])
+
+        allowed, remaining = await bucket.consume("bucket:user", capacity=10, rate=0.5)
+
+        assert allowed is False
+        assert remaining == 0.25
+
+    def test_script_registered_once(self):
+        """Test the Lua script is registered on first use and then reused."""
+        bucket = RedisTokenBucket()
+
+        with patch("app.middleware.security.redis.Redis") as redis_cls:
+            first = bucket._get_script()
+            second = bucket._get_script()
+
+        assert first is second
+        redis_cls.return_value.register_script.assert_called_once_with(RedisTokenBucket.REFILL_AND_CONSUME)
@@ -191,13 +191,9 @@ const SubscriptionUpgradeFlow = ({ onClose, initialPlan = null }) => {
   const calculateProration = () => {
     if (!selectedPlan || !currentSubscription) return;
 
-    const currentPrice = billingCycle === 'monthly' 
-      ? currentSubscription.tier.price_monthly 
-      : currentSubscription.tier.price_yearly;
-    
-    const newPrice = billingCycle === 'monthly' 
-      ? selectedPlan.price_monthly 
-      : selectedPlan.price_yearly;
+    // Tiers only carry a monthly price, so prorate over the current month
+    const currentPrice = currentSubscription.tier.price_monthly_cents / 100;
+    const newPrice = selectedPlan.price_monthly_cents / 100;
 
     // Simplified proration calculation
     const today = new Date();
@@ -368,7 +364,7 @@ const SubscriptionUpgradeFlow = ({ onClose, initialPlan = null }) => {
                 {currentSubscription && (
                   <div className="current-plan-card">
                     <span className="plan-name">{currentSubscription.tier.display_name}</span>
-                    <span className="plan-price">{formatCurrency(currentSubscription.tier.price_monthly)}/month</span>
+                    <span className="plan-price">{formatCurrency(currentSubscription.tier.price_monthly_cents / 100)}/month</span>
                   </div>
                 )}
               </div>
@@ -384,7 +380,7 @@ const SubscriptionUpgradeFlow = ({ onClose, initialPlan = null }) => {
                       <div className="plan-header">
                         <h3>{plan.display_name}</h3>
                         <div className="plan-pricing">
-                          <span className="price">{formatCurrency(plan.price_monthly)}</span>
+                          <span className="price">{formatCurrency(plan.price_monthly_cents / 100)}</span>
                           <span className="period">/month</span>
                         </div>
                       </div>
@@ -441,7 +437,7 @@ const SubscriptionUpgradeFlow = ({ onClose, initialPlan = null }) => {
                       <h4>From</h4>
                       <div className="plan-details">
                         <span className="plan-name">{currentSubscription?.tier.display_name}</span>
-                        <span className="plan-price">{formatCurrency(currentSubscription?.tier.price_monthly)}/month</span>
+                        <span className="plan-price">{formatCurrency(currentSubscription?.tier.price_monthly_cents / 100)}/month</span>
                       </div>
                     </div>
                     <div className="arrow">→</div>
@@ -449,7 +445,7 @@ const SubscriptionUpgradeFlow = ({ onClose, initialPlan = null }) => {
                       <h4>To</h4>
                       <div className="plan-details">
                         <span className="plan-name">{selectedPlan?.display_name}</span>
-                        <span className="plan-price">{formatCurrency(selectedPlan?.price_monthly)}/month</span>
+                        <span className="plan-price">{formatCurrency(selectedPlan?.price_monthly_cents / 100)}/month</span>
                       </div>
                     </div>
                   </div>
@@ -513,7 +509,7 @@ const SubscriptionUpgradeFlow = ({ onClose, initialPlan = null }) => {
                   </div>
                   <div className="detail-row">
                     <span>Monthly Price:</span>
-                    <span>{formatCurrency(selectedPlan?.price_monthly)}</span>
+                    <span>{formatCurrency(selectedPlan?.price_monthly_cents / 100)}</span>
                   </div>
                 </div>
 